@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Answer History - Storico persistente delle risposte e ripetizione dilazionata
+Salva ogni risposta in SQLite tramite un thread di scrittura a lotti e
+pianifica i ripassi con una variante dell'algoritmo SM-2
+"""
+
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Percorso predefinito del database dello storico
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".vimquiz", "answer_history.db")
+
+SECONDS_PER_DAY = 86400.0
+
+# Parametri SM-2
+INITIAL_EASE = 2.5
+MINIMUM_EASE = 1.3
+# Una risposta corretta più lenta di così vale come "corretta con esitazione"
+SLOW_ANSWER_MS = 8000.0
+
+# Domande nuove: candidati estratti al massimo per ogni domanda richiesta
+# (con quasi tutta la banca già vista si passa agli elementi in scadenza)
+NEW_CANDIDATES_PER_QUESTION = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    answered_at REAL NOT NULL,
+    command TEXT NOT NULL,
+    category TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    latency_ms REAL
+);
+CREATE INDEX IF NOT EXISTS answers_item ON answers (command, category);
+CREATE TABLE IF NOT EXISTS review_items (
+    command TEXT NOT NULL,
+    category TEXT NOT NULL,
+    repetitions INTEGER NOT NULL,
+    ease REAL NOT NULL,
+    interval_days REAL NOT NULL,
+    due_at REAL NOT NULL,
+    last_answered REAL NOT NULL,
+    PRIMARY KEY (command, category)
+);
+CREATE INDEX IF NOT EXISTS review_items_due ON review_items (due_at);
+CREATE INDEX IF NOT EXISTS review_items_category_due ON review_items (category, due_at);
+"""
+
+
+def answer_quality(correct: bool, latency_ms: Optional[float]) -> int:
+    """
+    Converte una risposta nel voto SM-2 (0-5)
+
+    Corretta e rapida -> 5, corretta ma lenta -> 4, sbagliata -> 1
+    """
+    if not correct:
+        return 1
+    if latency_ms is not None and latency_ms > SLOW_ANSWER_MS:
+        return 4
+    return 5
+
+
+def schedule_review(state: Optional[Tuple[int, float, float]], correct: bool,
+                    latency_ms: Optional[float], now: float) -> Tuple[int, float, float, float]:
+    """
+    Calcola il nuovo stato di ripasso di un elemento (SM-2)
+
+    Args:
+        state: Stato precedente (ripetizioni, facilità, intervallo in giorni) o None
+        correct: Risposta corretta
+        latency_ms: Tempo di risposta in millisecondi (opzionale)
+        now: Istante della risposta (secondi epoch)
+
+    Returns:
+        Tupla (ripetizioni, facilità, intervallo in giorni, scadenza)
+    """
+    repetitions, ease, interval_days = state or (0, INITIAL_EASE, 0.0)
+    quality = answer_quality(correct, latency_ms)
+
+    if quality < 3:
+        # Risposta sbagliata: si riparte da capo, ripasso a breve (10 minuti)
+        repetitions = 0
+        interval_days = 10 / (24 * 60)
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval_days = 1.0
+        elif repetitions == 2:
+            interval_days = 6.0
+        else:
+            interval_days = interval_days * ease
+
+    ease = max(MINIMUM_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, ease, interval_days, now + interval_days * SECONDS_PER_DAY
+
+
+def iter_random_order(items, rng) -> Iterable[Any]:
+    """
+    Elementi di una sequenza in ordine casuale, senza copiarla
+
+    Fisher-Yates incrementale: gli scambi sono tenuti in un dizionario, quindi
+    estrarre k elementi costa O(k) qualunque sia la lunghezza della sequenza.
+    """
+    swapped = {}
+    length = len(items)
+    for index in range(length):
+        chosen = rng.randrange(index, length)
+        position = swapped.get(chosen, chosen)
+        swapped[chosen] = swapped.get(index, index)
+        yield items[position]
+
+
+class AnswerHistory:
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH, batch_size: int = 64,
+                 flush_interval: float = 1.0):
+        """
+        Inizializza lo storico delle risposte
+
+        Args:
+            db_path: Percorso del database SQLite
+            batch_size: Numero massimo di risposte scritte per transazione
+            flush_interval: Attesa massima (secondi) prima di scrivere un lotto incompleto
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        # Connessione per le letture (thread chiamante); il writer ha la propria
+        self._read_connection = self._connect()
+        self._read_connection.executescript(_SCHEMA)
+        self._read_lock = threading.Lock()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="answer-history-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL permette letture concorrenti mentre il writer scrive
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record_answer(self, command: str, category: str, correct: bool,
+                      latency_ms: Optional[float] = None, answered_at: Optional[float] = None):
+        """
+        Accoda una risposta: la scrittura avviene in background a lotti
+
+        Args:
+            command: Comando della domanda
+            category: Categoria della domanda
+            correct: Risposta corretta
+            latency_ms: Tempo di risposta in millisecondi (opzionale)
+            answered_at: Istante della risposta (predefinito: adesso)
+        """
+        self._queue.put((answered_at if answered_at is not None else time.time(),
+                         command, category or '', bool(correct), latency_ms))
+
+    def _writer_loop(self):
+        """Thread di scrittura: raccoglie le risposte in lotti e le salva in una transazione"""
+        connection = self._connect()
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+            try:
+                self._write_batch(connection, batch)
+            except Exception as e:
+                print(f"Errore nel salvataggio dello storico: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        connection.close()
+
+    @staticmethod
+    def _write_batch(connection: sqlite3.Connection, batch: List[Tuple]):
+        """Scrive un lotto di risposte e aggiorna lo stato di ripasso degli elementi"""
+        with connection:
+            connection.executemany(
+                "INSERT INTO answers (answered_at, command, category, correct, latency_ms) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(answered_at, command, category, int(correct), latency_ms)
+                 for answered_at, command, category, correct, latency_ms in batch])
+
+            # Stato di ripasso per elemento, aggiornato risposta per risposta
+            states = {}
+            for answered_at, command, category, correct, latency_ms in batch:
+                key = (command, category)
+                if key in states:
+                    previous = states[key][:3]
+                else:
+                    previous = connection.execute(
+                        "SELECT repetitions, ease, interval_days FROM review_items "
+                        "WHERE command = ? AND category = ?", key).fetchone()
+                states[key] = schedule_review(previous, correct, latency_ms, answered_at) + (answered_at,)
+
+            connection.executemany(
+                "INSERT OR REPLACE INTO review_items "
+                "(command, category, repetitions, ease, interval_days, due_at, last_answered) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [key + state for key, state in states.items()])
+
+    def flush(self):
+        """Attende che tutte le risposte accodate siano state scritte"""
+        self._queue.join()
+
+    def close(self):
+        """Scrive le risposte in sospeso e chiude il database"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._read_connection.close()
+
+    def iter_due_items(self, now: Optional[float] = None,
+                       category: Optional[str] = None) -> Iterable[Tuple[str, str]]:
+        """
+        Elementi scaduti in ordine di scadenza (usa l'indice su due_at)
+
+        Args:
+            now: Istante di riferimento (predefinito: adesso)
+            category: Limita a una categoria (opzionale)
+
+        Returns:
+            Iteratore di coppie (comando, categoria)
+        """
+        now = time.time() if now is None else now
+        with self._read_lock:
+            if category:
+                cursor = self._read_connection.execute(
+                    "SELECT command, category FROM review_items "
+                    "WHERE category = ? AND due_at <= ? ORDER BY due_at", (category, now))
+            else:
+                cursor = self._read_connection.execute(
+                    "SELECT command, category FROM review_items WHERE due_at <= ? ORDER BY due_at", (now,))
+            rows = cursor.fetchmany(1024)
+        while rows:
+            for row in rows:
+                yield row
+            with self._read_lock:
+                rows = cursor.fetchmany(1024)
+
+    def get_upcoming_items(self, limit: int, now: Optional[float] = None,
+                           category: Optional[str] = None, offset: int = 0) -> List[Tuple[str, str]]:
+        """
+        Elementi non ancora scaduti, dal più vicino alla scadenza
+
+        Args:
+            limit: Numero massimo di elementi
+            now: Istante di riferimento (predefinito: adesso)
+            category: Limita a una categoria (opzionale)
+            offset: Elementi da saltare, per leggere le pagine successive
+
+        Returns:
+            Lista di coppie (comando, categoria)
+        """
+        now = time.time() if now is None else now
+        # rowid a parità di scadenza rende stabile l'ordine tra una pagina e l'altra
+        with self._read_lock:
+            if category:
+                cursor = self._read_connection.execute(
+                    "SELECT command, category FROM review_items "
+                    "WHERE category = ? AND due_at > ? ORDER BY due_at, rowid LIMIT ? OFFSET ?",
+                    (category, now, limit, offset))
+            else:
+                cursor = self._read_connection.execute(
+                    "SELECT command, category FROM review_items WHERE due_at > ? "
+                    "ORDER BY due_at, rowid LIMIT ? OFFSET ?", (now, limit, offset))
+            return cursor.fetchall()
+
+    def is_known(self, command: str, category: str) -> bool:
+        """True se la coppia (comando, categoria) è già stata vista (usa la chiave primaria)"""
+        with self._read_lock:
+            return self._read_connection.execute(
+                "SELECT 1 FROM review_items WHERE command = ? AND category = ?",
+                (command, category or '')).fetchone() is not None
+
+    def get_known_items(self) -> Set[Tuple[str, str]]:
+        """Insieme delle coppie (comando, categoria) già viste almeno una volta"""
+        with self._read_lock:
+            return set(self._read_connection.execute("SELECT command, category FROM review_items"))
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Statistiche aggregate dello storico"""
+        with self._read_lock:
+            total, correct, latency = self._read_connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(correct), 0), AVG(latency_ms) FROM answers").fetchone()
+            due = self._read_connection.execute(
+                "SELECT COUNT(*) FROM review_items WHERE due_at <= ?", (time.time(),)).fetchone()[0]
+        return {
+            'total_answers': total,
+            'correct_answers': correct,
+            'average_latency_ms': latency,
+            'due_items': due,
+        }
+
+
+class ReviewScheduler:
+    def __init__(self, history: AnswerHistory, questions_loader):
+        """
+        Inizializza il pianificatore dei ripassi
+
+        Args:
+            history: Storico delle risposte
+            questions_loader: Caricatore delle domande
+        """
+        self.history = history
+        self.questions_loader = questions_loader
+
+    def _find_question(self, command: str, category: str) -> Optional[Any]:
+        """Domanda originale della banca per una coppia (comando, categoria)"""
+        for question in self.questions_loader.get_questions_by_command(command):
+            if question.get('source_category') == category:
+                return question
+        return None
+
+    def build_session(self, count: int, category: Optional[str] = None,
+                      difficulty: Optional[str] = None, now: Optional[float] = None,
+                      rng=None) -> List[Dict[str, Any]]:
+        """
+        Costruisce la prossima sessione di ripasso
+
+        Prima gli elementi scaduti (dal più vecchio), poi domande mai viste,
+        infine gli elementi che scadranno per primi.
+
+        Args:
+            count: Numero di domande
+            category: Categoria specifica (opzionale)
+            difficulty: Difficoltà specifica (opzionale)
+            now: Istante di riferimento (predefinito: adesso)
+            rng: Generatore casuale per le domande nuove (opzionale)
+
+        Returns:
+            Domande tradotte nella lingua corrente
+        """
+        selected = []
+        seen = set()
+
+        def accept(question) -> bool:
+            if question is None or id(question) in seen:
+                return False
+            if difficulty and question.get('difficulty', 'beginner') != difficulty:
+                return False
+            seen.add(id(question))
+            selected.append(question)
+            return len(selected) >= count
+
+        # 1. Elementi scaduti, in ordine di scadenza
+        for command, item_category in self.history.iter_due_items(now, category):
+            if accept(self._find_question(command, item_category)):
+                return self.questions_loader.get_translated_questions(selected)
+
+        # 2. Domande mai viste, in ordine casuale: le posizioni si estraggono
+        # una alla volta e ognuna costa una ricerca per chiave nello storico
+        filtered = self.questions_loader.filter_index.get((category or None, difficulty or None), [])
+        candidates = (count - len(selected)) * NEW_CANDIDATES_PER_QUESTION
+        for position in iter_random_order(filtered, rng or random):
+            if candidates <= 0:
+                break
+            candidates -= 1
+            question = self.questions_loader.question_at(position)
+            if self.history.is_known(question.get('command'), question.get('source_category')):
+                continue
+            if accept(question):
+                return self.questions_loader.get_translated_questions(selected)
+
+        # 3. Elementi che scadranno per primi: con un filtro di difficoltà
+        # molti vengono scartati, quindi si leggono pagine finché servono
+        page_size = count * 4
+        offset = 0
+        while True:
+            items = self.history.get_upcoming_items(page_size, now, category, offset)
+            if any(accept(self._find_question(command, item_category))
+                   for command, item_category in items):
+                break
+            if len(items) < page_size:
+                break
+            offset += page_size
+
+        return self.questions_loader.get_translated_questions(selected)
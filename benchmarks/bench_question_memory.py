@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark memoria - Confronta l'occupazione della banca domande
+tra i dizionari liberi originali e i record Question compatti
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_record import Question
+from questions_loader import QuestionsLoader
+from synthetic import write_synthetic_bank
+
+
+def load_as_dicts(directory: str):
+    """Carica la banca come faceva la versione a dizionari (riferimento)"""
+    all_questions = []
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for question in data['questions']:
+            question['source_category'] = data['category']
+            question['source_file'] = filename
+            question['difficulty'] = data['difficulty']
+            all_questions.append(question)
+    return all_questions
+
+
+def load_as_records(directory: str):
+    """Carica la banca come record Question, senza gli indici del loader"""
+    all_questions = []
+    for filename in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        all_questions.extend(Question.from_dict(question, data['category'], filename, data['difficulty'])
+                             for question in data['questions'])
+    return all_questions
+
+
+def measure(function, *args):
+    """Restituisce (risultato, byte allocati ancora vivi) per una chiamata"""
+    gc.collect()
+    tracemalloc.start()
+    result = function(*args)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memoria della banca domande")
+    parser.add_argument('--questions', type=int, default=50000, help="Numero di domande sintetiche")
+    parser.add_argument('--categories', type=int, default=50, help="Numero di categorie")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_synthetic_bank(directory, args.questions, args.categories)
+
+        questions, dict_bytes = measure(load_as_dicts, directory)
+        count = len(questions)
+        del questions
+
+        questions, record_bytes = measure(load_as_records, directory)
+        del questions
+
+        loader, loader_bytes = measure(lambda: QuestionsLoader(directory, use_cache=False))
+        del loader
+
+    print(f"Domande: {count}")
+    print(f"Dizionari: {dict_bytes / 1024 / 1024:8.2f} MiB ({dict_bytes / count:6.0f} B/domanda)")
+    print(f"Record:    {record_bytes / 1024 / 1024:8.2f} MiB ({record_bytes / count:6.0f} B/domanda)")
+    print(f"Loader:    {loader_bytes / 1024 / 1024:8.2f} MiB ({loader_bytes / count:6.0f} B/domanda, indici inclusi)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Generatore di carico - Utenti simulati contro quiz_server.py
+Ogni utente apre una connessione keep-alive, crea una sessione, risponde a tutte
+le domande e legge i risultati; alla fine stampa throughput e latenze
+
+Esempi:
+    python3 quiz_server.py --port 8080 &
+    python3 benchmarks/quiz_server_load.py --port 8080 --sessions 5000 --concurrency 500
+    python3 benchmarks/quiz_server_load.py --spawn --sessions 2000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class HttpConnection:
+    """Connessione HTTP/1.1 keep-alive minimale per richieste JSON"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    async def request(self, method: str, path: str,
+                      data: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+        """Invia una richiesta e restituisce (stato, corpo JSON)"""
+        if self.writer is None:
+            await self.open()
+        body = json.dumps(data).encode('utf-8') if data is not None else b''
+        self.writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+                           ).encode('latin-1') + body)
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        status = int(lines[0].split(' ')[1])
+        length = 0
+        keep_alive = True
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection':
+                keep_alive = value.strip().lower() != 'close'
+        payload = json.loads(await self.reader.readexactly(length)) if length else {}
+        if not keep_alive:
+            self.close()
+        return status, payload
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.sessions = 0
+
+    def record(self, endpoint: str, latency_ms: float, status: int):
+        self.latencies.setdefault(endpoint, []).append(latency_ms)
+        if status >= 400:
+            key = f"{endpoint} {status}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def report(self, elapsed: float):
+        total = sum(len(values) for values in self.latencies.values())
+        print(f"\nSessioni completate: {self.sessions}")
+        print(f"Richieste: {total} in {elapsed:.2f} s ({total / elapsed:.0f} req/s)")
+        print(f"  {'endpoint':<10} {'richieste':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for endpoint, values in sorted(self.latencies.items()):
+            values.sort()
+            print(f"  {endpoint:<10} {len(values):>10} {_percentile(values, 50):>9.2f} "
+                  f"{_percentile(values, 95):>9.2f} {_percentile(values, 99):>9.2f} {values[-1]:>9.2f}")
+        if self.errors:
+            print("Errori:")
+            for key, count in sorted(self.errors.items()):
+                print(f"  {key}: {count}")
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+
+async def timed(stats: LoadStats, endpoint: str, connection: HttpConnection, method: str,
+                path: str, data: Optional[Dict[str, Any]] = None) -> Tuple[int, Dict[str, Any]]:
+    start = time.perf_counter()
+    status, payload = await connection.request(method, path, data)
+    stats.record(endpoint, (time.perf_counter() - start) * 1000, status)
+    return status, payload
+
+
+async def run_user(queue: asyncio.Queue, stats: LoadStats, host: str, port: int,
+                   questions: int, rng: random.Random):
+    """Utente simulato: esegue sessioni complete finché la coda non è vuota"""
+    connection = HttpConnection(host, port)
+    try:
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            status, created = await timed(stats, "create", connection, "POST", "/sessions",
+                                          {"limit": questions})
+            if status != 201:
+                continue
+            base = f"/sessions/{created['session']}"
+            while True:
+                status, step = await timed(stats, "next", connection, "POST", f"{base}/next")
+                if status != 200 or step.get('finished'):
+                    break
+                options = step['question']['options']
+                await timed(stats, "answer", connection, "POST", f"{base}/answer",
+                            {"option": rng.randrange(len(options))})
+            await timed(stats, "results", connection, "GET", f"{base}/results")
+            await timed(stats, "delete", connection, "DELETE", base)
+            stats.sessions += 1
+    finally:
+        connection.close()
+
+
+async def run_load(args: argparse.Namespace):
+    server = None
+    host, port = args.host, args.port
+    if args.spawn:
+        # Server nello stesso processo (stesso ciclo di eventi) su una porta libera
+        from i18n_manager import I18nManager
+        from questions_loader import QuestionsLoader
+        from quiz_server import QuizServer
+
+        i18n = I18nManager()
+        with contextlib.redirect_stdout(io.StringIO()):
+            loader = QuestionsLoader(i18n_manager=i18n)
+        server = QuizServer(loader, i18n)
+        listener = await server.start(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    queue = asyncio.Queue()
+    for number in range(args.sessions):
+        queue.put_nowait(number)
+    stats = LoadStats()
+    rng = random.Random(args.seed)
+    print(f"{args.sessions} sessioni da {args.questions} domande, {args.concurrency} utenti "
+          f"contemporanei su {host}:{port}")
+
+    start = time.perf_counter()
+    users = [run_user(queue, stats, host, port, args.questions, rng) for _ in range(args.concurrency)]
+    await asyncio.gather(*users)
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        _, health = server.handle('GET', '/health', {})
+        print(f"Sessioni ancora aperte sul server: {health['sessions']}")
+        await server.stop()
+    stats.report(elapsed)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generatore di carico per quiz_server.py")
+    parser.add_argument('--host', default="127.0.0.1", help="Indirizzo del server")
+    parser.add_argument('--port', type=int, default=8080, help="Porta del server")
+    parser.add_argument('--spawn', action='store_true',
+                        help="Avvia il server nello stesso processo su una porta libera")
+    parser.add_argument('--sessions', type=int, default=1000, help="Sessioni complete da eseguire")
+    parser.add_argument('--concurrency', type=int, default=100, help="Utenti contemporanei")
+    parser.add_argument('--questions', type=int, default=10, help="Domande per sessione")
+    parser.add_argument('--seed', type=int, default=0, help="Seme delle risposte")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run_load(args))
+    if stats.errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
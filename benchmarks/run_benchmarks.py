@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Tempi dei percorsi critici di caricatore, traduzioni e quiz
+Genera banche sintetiche, misura le operazioni e confronta i risultati con una baseline
+
+Il confronto ha senso solo tra esecuzioni sulla stessa macchina: la CI esegue
+i benchmark senza baseline, il confronto si fa a mano prima e dopo una modifica.
+
+Esempi:
+    python3 benchmarks/run_benchmarks.py --sizes 1000,10000 --output results.json
+    python3 benchmarks/run_benchmarks.py --baseline results.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from distractors import DISTRACTOR_MODES, DistractorEngine
+from i18n_manager import I18nManager
+from questions_loader import QuestionsLoader
+from synthetic import synthetic_languages, write_synthetic_bank, write_synthetic_locales
+
+# Formato del file dei risultati (cambia se cambiano i campi)
+RESULTS_FORMAT_VERSION = 1
+
+DEFAULT_SIZES = "1000,10000,100000"
+
+# Una misura è una regressione se il minimo dei campioni (meno sensibile della
+# mediana a processi concorrenti e frequenza della CPU) supera la baseline di
+# questa frazione e se un campione intero si allunga di almeno
+# REGRESSION_MIN_DELTA_MS: sotto, la differenza è rumore del timer e del sistema
+DEFAULT_TOLERANCE = 0.25
+REGRESSION_MIN_DELTA_MS = 5.0
+
+SEARCH_QUERIES = ["move", "cmd12_", "paragraph 4", "group 3", "register", ":cmd0_1", "zzz"]
+
+
+def time_call(function: Callable[[], Any], repeat: int, number: int = 1,
+              setup: Optional[Callable[[], Any]] = None) -> Dict[str, float]:
+    """
+    Misura una funzione
+
+    Args:
+        function: Operazione da misurare
+        repeat: Numero di campioni
+        number: Chiamate per campione (per operazioni molto brevi)
+        setup: Preparazione eseguita prima di ogni campione, fuori dalla misura
+
+    Returns:
+        Tempi per chiamata in millisecondi: minimo e mediana dei campioni
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return {"min_ms": min(samples), "median_ms": statistics.median(samples)}
+
+
+class BenchmarkRun:
+    """Banca sintetica di una dimensione e misure raccolte su di essa"""
+
+    def __init__(self, directory: str, size: int, args: argparse.Namespace):
+        self.size = size
+        self.args = args
+        self.results = []
+        self.rng = random.Random(args.seed)
+        self.questions_dir = os.path.join(directory, "questions")
+        self.locales_dir = os.path.join(directory, "locales")
+        self.cache_file = os.path.join(directory, "questions.cache")
+        os.makedirs(self.questions_dir)
+        self.bank = write_synthetic_bank(self.questions_dir, size, args.categories)
+        self.languages = synthetic_languages(args.languages)
+        write_synthetic_locales(self.locales_dir, self.bank, self.languages,
+                                split_descriptions=args.split_descriptions, seed=args.seed)
+
+    def record(self, name: str, timings: Dict[str, float], repeat: int, number: int):
+        self.results.append({"benchmark": name, "size": self.size, "repeat": repeat,
+                             "number": number, **timings})
+        print(f"  {name:<40} {timings['median_ms']:>12.4f} {timings['min_ms']:>12.4f}", flush=True)
+
+    def measure(self, name: str, function: Callable[[], Any], number: int = 1,
+                setup: Optional[Callable[[], Any]] = None, repeat: Optional[int] = None):
+        """Misura e registra una funzione, se il nome passa il filtro --only"""
+        if self.args.only and not any(name.startswith(prefix) for prefix in self.args.only):
+            return
+        repeat = repeat or self.args.repeat
+        # Il caricatore stampa un riepilogo a ogni costruzione
+        with contextlib.redirect_stdout(io.StringIO()):
+            timings = time_call(function, repeat, number, setup)
+        self.record(name, timings, repeat, number)
+
+    def new_i18n(self) -> I18nManager:
+        return I18nManager(self.locales_dir)
+
+    def new_loader(self, i18n: Optional[I18nManager] = None) -> QuestionsLoader:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return QuestionsLoader(self.questions_dir, i18n_manager=i18n, cache_file=self.cache_file)
+
+    def remove_cache(self):
+        if os.path.exists(self.cache_file):
+            os.remove(self.cache_file)
+
+    def run(self):
+        print(f"\n{self.size} domande, {self.args.categories} categorie, {len(self.languages)} lingue")
+        print(f"  {'benchmark':<40} {'mediana ms':>12} {'minimo ms':>12}")
+        self.bench_loader()
+        self.bench_i18n()
+        self.bench_distractors()
+
+    def bench_loader(self):
+        # Costruzione senza cache (lettura dei file) e dalla cache compilata
+        self.measure("loader.build", self.new_loader, setup=self.remove_cache)
+        self.new_loader()
+        self.measure("loader.build_cached", self.new_loader)
+
+        i18n = self.new_i18n()
+        loader = self.new_loader(i18n)
+        categories = loader.get_categories()
+        category = categories[len(categories) // 2]
+        difficulty = loader.categories[category]['difficulty']
+        self.measure("loader.get_random_questions", lambda: loader.get_random_questions(20), number=200)
+        self.measure("loader.get_random_questions.filtered",
+                     lambda: loader.get_random_questions(20, category, difficulty), number=200)
+
+        queries = iter(SEARCH_QUERIES * (self.args.repeat * 10 + 1))
+        self.measure("loader.search_questions", lambda: loader.search_questions(next(queries)), number=10)
+
+        sample = loader.get_random_questions(20, seed=self.args.seed)
+        language = self.languages[-1]
+        i18n.set_language(language)
+        # Prima richiesta in una lingua: costruzione della vista tradotta
+        # (azzerata prima di ogni campione)
+        self.measure("loader.get_translated_questions.first",
+                     lambda: loader.get_translated_questions(sample),
+                     setup=loader._translated_views.clear)
+        self.measure("loader.get_translated_questions",
+                     lambda: loader.get_translated_questions(sample), number=200)
+
+    def bench_i18n(self):
+        self.measure("i18n.init", self.new_i18n)
+
+        # Giro di tutte le lingue: con più lingue della cache LRU alcune vengono rilette
+        i18n = self.new_i18n()
+        languages = self.languages
+        self.measure("i18n.set_language",
+                     lambda: [i18n.set_language(language) for language in languages],
+                     number=1)
+
+        i18n.set_language(languages[-1])
+        keys = [f"section{self.rng.randrange(20)}.key{self.rng.randrange(50)}" for _ in range(1000)]
+        keys.append("quiz.score_label")
+        self.measure("i18n.get_text", lambda: [i18n.get_text(key, score=1) for key in keys],
+                     number=10)
+
+    def bench_distractors(self):
+        loader = self.new_loader()
+        questions = loader.all_questions
+        commands = [question['command'] for question in
+                    loader.get_random_questions(200, seed=self.args.seed)]
+        for mode in DISTRACTOR_MODES:
+            self.measure(f"distractors.build.{mode}", lambda: DistractorEngine(questions, mode))
+            engine = DistractorEngine(questions, mode)
+            rng = random.Random(self.args.seed)
+            self.measure(f"distractors.sample.{mode}",
+                         lambda: [engine.sample(command, 3, rng) for command in commands], number=5)
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Confronta i risultati con una baseline
+
+    Returns:
+        Descrizioni delle regressioni trovate
+    """
+    reference = {(entry["benchmark"], entry["size"]): entry for entry in baseline.get("results", [])}
+    regressions = []
+    print(f"\nConfronto con la baseline sui minimi (tolleranza {tolerance:.0%})")
+    print(f"  {'benchmark':<40} {'domande':>8} {'baseline':>12} {'attuale':>12} {'rapporto':>9}")
+    for entry in results:
+        previous = reference.get((entry["benchmark"], entry["size"]))
+        if previous is None:
+            continue
+        current_ms, previous_ms = entry["min_ms"], previous["min_ms"]
+        ratio = current_ms / previous_ms if previous_ms else float('inf')
+        # I tempi sono per chiamata: il rumore riguarda il campione di number chiamate
+        sample_delta_ms = (current_ms - previous_ms) * entry.get("number", 1)
+        regressed = (current_ms > previous_ms * (1 + tolerance) and
+                     sample_delta_ms > REGRESSION_MIN_DELTA_MS)
+        marker = "  REGRESSIONE" if regressed else ""
+        print(f"  {entry['benchmark']:<40} {entry['size']:>8} {previous_ms:>12.4f} "
+              f"{current_ms:>12.4f} {ratio:>8.2f}x{marker}")
+        if regressed:
+            regressions.append(f"{entry['benchmark']} ({entry['size']} domande): "
+                               f"{previous_ms:.4f} -> {current_ms:.4f} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark di caricatore, traduzioni e distrattori")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help="Numero di domande delle banche, separati da virgole (fino a 1000000)")
+    parser.add_argument('--categories', type=int, default=100, help="Numero di categorie")
+    parser.add_argument('--languages', type=int, default=10, help="Numero di lingue (inglese incluso)")
+    parser.add_argument('--split-descriptions', action='store_true',
+                        help="Descrizioni tradotte divise per categoria")
+    parser.add_argument('--repeat', type=int, default=5, help="Campioni per misura")
+    parser.add_argument('--seed', type=int, default=0, help="Seme dei dati e delle estrazioni")
+    parser.add_argument('--only', action='append', default=[],
+                        help="Esegue solo i benchmark con questo prefisso (ripetibile)")
+    parser.add_argument('--output', help="File JSON in cui scrivere i risultati")
+    parser.add_argument('--baseline', help="Risultati precedenti con cui confrontarsi")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Rallentamento ammesso rispetto alla baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            run = BenchmarkRun(directory, size, args)
+            run.run()
+            results.extend(run.results)
+
+    report = {
+        "format": RESULTS_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"sizes": sizes, "categories": args.categories, "languages": args.languages,
+                   "split_descriptions": args.split_descriptions, "repeat": args.repeat,
+                   "seed": args.seed},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRisultati scritti in {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get("config", {}).get("languages") != args.languages or \
+                baseline.get("config", {}).get("categories") != args.categories:
+            print("Attenzione: la baseline usa una configurazione diversa")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressioni:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNessuna regressione")
+
+
+if __name__ == '__main__':
+    main()
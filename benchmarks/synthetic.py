@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Synthetic - Banche domande e traduzioni sintetiche per i benchmark
+Genera file con la stessa struttura di questions/ e locales/, di dimensione a scelta
+"""
+
+import json
+import os
+import random
+from typing import Dict, List
+
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+
+# Parole delle descrizioni: testi vari, così la ricerca ha corrispondenze parziali
+WORDS = ["move", "delete", "yank", "paste", "search", "replace", "window", "buffer",
+         "mark", "jump", "macro", "register", "line", "word", "paragraph", "indent",
+         "split", "tab", "fold", "undo", "redo", "visual", "insert", "append"]
+
+
+def synthetic_languages(count: int) -> List[str]:
+    """Codici delle lingue sintetiche: 'en' (predefinita) seguita da x01, x02, ..."""
+    return ["en"] + [f"x{index:02d}" for index in range(1, max(1, count))]
+
+
+def synthetic_description(index: int, number: int) -> str:
+    """Descrizione inglese deterministica di una domanda sintetica"""
+    first = WORDS[(index * 7 + number) % len(WORDS)]
+    second = WORDS[(number * 5 + index) % len(WORDS)]
+    return f"{first} {second} {number} in group {index}"
+
+
+def write_synthetic_bank(directory: str, total_questions: int, categories: int) -> Dict[str, List[str]]:
+    """
+    Scrive una banca domande sintetica con il numero di domande indicato
+
+    Args:
+        directory: Directory di destinazione (esistente)
+        total_questions: Numero totale di domande
+        categories: Numero di categorie (un file ciascuna)
+
+    Returns:
+        Nome del file senza estensione -> comandi della categoria
+    """
+    per_category = max(1, total_questions // categories)
+    bank = {}
+    for index in range(categories):
+        commands = [f":cmd{index}_{number}" for number in range(per_category)]
+        data = {
+            "category": f"Synthetic Category {index}",
+            "description": f"Synthetic category number {index}",
+            "difficulty": DIFFICULTIES[index % len(DIFFICULTIES)],
+            "questions": [
+                {
+                    "command": command,
+                    "description": synthetic_description(index, number),
+                    "category": f"group{number % 7}",
+                }
+                for number, command in enumerate(commands)
+            ],
+        }
+        key = f"synthetic_{index}"
+        with open(os.path.join(directory, f"{key}.json"), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        bank[key] = commands
+    return bank
+
+
+def synthetic_catalog(language: str, sections: int, keys_per_section: int) -> Dict[str, Dict[str, str]]:
+    """Contenuto di main.json per una lingua sintetica (sezioni annidate di testi)"""
+    catalog = {
+        "app": {"title": f"VIM QUIZ [{language}]"},
+        "quiz": {"score_label": f"[{language}] Score: {{score}}"},
+    }
+    for section in range(sections):
+        catalog[f"section{section}"] = {
+            f"key{key}": f"[{language}] text {section}.{key}" for key in range(keys_per_section)
+        }
+    return catalog
+
+
+def write_synthetic_locales(locales_dir: str, bank: Dict[str, List[str]], languages: List[str],
+                            sections: int = 20, keys_per_section: int = 50,
+                            translated_ratio: float = 0.8, split_descriptions: bool = False,
+                            seed: int = 0):
+    """
+    Scrive le traduzioni sintetiche di una banca
+
+    Ogni lingua ha main.json, questions.json e le descrizioni delle domande
+    (file unico o directory question_descriptions/ divisa per categoria).
+    Le categorie delle descrizioni usano il nome del file della banca.
+
+    Args:
+        locales_dir: Directory delle traduzioni (creata se manca)
+        bank: Risultato di write_synthetic_bank
+        languages: Codici lingua (vedi synthetic_languages)
+        sections: Sezioni di main.json
+        keys_per_section: Chiavi per sezione
+        translated_ratio: Frazione delle domande con descrizione tradotta
+        split_descriptions: Scrive un file di descrizioni per categoria
+        seed: Seme per la scelta delle domande tradotte
+    """
+    rng = random.Random(seed)
+    for language in languages:
+        language_dir = os.path.join(locales_dir, language)
+        os.makedirs(language_dir, exist_ok=True)
+        with open(os.path.join(language_dir, "main.json"), 'w', encoding='utf-8') as f:
+            json.dump(synthetic_catalog(language, sections, keys_per_section), f)
+        with open(os.path.join(language_dir, "questions.json"), 'w', encoding='utf-8') as f:
+            json.dump({"difficulties": {difficulty: f"[{language}] {difficulty}"
+                                        for difficulty in DIFFICULTIES}}, f)
+        if language == "en":
+            continue
+
+        descriptions = {
+            key: {command: f"[{language}] {command} description"
+                  for command in commands if rng.random() < translated_ratio}
+            for key, commands in bank.items()
+        }
+        if split_descriptions:
+            descriptions_dir = os.path.join(language_dir, "question_descriptions")
+            os.makedirs(descriptions_dir, exist_ok=True)
+            for key, commands in descriptions.items():
+                with open(os.path.join(descriptions_dir, f"{key}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(commands, f)
+        else:
+            with open(os.path.join(language_dir, "question_descriptions.json"), 'w', encoding='utf-8') as f:
+                json.dump(descriptions, f)
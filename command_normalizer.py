@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Command Normalizer - Confronto delle risposte scritte con i comandi Vim
+Normalizza abbreviazioni, tasti speciali, conteggi e segnaposto, e raggruppa
+i comandi equivalenti in un indice costruito una sola volta
+"""
+
+import re
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Comandi ex: (nome completo, abbreviazione minima). In caso di conflitto
+# vince il primo della lista, come nell'ordine di risoluzione di Vim
+EX_COMMANDS = (
+    ("substitute", "s"), ("write", "w"), ("wq", "wq"), ("wall", "wa"), ("wqall", "wqa"),
+    ("xit", "x"), ("xall", "xa"), ("quit", "q"), ("qall", "qa"), ("quitall", "quita"),
+    ("edit", "e"), ("enew", "ene"), ("read", "r"), ("redo", "red"), ("registers", "reg"),
+    ("saveas", "sav"), ("update", "up"), ("global", "g"), ("vglobal", "v"),
+    ("display", "di"), ("delete", "d"), ("delmarks", "delm"), ("mark", "ma"), ("marks", "marks"),
+    ("make", "mak"), ("move", "m"), ("jumps", "ju"), ("join", "j"), ("changes", "changes"),
+    ("split", "sp"), ("vsplit", "vs"), ("new", "new"), ("vnew", "vne"), ("only", "on"),
+    ("close", "clo"), ("tabnew", "tabnew"), ("tabedit", "tabe"), ("tabnext", "tabn"),
+    ("tabprevious", "tabp"), ("tabclose", "tabc"), ("buffer", "b"), ("bnext", "bn"),
+    ("bprevious", "bp"), ("bdelete", "bd"), ("buffers", "buffers"), ("ls", "ls"),
+    ("undo", "u"), ("normal", "norm"), ("set", "se"), ("help", "h"), ("nohlsearch", "noh"),
+    ("copy", "co"), ("t", "t"), ("yank", "y"), ("put", "pu"), ("print", "p"), ("sort", "sor"),
+)
+
+# Comandi ex il cui argomento è un nome di file
+EX_FILE_COMMANDS = frozenset(("write", "wq", "xit", "edit", "read", "saveas", "update",
+                              "split", "vsplit", "new", "vnew", "tabnew", "tabedit"))
+
+# Coppie di comandi con lo stesso effetto. Una descrizione uguale non basta:
+# un oggetto di testo (iw) e la sua selezione visuale (viw) si descrivono allo
+# stesso modo ma non sono la stessa risposta
+EQUIVALENT_COMMANDS = (
+    ("dd", "Vd"), ("D", "d$"), ("C", "c$"), ("Y", "yy"), ("x", "dl"), ("X", "dh"),
+    ("s", "cl"), ("S", "cc"), ("gg", "1G"), ("nG", ":n"), ("ZZ", ":x"), ("ZQ", ":q!"),
+    ("Ctrl+[", "<Esc>"), ("Ctrl+i", "<Tab>"), ("Ctrl+m", "<CR>"),
+    ("0", "<Home>"), ("$", "<End>"),
+)
+
+# Segnaposto nei comandi della banca e nelle risposte generalizzate
+PLACEHOLDER_COUNT = "{n}"
+PLACEHOLDER_CHAR = "{c}"
+PLACEHOLDER_FILE = "{file}"
+PLACEHOLDER_PATTERN = "{pattern}"
+PLACEHOLDER_OLD = "{old}"
+PLACEHOLDER_NEW = "{new}"
+
+# Parole che nella banca indicano un valore qualsiasi
+_WORD_PLACEHOLDERS = {"filename": PLACEHOLDER_FILE, "file": PLACEHOLDER_FILE,
+                      "pattern": PLACEHOLDER_PATTERN}
+
+_SPECIAL_KEYS = {"esc": "<Esc>", "escape": "<Esc>", "cr": "<CR>", "enter": "<CR>",
+                 "return": "<CR>", "tab": "<Tab>", "bs": "<BS>", "backspace": "<BS>",
+                 "space": "<Space>", "del": "<Del>", "delete": "<Del>", "home": "<Home>",
+                 "end": "<End>", "up": "<Up>", "down": "<Down>", "left": "<Left>",
+                 "right": "<Right>", "pageup": "<PageUp>", "pagedown": "<PageDown>"}
+
+_CTRL_RE = re.compile(r'<[Cc]-(.)>|\b[Cc][Tt][Rr][Ll]\s*[-+]\s*(\S)|\bC-(.)')
+_SPECIAL_KEY_RE = re.compile(r'<([A-Za-z]+)>')
+_CARET_CTRL_RE = re.compile(r'\^([A-Z\[])')
+_WHITESPACE_RE = re.compile(r'\s+')
+# Indirizzo ex: %, ., $, numero, marcatore ('a, '<) o segnaposto della banca (n, N, #)
+_ADDRESS = r"(?:[.$]|\d+|'[a-z<>]|[nN#](?![A-Za-z]))"
+_SECOND_ADDRESS = r"(?:[.$]|\d+|'[a-z<>]|[nN#])"
+_EX_RE = re.compile(r"^(%|" + _ADDRESS + r"(?:\s*[,;]\s*" + _SECOND_ADDRESS + r")?)?\s*"
+                    r"([A-Za-z]+|[&~<>!=#@*])?(!?)\s*(.*)$")
+_ADDRESS_PART_RE = re.compile(r"\s*([,;])\s*")
+_COUNT_RE = re.compile(r'^([1-9]\d*|[nN](?=[A-Za-z@]))')
+_REGISTER_RE = re.compile(r'^"[a-zA-Z0-9"+*_\-.:%#/=]')
+# Movimenti seguiti da un carattere qualsiasi (fx, tx, Fx, Tx)
+_CHAR_MOTIONS = frozenset("fFtT")
+
+# Un comando scomposto: segmenti di alternative (la prima è la forma concreta)
+Segments = List[Tuple[str, ...]]
+
+
+def _build_ex_abbreviations() -> Dict[str, str]:
+    abbreviations = {}
+    for name, minimal in EX_COMMANDS:
+        for length in range(len(minimal), len(name) + 1):
+            abbreviations.setdefault(name[:length], name)
+    # Il nome completo vince sempre sulle abbreviazioni di altri comandi
+    for name, _ in EX_COMMANDS:
+        abbreviations[name] = name
+    return abbreviations
+
+
+_EX_ABBREVIATIONS = _build_ex_abbreviations()
+
+
+def _canonical_keys(command: str) -> str:
+    """Uniforma tasti con Ctrl, tasti speciali e spazi"""
+    command = _WHITESPACE_RE.sub(' ', command.strip())
+
+    def ctrl(match):
+        key = match.group(1) or match.group(2) or match.group(3)
+        return f"Ctrl+{key.lower() if key.isalpha() else key}"
+
+    command = _CTRL_RE.sub(ctrl, command)
+    if _CARET_CTRL_RE.fullmatch(command):
+        command = f"Ctrl+{command[1].lower() if command[1].isalpha() else command[1]}"
+
+    def special(match):
+        return _SPECIAL_KEYS.get(match.group(1).lower(), match.group(0))
+
+    return _SPECIAL_KEY_RE.sub(special, command)
+
+
+def _value(text: str, placeholder: str, bank_words: Iterable[str] = ()) -> Tuple[str, ...]:
+    """Segmento di un valore: il segnaposto se il testo lo è già, altrimenti testo o segnaposto"""
+    if text in bank_words or _WORD_PLACEHOLDERS.get(text) == placeholder:
+        return (placeholder,)
+    return (text, placeholder)
+
+
+def _split_unescaped(text: str, delimiter: str) -> List[str]:
+    parts = ['']
+    escaped = False
+    for char in text:
+        if escaped:
+            parts[-1] += char
+            escaped = False
+        elif char == '\\':
+            parts[-1] += char
+            escaped = True
+        elif char == delimiter:
+            parts.append('')
+        else:
+            parts[-1] += char
+    return parts
+
+
+def _parse_ex(body: str) -> Segments:
+    match = _EX_RE.match(body)
+    if match is None:
+        return [(':' + body,)]
+    address, name, bang, argument = match.groups()
+    segments = [(':',)]
+
+    if address:
+        for part in _ADDRESS_PART_RE.split(address):
+            if part in (',', ';'):
+                segments.append((part,))
+            elif part in ('n', 'N', '#'):
+                segments.append((PLACEHOLDER_COUNT,))
+            elif part.isdigit():
+                segments.append((part, PLACEHOLDER_COUNT))
+            else:
+                segments.append((part,))
+
+    if name is None:
+        if argument:
+            segments.append((argument,))
+        return segments
+    full_name = _EX_ABBREVIATIONS.get(name, name)
+    segments.append((full_name + bang,))
+
+    if full_name == 'substitute' and argument and not argument[0].isalnum() and argument[0] != ' ':
+        delimiter = argument[0]
+        parts = _split_unescaped(argument[1:], delimiter)
+        pattern = parts[0]
+        replacement = parts[1] if len(parts) > 1 else ''
+        flags = ''.join(sorted(parts[2])) if len(parts) > 2 else ''
+        segments.append(('/',))
+        segments.append(_value(pattern, PLACEHOLDER_OLD, ('old',)))
+        segments.append(('/',))
+        segments.append(_value(replacement, PLACEHOLDER_NEW, ('new',)))
+        segments.append((f"/{flags}",))
+    elif argument:
+        segments.append((' ',))
+        if full_name in EX_FILE_COMMANDS:
+            segments.append(_value(argument, PLACEHOLDER_FILE))
+        else:
+            segments.append((argument,))
+    return segments
+
+
+def _parse_normal(command: str) -> Segments:
+    segments = []
+    register = _REGISTER_RE.match(command)
+    if register:
+        segments.append((register.group(0),))
+        command = command[register.end():]
+
+    count = _COUNT_RE.match(command)
+    if count:
+        text = count.group(1)
+        segments.append((PLACEHOLDER_COUNT,) if text in ('n', 'N') else (text, PLACEHOLDER_COUNT))
+        command = command[count.end():]
+
+    if command[:1] == 'r' and len(command) == 2:
+        # Sostituzione di un carattere (rx)
+        segments.append(('r',))
+        segments.append(_value(command[1], PLACEHOLDER_CHAR, ('x',)))
+        return segments
+
+    index = 0
+    literal = ''
+    while index < len(command):
+        char = command[index]
+        previous = command[index - 1] if index else ''
+        if (char in _CHAR_MOTIONS and index + 1 < len(command)
+                and previous not in ('"', "'", '`', 'm', '@', 'q')):
+            segments.append((literal + char,))
+            literal = ''
+            segments.append(_value(command[index + 1], PLACEHOLDER_CHAR, ('x',)))
+            index += 2
+            continue
+        literal += char
+        index += 1
+    if literal:
+        segments.append((literal,))
+    return segments
+
+
+def parse_command(command: str) -> Segments:
+    """
+    Scompone un comando in segmenti confrontabili
+
+    Ogni segmento è una tupla di alternative: la forma concreta e, per
+    conteggi, caratteri, file e testi, il segnaposto corrispondente. Nei
+    comandi della banca i segnaposto (nG, fx, :w filename, :s/old/new/)
+    compaiono già come unica alternativa.
+    """
+    command = _canonical_keys(command)
+    if not command:
+        return []
+    if command.startswith(':'):
+        return _parse_ex(command[1:].lstrip())
+    if command[0] in ('/', '?'):
+        return [(command[0],), _value(command[1:], PLACEHOLDER_PATTERN)] if len(command) > 1 else [(command,)]
+    if command.startswith('Ctrl+') or command.startswith('<'):
+        return [(command,)]
+    return _parse_normal(command)
+
+
+def normalize_command(command: str) -> str:
+    """
+    Forma canonica di un comando (abbreviazioni espanse, tasti uniformati)
+
+    Esempi: ':w' -> ':write', '<C-o>' -> 'Ctrl+o', 'nG' -> '{n}G'
+    """
+    return ''.join(segment[0] for segment in parse_command(command))
+
+
+def command_keys(command: str) -> List[str]:
+    """
+    Chiavi con cui cercare una risposta: la forma canonica e le sue generalizzazioni
+
+    Esempio: '10G' -> ['10G', '{n}G'], 'fa' -> ['fa', 'f{c}']
+    """
+    segments = parse_command(command)
+    if not segments:
+        return []
+    return list(dict.fromkeys(''.join(parts) for parts in product(*segments)))
+
+
+def _normalize_description(description: str) -> str:
+    return ' '.join(description.lower().split())
+
+
+def _find_root(parent: Dict[str, str], key: str) -> Optional[str]:
+    """Rappresentante della classe di una chiave in un union-find (None se assente)"""
+    node = parent.get(key)
+    if node is None:
+        return None
+    while node != key:
+        grandparent = parent[node]
+        parent[key] = grandparent
+        key, node = node, grandparent
+    return key
+
+
+def _union_roots(parent: Dict[str, str], first: str, second: str):
+    first_root, second_root = _find_root(parent, first), _find_root(parent, second)
+    if first_root != second_root:
+        parent[second_root] = first_root
+
+
+class CommandIndex:
+    """
+    Classi di equivalenza dei comandi della banca
+
+    Due comandi sono equivalenti se hanno la stessa forma canonica o
+    compaiono in EQUIVALENT_COMMANDS. Per i distrattori contano anche i
+    comandi con la stessa descrizione (es. iw e viw), che come risposta
+    sbagliata renderebbero la domanda ambigua (vedi confusable).
+    Valutare una risposta costa poche ricerche in un dizionario, senza
+    scorrere la banca.
+    """
+
+    def __init__(self, questions: Optional[Iterable[Any]] = None):
+        """
+        Args:
+            questions: Domande della banca (servono comando e descrizione)
+        """
+        # Forma canonica -> rappresentante della classe (union-find)
+        self._parent = {}
+        self.commands = {}
+        # Rappresentante -> comandi originali della classe (calcolati dopo build)
+        self._members = {}
+        # Rappresentante -> comandi della classe e con la stessa descrizione
+        self._confusable = {}
+        if questions is not None:
+            self.build(questions)
+
+    def build(self, questions: Iterable[Any]):
+        """Costruisce le classi a partire dalle domande"""
+        self._parent = {}
+        self.commands = {}
+        originals = {}
+        by_description = {}
+        for question in questions:
+            command = question.get('command', '')
+            if not command:
+                continue
+            key = self._add(command)
+            originals.setdefault(key, {})[command] = None
+            description = _normalize_description(question.get('description', ''))
+            if description:
+                by_description.setdefault(description, []).append(key)
+        for group in EQUIVALENT_COMMANDS:
+            keys = [self._add(command) for command in group]
+            for key in keys[1:]:
+                _union_roots(self._parent, keys[0], key)
+
+        members = {}
+        for key in self._parent:
+            group = members.setdefault(self._find(key), {})
+            group.update(originals.get(key) or {self.commands[key]: None})
+        self._members = {root: tuple(group) for root, group in members.items()}
+
+        # Classi più larghe per i distrattori: si uniscono le classi che
+        # condividono una descrizione
+        similar = {root: root for root in self._members}
+        for keys in by_description.values():
+            for key in keys[1:]:
+                _union_roots(similar, self._find(keys[0]), self._find(key))
+        groups = {}
+        for root, group in self._members.items():
+            groups.setdefault(_find_root(similar, root), {}).update(dict.fromkeys(group))
+        self._confusable = {root: tuple(groups[_find_root(similar, root)]) for root in self._members}
+
+    def _add(self, command: str) -> str:
+        key = normalize_command(command)
+        self._parent.setdefault(key, key)
+        self.commands.setdefault(key, command)
+        return key
+
+    def _find(self, key: str) -> Optional[str]:
+        return _find_root(self._parent, key)
+
+    def matches(self, answer: str, correct: str) -> bool:
+        """
+        True se la risposta scritta equivale al comando corretto
+
+        Args:
+            answer: Comando scritto dall'utente
+            correct: Comando corretto della domanda
+        """
+        correct_key = normalize_command(correct)
+        keys = command_keys(answer)
+        if correct_key in keys:
+            return True
+        target = self._find(correct_key)
+        if target is None:
+            return False
+        return any(self._find(key) == target for key in keys)
+
+    def equivalents(self, command: str) -> List[str]:
+        """Comandi equivalenti a un comando (lui compreso), senza scorrere la banca"""
+        return self._class_of(command, self._members)
+
+    def confusable(self, command: str) -> List[str]:
+        """Comandi da non proporre come risposta sbagliata: equivalenti e con la stessa descrizione"""
+        return self._class_of(command, self._confusable)
+
+    def _class_of(self, command: str, classes: Dict[str, Tuple[str, ...]]) -> List[str]:
+        target = self._find(normalize_command(command))
+        if target is None:
+            return [command]
+        members = classes.get(target, ())
+        return list(members) if command in members else [command, *members]
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Distractors - Generazione delle risposte sbagliate per il quiz
+Campiona i distrattori da insiemi precalcolati invece di scorrere tutta la banca
+"""
+
+import random
+import re
+from typing import Any, Callable, FrozenSet, Iterable, List, Optional, Tuple
+
+# Modalità di scelta dei distrattori
+MODE_RANDOM = 'random'      # qualsiasi comando della banca
+MODE_CATEGORY = 'category'  # preferisce comandi della stessa categoria
+MODE_SHAPE = 'shape'        # preferisce comandi di forma simile (es. :s e :%s)
+MODE_SIMILAR = 'similar'    # stessa categoria o forma simile
+DISTRACTOR_MODES = (MODE_RANDOM, MODE_CATEGORY, MODE_SHAPE, MODE_SIMILAR)
+
+_REGISTER_RE = re.compile(r'^[q@"][a-z0-9@"]')
+_MARK_RE = re.compile(r"^[m'`][a-z'`]")
+
+
+def command_shape(command: str) -> str:
+    """
+    Classifica un comando Vim per forma, così i distrattori sono plausibili
+
+    Esempi: ':s' e ':%s' -> 'ex', 'qa' e '@a' -> 'register', 'Ctrl+o' -> 'ctrl'
+    """
+    if command.startswith(':'):
+        return 'ex'
+    if command.startswith('Ctrl'):
+        return 'ctrl'
+    if command[:1] in ('/', '?', '*', '#'):
+        return 'search'
+    if _REGISTER_RE.match(command):
+        return 'register'
+    if _MARK_RE.match(command):
+        return 'mark'
+    if len(command) == 1:
+        return 'key'
+    if len(command) == 2:
+        return 'pair'
+    return 'sequence'
+
+
+class DistractorEngine:
+    def __init__(self, questions: List[Any], mode: str = MODE_RANDOM,
+                 equivalents: Optional[Callable[[str], Iterable[str]]] = None):
+        """
+        Inizializza il generatore di distrattori
+
+        Args:
+            questions: Domande della banca (servono comando e categoria)
+            mode: Modalità di scelta (vedi DISTRACTOR_MODES)
+            equivalents: Funzione comando -> comandi equivalenti o ambigui, mai proposti
+                         come risposte sbagliate (es. QuestionsLoader.get_confusable_commands)
+        """
+        if mode not in DISTRACTOR_MODES:
+            raise ValueError(f"Modalità distrattori non valida: {mode}")
+        self.mode = mode
+        self.equivalents = equivalents
+        self.questions = questions
+        self.commands = []
+        self.by_category = {}
+        self.by_shape = {}
+        self.command_info = {}
+        # Insiemi preferiti già calcolati: comando -> tupla di comandi
+        self._preferred_cache = {}
+        # Comandi da non proporre per ogni comando corretto (lui e gli equivalenti)
+        self._excluded_cache = {}
+        self.build(questions)
+
+    def build(self, questions: List[Any]):
+        """Precalcola gli insiemi di comandi per categoria e per forma"""
+        self.questions = questions
+        self.commands = []
+        self.by_category = {}
+        self.by_shape = {}
+        self.command_info = {}
+        self._preferred_cache = {}
+        self._excluded_cache = {}
+
+        for question in questions:
+            command = question.get('command', '')
+            if not command or command in self.command_info:
+                continue
+            category = question.get('source_category')
+            shape = command_shape(command)
+            self.command_info[command] = (category, shape)
+            self.commands.append(command)
+            self.by_category.setdefault(category, []).append(command)
+            self.by_shape.setdefault(shape, []).append(command)
+
+    def _excluded(self, correct: str) -> FrozenSet[str]:
+        """Il comando corretto e i suoi equivalenti (calcolati una volta)"""
+        excluded = self._excluded_cache.get(correct)
+        if excluded is None:
+            excluded = frozenset(self.equivalents(correct)) | {correct} if self.equivalents else frozenset((correct,))
+            self._excluded_cache[correct] = excluded
+        return excluded
+
+    def _preferred_pool(self, correct: str) -> Tuple[str, ...]:
+        """Comandi da preferire come distrattori per un comando (calcolati una volta)"""
+        pool = self._preferred_cache.get(correct)
+        if pool is not None:
+            return pool
+
+        category, shape = self.command_info.get(correct, (None, command_shape(correct)))
+        candidates = []
+        if self.mode in (MODE_SHAPE, MODE_SIMILAR):
+            candidates.extend(self.by_shape.get(shape, []))
+        if self.mode in (MODE_CATEGORY, MODE_SIMILAR):
+            candidates.extend(self.by_category.get(category, []))
+        excluded = self._excluded(correct)
+        pool = tuple(dict.fromkeys(cmd for cmd in candidates if cmd not in excluded))
+        self._preferred_cache[correct] = pool
+        return pool
+
+    @staticmethod
+    def _sample_excluding(pool, count: int, excluded, rng) -> List[str]:
+        """Campiona fino a count comandi distinti dal pool saltando quelli esclusi"""
+        if count <= 0 or not pool:
+            return []
+        # Si estraggono alcuni elementi in più per coprire quelli da scartare
+        extra = min(len(excluded), len(pool))
+        sampled = rng.sample(pool, min(len(pool), count + extra))
+        return [cmd for cmd in sampled if cmd not in excluded][:count]
+
+    def sample(self, correct: str, count: int, rng: Optional[random.Random] = None) -> List[str]:
+        """
+        Estrae i distrattori per una domanda, con costo proporzionale a count
+
+        Args:
+            correct: Comando corretto (mai restituito, come i suoi equivalenti)
+            count: Numero di distrattori
+            rng: Generatore casuale (opzionale)
+
+        Returns:
+            Lista di comandi distinti diversi da quello corretto
+        """
+        rng = rng or random
+        chosen = []
+        if self.mode != MODE_RANDOM:
+            chosen = self._sample_excluding(self._preferred_pool(correct), count, (), rng)
+        if len(chosen) < count:
+            excluded = self._excluded(correct).union(chosen)
+            chosen.extend(self._sample_excluding(self.commands, count - len(chosen), excluded, rng))
+        return chosen
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Editor Persistence - Scrittura dei file dell'editor delle domande
+Salvataggi atomici (file temporaneo + rename) eseguibili fuori dal thread grafico,
+traduzioni con tracciamento delle modifiche e giornale delle modifiche
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from i18n_manager import DESCRIPTIONS_DIR, LazyCategoryDescriptions
+
+# Un file da scrivere: (percorso, dati JSON)
+SaveJob = Tuple[str, Any]
+
+# Giornale delle modifiche predefinito (fuori da questions/, non è un pacchetto)
+DEFAULT_JOURNAL_PATH = ".editor_journal.jsonl"
+
+# Numero di modifiche nel giornale oltre il quale i file vengono riscritti
+JOURNAL_COMPACT_THRESHOLD = 200
+
+
+def json_text(data: Any, indent: int = 2) -> str:
+    """Testo JSON esattamente come lo scrive atomic_write_json"""
+    return json.dumps(data, indent=indent, ensure_ascii=False) + '\n'
+
+
+def text_digest(text: str) -> str:
+    """Impronta del contenuto di un file, per riconoscere la versione su cui si basa una modifica"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def atomic_write_json(path: str, data: Any, indent: int = 2):
+    """
+    Scrive un file JSON in modo atomico
+
+    I dati vanno in un file temporaneo nella stessa directory, che poi
+    sostituisce quello originale con os.replace: chi legge il file vede
+    sempre la versione precedente o quella nuova completa, mai una a metà.
+
+    Args:
+        path: Percorso del file di destinazione
+        data: Dati serializzabili in JSON
+        indent: Indentazione del JSON
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(json_text(data, indent))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+def write_jobs(jobs: List[SaveJob],
+               progress: Optional[Callable[[int, int, str], None]] = None) -> List[Tuple[str, str]]:
+    """
+    Scrive una serie di file JSON, proseguendo anche se qualcuno fallisce
+
+    Args:
+        jobs: File da scrivere
+        progress: Richiamata dopo ogni file con (scritti, totale, percorso)
+
+    Returns:
+        Lista degli errori come coppie (percorso, messaggio)
+    """
+    errors = []
+    total = len(jobs)
+    for done, (path, data) in enumerate(jobs, 1):
+        try:
+            atomic_write_json(path, data)
+        except (OSError, TypeError, ValueError) as e:
+            errors.append((path, str(e)))
+        if progress is not None:
+            progress(done, total, path)
+    return errors
+
+
+class TranslationStore:
+    """
+    Descrizioni tradotte delle domande, con le categorie modificate per lingua
+
+    Rispetta la struttura dei file di ogni lingua: il file unico
+    question_descriptions.json (categoria -> comando -> testo) oppure la
+    directory question_descriptions/ con un file per categoria. Nel secondo
+    caso al salvataggio si riscrivono solo le categorie modificate.
+    """
+
+    def __init__(self, locales_dir: str = "locales"):
+        """
+        Args:
+            locales_dir: Directory delle traduzioni
+        """
+        self.locales_dir = locales_dir
+        self.languages = {}
+        # Lingua -> categorie modificate dall'ultimo salvataggio
+        self.dirty = {}
+
+    def _descriptions(self, language: str) -> Dict[str, Dict[str, str]]:
+        """Descrizioni di una lingua, lette dal disco alla prima richiesta"""
+        descriptions = self.languages.get(language)
+        if descriptions is not None:
+            return descriptions
+        split_dir = os.path.join(self.locales_dir, language, DESCRIPTIONS_DIR)
+        if os.path.isdir(split_dir):
+            descriptions = LazyCategoryDescriptions(split_dir)
+        else:
+            descriptions = {}
+            path = os.path.join(self.locales_dir, language, "question_descriptions.json")
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    descriptions = json.load(f)
+        self.languages[language] = descriptions
+        return descriptions
+
+    def _category(self, language: str, category: str) -> Dict[str, str]:
+        descriptions = self._descriptions(language)
+        if isinstance(descriptions, LazyCategoryDescriptions):
+            return descriptions.get_category(category)
+        return descriptions.setdefault(category, {})
+
+    def get(self, language: str, category: str, command: str) -> Optional[str]:
+        """Descrizione tradotta di un comando, o None se manca"""
+        return self._category(language, category).get(command)
+
+    def set(self, language: str, category: str, command: str, text: str) -> bool:
+        """
+        Imposta (o rimuove, con testo vuoto) la traduzione di un comando
+
+        Returns:
+            True se la traduzione è cambiata
+        """
+        descriptions = self._category(language, category)
+        if text:
+            if descriptions.get(command) == text:
+                return False
+            descriptions[command] = text
+        else:
+            if command not in descriptions:
+                return False
+            del descriptions[command]
+        self.mark_dirty(language, {category})
+        return True
+
+    def mark_dirty(self, language: str, categories: Set[str]):
+        """Segna delle categorie di una lingua come da salvare"""
+        self.dirty.setdefault(language, set()).update(categories)
+
+    def is_dirty(self) -> bool:
+        """True se ci sono traduzioni da salvare"""
+        return any(self.dirty.values())
+
+    def take_jobs(self) -> Tuple[List[SaveJob], Dict[str, Tuple[str, Set[str]]]]:
+        """
+        Prepara i file delle lingue modificate e azzera le modifiche
+
+        Returns:
+            (file da scrivere, percorso -> (lingua, categorie)); la seconda
+            mappa serve a segnare di nuovo da salvare i file non scritti
+        """
+        jobs = []
+        owners = {}
+        for language in sorted(self.dirty):
+            categories = self.dirty[language]
+            if not categories:
+                continue
+            descriptions = self.languages[language]
+            if isinstance(descriptions, LazyCategoryDescriptions):
+                directory = os.path.join(self.locales_dir, language, DESCRIPTIONS_DIR)
+                for category in sorted(categories):
+                    path = os.path.join(directory, f"{category}.json")
+                    jobs.append((path, dict(descriptions.get_category(category))))
+                    owners[path] = (language, {category})
+            else:
+                path = os.path.join(self.locales_dir, language, "question_descriptions.json")
+                jobs.append((path, copy.deepcopy(descriptions)))
+                owners[path] = (language, set(categories))
+        self.dirty = {}
+        return jobs, owners
+
+
+def journal_key(record: Dict[str, Any]) -> Tuple:
+    """
+    File a cui si riferisce una modifica del giornale
+
+    Returns:
+        ('questions', categoria) oppure ('translations', lingua, categoria)
+    """
+    if record.get('op') == 'set_translation':
+        return ('translations', record.get('language'), record.get('category'))
+    return ('questions', record.get('category'))
+
+
+class ChangeJournal:
+    """
+    Giornale delle modifiche in sola aggiunta (una riga JSON per modifica)
+
+    Salvare una modifica costa una riga invece della riscrittura dei file;
+    quando il giornale supera la soglia i file vengono riscritti e le
+    modifiche ormai contenute nei file tolte dal giornale (compattazione).
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH,
+                 compact_threshold: int = JOURNAL_COMPACT_THRESHOLD):
+        """
+        Args:
+            path: File del giornale
+            compact_threshold: Numero di modifiche oltre il quale compattare
+        """
+        self.path = path
+        self.compact_threshold = compact_threshold
+        self.record_count = 0
+
+    def read(self) -> List[Dict[str, Any]]:
+        """
+        Legge le modifiche registrate
+
+        Una riga finale incompleta (scrittura interrotta) viene ignorata.
+        """
+        records = []
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+        self.record_count = len(records)
+        return records
+
+    def append(self, records: List[Dict[str, Any]]):
+        """Aggiunge delle modifiche in fondo al giornale e le rende persistenti"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.record_count += len(records)
+
+    def needs_compaction(self) -> bool:
+        """True se il giornale ha superato la soglia di compattazione"""
+        return self.record_count >= self.compact_threshold
+
+    def clear(self):
+        """Svuota il giornale"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.record_count = 0
+
+    def discard(self, keys: Set[Tuple]):
+        """
+        Toglie dal giornale le modifiche dei file appena riscritti
+
+        Il giornale viene riscritto in modo atomico con le sole modifiche
+        rimaste, oppure eliminato se non ne resta nessuna.
+
+        Args:
+            keys: File riscritti, nella forma restituita da journal_key
+        """
+        if not keys:
+            return
+        records = [record for record in self.read() if journal_key(record) not in keys]
+        if not records:
+            self.clear()
+            return
+        tmp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            raise
+        self.record_count = len(records)
+
+
+def apply_change(record: Dict[str, Any], questions_data: Dict[str, Any],
+                 translations: TranslationStore, dirty_categories: Set[str],
+                 bases: Dict[str, str]) -> bool:
+    """
+    Riapplica una modifica del giornale ai dati caricati dai file
+
+    Le modifiche alle domande sono posizionali, quindi valgono solo sulla
+    versione del file da cui sono partite: quelle il cui 'base' non
+    corrisponde all'impronta del file attuale (file già riscritto con la
+    modifica, oppure modificato fuori dall'editor) vengono scartate.
+
+    Args:
+        record: Modifica ('put_question', 'delete_question' o 'set_translation')
+        questions_data: Dati delle categorie (nome -> contenuto del file)
+        translations: Traduzioni dell'editor
+        dirty_categories: Insieme delle categorie da riscrivere (aggiornato)
+        bases: Categoria -> impronta del file letto dal disco (vedi text_digest)
+
+    Returns:
+        True se la modifica è stata applicata
+    """
+    op = record.get('op')
+    if op == 'set_translation':
+        # Imposta un valore: riapplicarla più volte non cambia il risultato
+        translations.set(record['language'], record['category'], record['command'], record['text'])
+        return True
+
+    category = record.get('category')
+    category_data = questions_data.get(category)
+    if category_data is None or record.get('base') is None or record.get('base') != bases.get(category):
+        return False
+    questions = category_data.setdefault('questions', [])
+    index = record.get('index', len(questions))
+    if op == 'put_question':
+        if index < len(questions):
+            questions[index] = record['question']
+        elif index == len(questions):
+            questions.append(record['question'])
+        else:
+            return False
+        if 'difficulty' in record:
+            category_data['difficulty'] = record['difficulty']
+    elif op == 'delete_question':
+        if index >= len(questions) or questions[index].get('command') != record.get('command'):
+            return False
+        del questions[index]
+    else:
+        return False
+    dirty_categories.add(category)
+    return True
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+File Watcher - Ricaricamento a caldo di domande e traduzioni
+Confronta mtime e dimensione dei file JSON e ricarica solo quelli cambiati
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Intervallo predefinito del controllo periodico (secondi)
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class SourceWatcher:
+    """
+    Osserva le directory di domande e traduzioni e aggiorna chi le ha caricate
+
+    poll() confronta lo stato dei file con il controllo precedente e passa
+    ogni file aggiunto, modificato o rimosso a QuestionsLoader.reload_file o
+    a I18nManager.reload_file, che notificano i propri ascoltatori.
+
+    Le applicazioni Qt chiamano poll() quando QFileSystemWatcher (inotify)
+    segnala una modifica (vedi qt_file_watcher.QtSourceWatcher); senza Qt,
+    start() esegue poll() periodicamente in un thread separato.
+    """
+
+    def __init__(self, questions_loader=None, i18n_manager=None,
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            questions_loader: Caricatore delle domande da aggiornare (opzionale)
+            i18n_manager: Gestore delle traduzioni da aggiornare (opzionale)
+            interval: Intervallo del controllo periodico in secondi (start)
+        """
+        self.questions_loader = questions_loader
+        self.i18n_manager = i18n_manager
+        self.interval = interval
+        self._thread = None
+        self._stop = threading.Event()
+        self._snapshot = self._scan()
+
+    def directories(self) -> List[str]:
+        """Directory da osservare (domande, traduzioni e directory di ogni lingua)"""
+        directories = []
+        if self.questions_loader is not None and os.path.isdir(self.questions_loader.questions_dir):
+            directories.append(self.questions_loader.questions_dir)
+        if self.i18n_manager is not None and os.path.isdir(self.i18n_manager.locales_dir):
+            locales_dir = self.i18n_manager.locales_dir
+            directories.append(locales_dir)
+            for language in sorted(os.listdir(locales_dir)):
+                language_dir = os.path.join(locales_dir, language)
+                if os.path.isdir(language_dir):
+                    directories.append(language_dir)
+                    for entry in sorted(os.listdir(language_dir)):
+                        if os.path.isdir(os.path.join(language_dir, entry)):
+                            directories.append(os.path.join(language_dir, entry))
+        return directories
+
+    def files(self) -> List[str]:
+        """File JSON trovati nell'ultimo controllo"""
+        return sorted(path for path, (mtime, _) in self._snapshot.items() if mtime is not None)
+
+    def _scan(self) -> Dict[str, Tuple[Optional[int], Optional[int]]]:
+        """Stato corrente: percorso -> (mtime, dimensione) di file JSON e directory delle lingue"""
+        snapshot = {}
+        for directory in self.directories():
+            try:
+                entries = os.scandir(directory)
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir():
+                            # Le directory contano solo come presenza (nuove lingue)
+                            snapshot[entry.path] = (None, None)
+                        elif entry.name.endswith('.json'):
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        return snapshot
+
+    def poll(self) -> List[str]:
+        """
+        Ricarica i file cambiati dal controllo precedente
+
+        Returns:
+            Percorsi aggiunti, modificati o rimossi
+        """
+        snapshot = self._scan()
+        previous = self._snapshot
+        changed = sorted(path for path in set(snapshot) | set(previous)
+                         if snapshot.get(path) != previous.get(path))
+        self._snapshot = snapshot
+        for path in changed:
+            self._dispatch(path)
+        return changed
+
+    def _dispatch(self, path: str):
+        """Passa un percorso cambiato a chi lo ha caricato"""
+        if self.questions_loader is not None and _is_inside(path, self.questions_loader.questions_dir):
+            self.questions_loader.reload_file(path)
+        elif self.i18n_manager is not None and _is_inside(path, self.i18n_manager.locales_dir):
+            self.i18n_manager.reload_file(path)
+
+    def start(self) -> threading.Thread:
+        """
+        Avvia il controllo periodico in un thread separato
+
+        Gli ascoltatori di caricatore e traduzioni vengono richiamati da
+        quel thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="source-watcher", daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Ferma il controllo periodico e scrive la cache della banca se i ricaricamenti l'hanno cambiata"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.questions_loader is not None:
+            self.questions_loader.flush_cache()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Errore nel controllo dei file: {e}")
+
+
+def _is_inside(path: str, directory: str) -> bool:
+    """True se path si trova dentro directory"""
+    directory = os.path.abspath(directory)
+    return os.path.abspath(path).startswith(directory + os.sep)
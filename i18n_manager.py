@@ -7,22 +7,225 @@ Gestisce le traduzioni per multiple lingue
 import json
 import os
 import locale
-from typing import Dict, Any, Optional
+import string
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Iterable, Optional, Tuple
+
+# File di traduzione letti per ogni lingua
+LANGUAGE_FILES = ("main.json", "questions.json", "question_descriptions.json")
+
+# Directory opzionale con le descrizioni divise per categoria
+# (locales/<lingua>/question_descriptions/<categoria>.json), caricate su richiesta
+DESCRIPTIONS_DIR = "question_descriptions"
+
+# Sezioni dei file di traduzione escluse dal catalogo piatto di get_text:
+# le descrizioni delle domande hanno un accesso dedicato
+CATALOG_EXCLUDED_SECTIONS = ('question_descriptions',)
+
+_FORMATTER = string.Formatter()
+
+
+def flatten_translations(data: Dict[str, Any], prefix: str = '') -> Dict[str, str]:
+    """
+    Appiattisce un dizionario di traduzioni annidato in chiavi puntate
+    
+    Args:
+        data: Dizionario annidato (es. {'app': {'title': '...'}})
+        prefix: Prefisso delle chiavi (usato nella ricorsione)
+        
+    Returns:
+        Dizionario chiave puntata -> testo (es. {'app.title': '...'})
+    """
+    flat = {}
+    for key, value in data.items():
+        if not prefix and key in CATALOG_EXCLUDED_SECTIONS:
+            continue
+        dotted_key = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_translations(value, f"{dotted_key}."))
+        elif isinstance(value, str):
+            flat[dotted_key] = value
+        else:
+            flat[dotted_key] = str(value)
+    return flat
+
+class LazyCategoryDescriptions(dict):
+    """
+    Descrizioni delle domande divise per categoria, lette solo al primo accesso
+    
+    Si comporta come il dizionario categoria -> {comando: descrizione} del
+    file unico, ma ogni categoria viene letta dal proprio file quando serve.
+    """
+    
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self.available = set()
+        if os.path.isdir(directory):
+            self.available = {filename[:-5] for filename in os.listdir(directory)
+                              if filename.endswith('.json')}
+    
+    def get_category(self, category: str) -> Dict[str, str]:
+        """Ottieni le descrizioni di una categoria, leggendole dal disco la prima volta"""
+        descriptions = dict.get(self, category)
+        if descriptions is not None:
+            return descriptions
+        descriptions = {}
+        if category in self.available:
+            try:
+                with open(os.path.join(self.directory, f"{category}.json"), 'r', encoding='utf-8') as f:
+                    descriptions = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Errore nel caricamento delle descrizioni '{category}': {e}")
+        self[category] = descriptions
+        return descriptions
+    
+    def __missing__(self, category: str) -> Dict[str, str]:
+        if category not in self.available:
+            raise KeyError(category)
+        return self.get_category(category)
+    
+    def __contains__(self, category) -> bool:
+        return category in self.available or dict.__contains__(self, category)
+    
+    def load_all(self) -> 'LazyCategoryDescriptions':
+        """Carica tutte le categorie disponibili"""
+        for category in self.available:
+            self.get_category(category)
+        return self
+
+
+def split_question_descriptions(locales_dir: str, language: str) -> int:
+    """
+    Divide question_descriptions.json di una lingua in un file per categoria
+    
+    Dopo la divisione I18nManager carica le descrizioni di una categoria solo
+    quando vengono richieste. Il file unico originale non viene toccato, ma
+    la directory divisa ha la precedenza.
+    
+    Args:
+        locales_dir: Directory delle traduzioni
+        language: Codice lingua
+        
+    Returns:
+        Numero di file di categoria scritti
+    """
+    source = os.path.join(locales_dir, language, "question_descriptions.json")
+    with open(source, 'r', encoding='utf-8') as f:
+        descriptions = json.load(f)
+    
+    directory = os.path.join(locales_dir, language, DESCRIPTIONS_DIR)
+    os.makedirs(directory, exist_ok=True)
+    for category, commands in descriptions.items():
+        target = os.path.join(directory, f"{category}.json")
+        tmp_file = f"{target}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(commands, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, target)
+    return len(descriptions)
+
+
+def get_category_descriptions(descriptions: Dict[str, Any], category: str) -> Dict[str, str]:
+    """Ottieni le descrizioni di una categoria da un dizionario normale o lazy"""
+    if isinstance(descriptions, LazyCategoryDescriptions):
+        return descriptions.get_category(category)
+    return descriptions.get(category, {})
+
+
+class FormatTemplate:
+    """
+    Testo con segnaposto analizzato una sola volta (string.Formatter().parse)
+
+    I segnaposto semplici ({nome}, {nome:spec}, {nome!r}) si sostituiscono
+    direttamente dai segmenti salvati; quelli con attributi, indici o
+    specifiche annidate passano per str.format sul testo originale.
+    """
+
+    __slots__ = ('text', 'segments', 'fields', 'literal', 'simple')
+
+    def __init__(self, text: str):
+        self.text = text
+        try:
+            self.segments = tuple(_FORMATTER.parse(text))
+        except ValueError:
+            # Parentesi non bilanciate: render solleva ValueError come str.format
+            self.segments = None
+            self.fields = frozenset()
+            self.literal = None
+            self.simple = False
+            return
+        self.fields = frozenset(name for _, name, _, _ in self.segments if name is not None)
+        # Senza segnaposto resta solo il testo con le graffe doppie già risolte
+        self.literal = ''.join(literal for literal, _, _, _ in self.segments) if not self.fields else None
+        self.simple = all(name.isidentifier() and '{' not in spec
+                          for _, name, spec, _ in self.segments if name is not None)
+
+    def render(self, kwargs: Dict[str, Any]) -> str:
+        """Sostituisce i segnaposto (solleva KeyError, IndexError o ValueError come str.format)"""
+        if self.segments is None:
+            raise ValueError(f"Invalid format string: {self.text!r}")
+        if not self.simple:
+            return self.text.format(**kwargs)
+        parts = []
+        for literal, name, spec, conversion in self.segments:
+            parts.append(literal)
+            if name is None:
+                continue
+            value = kwargs[name]
+            if conversion == 'r':
+                value = repr(value)
+            elif conversion == 's':
+                value = str(value)
+            elif conversion == 'a':
+                value = ascii(value)
+            parts.append(format(value, spec))
+        return ''.join(parts)
+
+
+def _compile_text(text: str) -> Optional[FormatTemplate]:
+    """Modello di formattazione di un testo, None se non contiene graffe"""
+    if '{' in text or '}' in text:
+        return FormatTemplate(text)
+    return None
+
 
 class I18nManager:
-    def __init__(self, locales_dir: str = "locales", default_language: str = "en"):
+    def __init__(self, locales_dir: str = "locales", default_language: str = "en",
+                 cache_size: int = 4, validate_mtime: bool = True, verbose: bool = False):
         """
         Inizializza il gestore delle traduzioni
         
         Args:
             locales_dir: Directory contenente i file di traduzione
             default_language: Lingua predefinita
+            cache_size: Numero massimo di lingue tenute in memoria (LRU)
+            validate_mtime: Ricarica una lingua in cache se i suoi file sono cambiati
+            verbose: Stampa i messaggi informativi sul caricamento
         """
         self.locales_dir = locales_dir
         self.default_language = default_language
         self.current_language = default_language
-        self.translations = {}
+        self.cache_size = max(1, cache_size)
+        self.validate_mtime = validate_mtime
+        self.verbose = verbose
+        # Cache LRU delle lingue caricate: la più recente è in fondo
+        self.translations = OrderedDict()
         self.supported_languages = []
+        # Firma (mtime e dimensione) dei file di ogni lingua letta dal disco
+        self._signatures = {}
+        self._lock = threading.RLock()
+        # Incrementato quando una lingua già letta viene riletta con contenuto
+        # diverso: permette agli indici esterni di capire quando invalidarsi
+        self.revision = 0
+        # Cataloghi piatti: lingua -> chiave puntata -> (testo, FormatTemplate o None, da fallback)
+        self._flat_translations = {}
+        self._catalogs = {}
+        # Statistiche per i traduttori: lingua -> chiave -> numero di richieste
+        self.missing_keys = {}
+        self.fallback_keys = {}
+        # Funzioni richiamate dopo ogni ricaricamento parziale: callback(lingua, file)
+        self._change_listeners = []
         
         # Rileva la lingua di sistema
         self.system_language = self._detect_system_language()
@@ -59,9 +262,136 @@ class I18nManager:
         
         self.supported_languages.sort()
     
+    def _log(self, message: str):
+        """Stampa un messaggio informativo solo in modalità verbose"""
+        if self.verbose:
+            print(message)
+    
+    def _language_signature(self, language: str) -> Tuple:
+        """
+        Firma dei file di una lingua: (nome, mtime, dimensione) per ogni file esistente
+        
+        Comprende i file di question_descriptions/ uno per uno: la mtime della
+        directory cambia solo quando si aggiungono o tolgono file, non quando
+        se ne modifica uno.
+        """
+        signature = []
+        for filename in LANGUAGE_FILES:
+            try:
+                stat = os.stat(os.path.join(self.locales_dir, language, filename))
+                signature.append((filename, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append((filename, None, None))
+        descriptions_dir = os.path.join(self.locales_dir, language, DESCRIPTIONS_DIR)
+        try:
+            stat = os.stat(descriptions_dir)
+            signature.append((DESCRIPTIONS_DIR, stat.st_mtime_ns, None))
+            with os.scandir(descriptions_dir) as entries:
+                files = sorted((entry.name, entry.stat()) for entry in entries
+                               if entry.name.endswith('.json'))
+            for filename, stat in files:
+                signature.append((f"{DESCRIPTIONS_DIR}/{filename}", stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            pass
+        return tuple(signature)
+    
+    def _read_language(self, language: str) -> Optional[Dict[str, Any]]:
+        """
+        Legge dal disco tutti i file di traduzione di una lingua
+        
+        Returns:
+            Traduzioni della lingua, oppure None se manca main.json
+        """
+        # Carica il file di traduzione principale
+        main_file = os.path.join(self.locales_dir, language, "main.json")
+        if not os.path.exists(main_file):
+            print(f"File di traduzione non trovato: {main_file}")
+            return None
+        with open(main_file, 'r', encoding='utf-8') as f:
+            translations = json.load(f)
+        
+        # Carica le traduzioni delle domande
+        questions_file = os.path.join(self.locales_dir, language, "questions.json")
+        if os.path.exists(questions_file):
+            with open(questions_file, 'r', encoding='utf-8') as f:
+                translations['questions'] = json.load(f)
+        
+        # Carica le traduzioni delle descrizioni delle domande: se esiste la
+        # directory divisa per categoria le categorie vengono lette su richiesta
+        descriptions_dir = os.path.join(self.locales_dir, language, DESCRIPTIONS_DIR)
+        descriptions_file = os.path.join(self.locales_dir, language, "question_descriptions.json")
+        if os.path.isdir(descriptions_dir):
+            translations['question_descriptions'] = LazyCategoryDescriptions(descriptions_dir)
+        elif os.path.exists(descriptions_file):
+            with open(descriptions_file, 'r', encoding='utf-8') as f:
+                translations['question_descriptions'] = json.load(f)
+        
+        return translations
+    
+    def _ensure_loaded(self, language: str) -> bool:
+        """
+        Porta una lingua nella cache, leggendo i file solo se necessario
+        
+        Args:
+            language: Codice lingua
+            
+        Returns:
+            True se la lingua è disponibile in memoria
+        """
+        with self._lock:
+            cached = language in self.translations
+            signature = None
+            if self.validate_mtime or not cached:
+                signature = self._language_signature(language)
+            if cached and (not self.validate_mtime or self._signatures.get(language) == signature):
+                self.translations.move_to_end(language)
+                return True
+            
+            translations = self._read_language(language)
+            if translations is None:
+                return False
+            
+            previous_signature = self._signatures.get(language)
+            self.translations[language] = translations
+            self.translations.move_to_end(language)
+            self._signatures[language] = signature
+            self._flat_translations[language] = flatten_translations(translations)
+            if language == self.default_language:
+                # I cataloghi delle altre lingue incorporano i fallback della lingua predefinita
+                self._catalogs = {}
+            else:
+                self._catalogs.pop(language, None)
+            if previous_signature is not None and previous_signature != signature:
+                self.revision += 1
+            
+            self._evict(language)
+            self._log(f"Traduzioni caricate per la lingua: {language}")
+            return True
+    
+    def _evict(self, keep: Optional[str] = None):
+        """
+        Rimuove le lingue usate meno di recente oltre la capacità della cache
+        
+        Args:
+            keep: Lingua appena caricata da non rimuovere anche se la cache è piena
+        """
+        pinned = (self.default_language, self.current_language, keep)
+        for language in list(self.translations):
+            if len(self.translations) <= self.cache_size:
+                break
+            if language in pinned:
+                continue
+            del self.translations[language]
+            self._flat_translations.pop(language, None)
+            self._catalogs.pop(language, None)
+            self._log(f"Traduzioni rimosse dalla cache: {language}")
+    
     def load_translations(self, language: str) -> bool:
         """
-        Carica le traduzioni per una lingua specifica
+        Carica le traduzioni per una lingua specifica e la rende corrente
+        
+        Se la lingua è già in cache e i suoi file non sono cambiati non
+        viene letto nulla dal disco.
         
         Args:
             language: Codice lingua (es. 'en', 'it', 'es')
@@ -74,41 +404,105 @@ class I18nManager:
             language = self.default_language
         
         try:
-            # Carica il file di traduzione principale
-            main_file = os.path.join(self.locales_dir, language, "main.json")
-            if os.path.exists(main_file):
-                with open(main_file, 'r', encoding='utf-8') as f:
-                    self.translations[language] = json.load(f)
-            else:
-                print(f"File di traduzione non trovato: {main_file}")
+            if not self._ensure_loaded(language):
                 return False
-            
-            # Carica le traduzioni delle domande
-            questions_file = os.path.join(self.locales_dir, language, "questions.json")
-            if os.path.exists(questions_file):
-                with open(questions_file, 'r', encoding='utf-8') as f:
-                    questions_translations = json.load(f)
-                    if language not in self.translations:
-                        self.translations[language] = {}
-                    self.translations[language]['questions'] = questions_translations
-            
-            # Carica le traduzioni delle descrizioni delle domande
-            descriptions_file = os.path.join(self.locales_dir, language, "question_descriptions.json")
-            if os.path.exists(descriptions_file):
-                with open(descriptions_file, 'r', encoding='utf-8') as f:
-                    descriptions_translations = json.load(f)
-                    if language not in self.translations:
-                        self.translations[language] = {}
-                    self.translations[language]['question_descriptions'] = descriptions_translations
-            
-            self.current_language = language
-            print(f"Traduzioni caricate per la lingua: {language}")
+            with self._lock:
+                self.current_language = language
+                self._evict()
             return True
             
         except Exception as e:
             print(f"Errore nel caricamento delle traduzioni per '{language}': {e}")
             return False
     
+    def preload_languages(self, languages: Optional[Iterable[str]] = None,
+                          background: bool = True) -> Optional[threading.Thread]:
+        """
+        Carica in anticipo più lingue nella cache senza cambiare la lingua corrente
+        
+        Args:
+            languages: Lingue da caricare (predefinito: tutte le supportate,
+                       nei limiti della capacità della cache)
+            background: Esegue il caricamento in un thread separato
+            
+        Returns:
+            Il thread avviato, oppure None se il caricamento è sincrono
+        """
+        if languages is None:
+            languages = [lang for lang in self.supported_languages if lang != self.current_language]
+            languages = languages[:max(0, self.cache_size - 1)]
+        languages = [lang for lang in languages if lang in self.supported_languages]
+        
+        def preload():
+            for language in languages:
+                try:
+                    self._ensure_loaded(language)
+                except Exception as e:
+                    print(f"Errore nel precaricamento delle traduzioni per '{language}': {e}")
+        
+        if not background:
+            preload()
+            return None
+        thread = threading.Thread(target=preload, name="i18n-preload", daemon=True)
+        thread.start()
+        return thread
+    
+    def _get_catalog(self, language: str) -> Optional[Dict[str, Tuple[str, Optional[FormatTemplate], bool]]]:
+        """
+        Ottieni il catalogo piatto di una lingua, costruendolo alla prima richiesta
+        
+        Il catalogo contiene già i testi della lingua predefinita per le chiavi
+        non tradotte, così ogni ricerca è un solo accesso al dizionario, e i
+        testi con segnaposto già analizzati (FormatTemplate), così get_text
+        non rianalizza il modello a ogni chiamata.
+        
+        Returns:
+            Dizionario chiave -> (testo, FormatTemplate o None, preso dal fallback),
+            oppure None se la lingua non è caricata
+        """
+        catalog = self._catalogs.get(language)
+        if catalog is not None:
+            return catalog
+        flat = self._flat_translations.get(language)
+        if flat is None:
+            return None
+        
+        catalog = {}
+        if language != self.default_language:
+            for key, text in self._flat_translations.get(self.default_language, {}).items():
+                catalog[key] = (text, _compile_text(text), True)
+        for key, text in flat.items():
+            catalog[key] = (text, _compile_text(text), False)
+        self._catalogs[language] = catalog
+        return catalog
+    
+    def _lookup_text(self, language: str, key: str, kwargs: Dict[str, Any]) -> str:
+        """Cerca e formatta una chiave nel catalogo di una lingua"""
+        catalog = self._get_catalog(language)
+        if catalog is None:
+            return key
+        
+        entry = catalog.get(key)
+        if entry is None:
+            missing = self.missing_keys.setdefault(language, {})
+            missing[key] = missing.get(key, 0) + 1
+            return key
+        
+        text, template, from_fallback = entry
+        if from_fallback:
+            fallback = self.fallback_keys.setdefault(language, {})
+            fallback[key] = fallback.get(key, 0) + 1
+        if template is None:
+            return text
+        if template.literal is not None:
+            return template.literal
+        if kwargs:
+            try:
+                return template.render(kwargs)
+            except (KeyError, IndexError, ValueError):
+                return key
+        return text
+    
     def get_text(self, key: str, **kwargs) -> str:
         """
         Ottieni il testo tradotto per una chiave
@@ -120,76 +514,200 @@ class I18nManager:
         Returns:
             Testo tradotto o la chiave stessa se non trovata
         """
-        if self.current_language not in self.translations:
-            return key
-        
-        # Naviga nella struttura delle traduzioni
-        keys = key.split('.')
-        value = self.translations[self.current_language]
-        
-        try:
-            for k in keys:
-                value = value[k]
-            
-            # Se il valore è una stringa, formattala con i parametri
-            if isinstance(value, str):
-                return value.format(**kwargs) if kwargs else value
-            else:
-                return str(value)
-                
-        except (KeyError, TypeError):
-            # Se non trovato, prova con la lingua predefinita
-            if self.current_language != self.default_language:
-                return self.get_text_fallback(key, **kwargs)
-            return key
+        return self._lookup_text(self.current_language, key, kwargs)
     
     def get_text_fallback(self, key: str, **kwargs) -> str:
         """Ottieni il testo dalla lingua predefinita come fallback"""
-        if self.default_language not in self.translations:
-            return key
-        
-        keys = key.split('.')
-        value = self.translations[self.default_language]
+        return self._lookup_text(self.default_language, key, kwargs)
+    
+    def get_missing_stats(self) -> Dict[str, Any]:
+        """
+        Ottieni le statistiche delle chiavi mancanti, utili ai traduttori
         
-        try:
-            for k in keys:
-                value = value[k]
-            
-            if isinstance(value, str):
-                return value.format(**kwargs) if kwargs else value
-            else:
-                return str(value)
-                
-        except (KeyError, TypeError):
-            return key
+        Returns:
+            Dizionario con:
+            - 'missing': lingua -> chiave -> richieste di chiavi inesistenti
+            - 'fallback': lingua -> chiave -> richieste servite dalla lingua predefinita
+            - 'untranslated': lingua -> chiavi della lingua predefinita non tradotte
+        """
+        untranslated = {}
+        default_keys = self._flat_translations.get(self.default_language, {})
+        for language, flat in self._flat_translations.items():
+            if language != self.default_language:
+                untranslated[language] = sorted(key for key in default_keys if key not in flat)
+        return {
+            'missing': {language: dict(keys) for language, keys in self.missing_keys.items()},
+            'fallback': {language: dict(keys) for language, keys in self.fallback_keys.items()},
+            'untranslated': untranslated,
+        }
     
     def get_question_text(self, question_key: str, **kwargs) -> str:
         """Ottieni il testo tradotto per una domanda specifica"""
         return self.get_text(f"questions.{question_key}", **kwargs)
     
-    def get_question_description(self, category: str, command: str) -> str:
-        """Ottieni la descrizione tradotta per un comando specifico"""
-        try:
-            if (self.current_language in self.translations and 
-                'question_descriptions' in self.translations[self.current_language] and
-                category in self.translations[self.current_language]['question_descriptions'] and
-                command in self.translations[self.current_language]['question_descriptions'][category]):
-                return self.translations[self.current_language]['question_descriptions'][category][command]
-        except (KeyError, TypeError):
-            pass
+    def get_question_description(self, category: str, command: str,
+                                 language: Optional[str] = None) -> str:
+        """
+        Ottieni la descrizione tradotta per un comando specifico
         
-        # Fallback alla lingua predefinita
-        try:
-            if ('question_descriptions' in self.translations[self.default_language] and
-                category in self.translations[self.default_language]['question_descriptions'] and
-                command in self.translations[self.default_language]['question_descriptions'][category]):
-                return self.translations[self.default_language]['question_descriptions'][category][command]
-        except (KeyError, TypeError):
-            pass
+        Args:
+            category: Chiave di traduzione della categoria
+            command: Comando Vim
+            language: Lingua (predefinita: la lingua corrente), con ripiego sulla predefinita
+        """
+        for language in (language or self.current_language, self.default_language):
+            translations = self.translations.get(language)
+            if not translations or 'question_descriptions' not in translations:
+                continue
+            description = get_category_descriptions(translations['question_descriptions'], category).get(command)
+            if description is not None:
+                return description
         
         # Se non trovato, restituisci la chiave originale
         return command
     
+    def get_question_descriptions(self, language: str, category: str) -> Dict[str, str]:
+        """
+        Ottieni le descrizioni tradotte di una categoria in una lingua già caricata
+        
+        Args:
+            language: Codice lingua
+            category: Chiave di traduzione della categoria
+            
+        Returns:
+            Dizionario comando -> descrizione (vuoto se non disponibile)
+        """
+        descriptions = self.translations.get(language, {}).get('question_descriptions', {})
+        return get_category_descriptions(descriptions, category)
+    
+    def add_change_listener(self, callback: Callable[[str, str], None]):
+        """
+        Registra una funzione richiamata dopo ogni reload_file riuscito
+        
+        Riceve anche i file delle lingue non in memoria (per chi legge
+        quei file per conto proprio, come l'editor delle domande).
+        
+        Args:
+            callback: Funzione che riceve lingua e percorso relativo del file
+                      (es. 'it', 'main.json' o 'question_descriptions/macros.json')
+        """
+        self._change_listeners.append(callback)
+    
+    def remove_change_listener(self, callback: Callable[[str, str], None]):
+        """Rimuove una funzione registrata con add_change_listener"""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+    
+    def _read_json(self, path: str) -> Any:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def reload_file(self, path: str) -> bool:
+        """
+        Rilegge un solo file di traduzione e aggiorna la lingua in memoria
+        
+        Solo il file indicato viene riletto: main.json e questions.json
+        aggiornano il catalogo piatto della lingua, le descrizioni delle
+        domande incrementano revision (così le viste tradotte del caricatore
+        si ricalcolano). Una nuova directory di lingua la rende supportata.
+        Le lingue non in memoria non vengono lette. Un file non valido (ad
+        esempio a metà scrittura) lascia le traduzioni invariate.
+        
+        Args:
+            path: Percorso del file (o della directory di una lingua) sotto locales_dir
+            
+        Returns:
+            True se le traduzioni sono cambiate
+        """
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(self.locales_dir))
+        parts = relative.split(os.sep)
+        if relative.startswith('..') or not parts or not parts[0]:
+            return False
+        language = parts[0]
+        language_dir = os.path.join(self.locales_dir, language)
+        
+        with self._lock:
+            changed = False
+            if os.path.isdir(language_dir) and language not in self.supported_languages:
+                self.supported_languages.append(language)
+                self.supported_languages.sort()
+                changed = True
+            
+            translations = self.translations.get(language)
+            filename = '/'.join(parts[1:])
+            if translations is not None and filename:
+                try:
+                    changed = self._patch_language(language, translations, parts[1:]) or changed
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"Errore nel ricaricamento di {relative}: {e}")
+                    return False
+                # Firma aggiornata: _ensure_loaded non rilegge l'intera lingua
+                self._signatures[language] = self._language_signature(language)
+        
+        if changed or filename:
+            for callback in list(self._change_listeners):
+                callback(language, filename)
+        return changed
+    
+    def _patch_language(self, language: str, translations: Dict[str, Any], parts: list) -> bool:
+        """Applica a una lingua in memoria il contenuto di un suo file (con il lock acquisito)"""
+        language_dir = os.path.join(self.locales_dir, language)
+        descriptions_dir = os.path.join(language_dir, DESCRIPTIONS_DIR)
+        
+        if parts == ["main.json"]:
+            main = self._read_json(os.path.join(language_dir, "main.json"))
+            for key in [key for key in translations if key not in ('questions', 'question_descriptions')]:
+                del translations[key]
+            translations.update({key: value for key, value in main.items()
+                                 if key not in ('questions', 'question_descriptions')})
+        elif parts == ["questions.json"]:
+            questions_file = os.path.join(language_dir, "questions.json")
+            if os.path.exists(questions_file):
+                translations['questions'] = self._read_json(questions_file)
+            else:
+                translations.pop('questions', None)
+        elif parts == ["question_descriptions.json"]:
+            if os.path.isdir(descriptions_dir):
+                # La directory divisa ha la precedenza sul file unico
+                return False
+            descriptions_file = os.path.join(language_dir, "question_descriptions.json")
+            translations['question_descriptions'] = (self._read_json(descriptions_file)
+                                                     if os.path.exists(descriptions_file) else {})
+            self.revision += 1
+            return True
+        elif parts[0] == DESCRIPTIONS_DIR:
+            descriptions = translations.get('question_descriptions')
+            if len(parts) == 1 or not isinstance(descriptions, LazyCategoryDescriptions):
+                # Directory creata o rimossa: si cambia struttura, si rilegge la lingua
+                translations['question_descriptions'] = (self._read_language(language) or {}).get('question_descriptions', {})
+            elif parts[1].endswith('.json'):
+                category = parts[1][:-5]
+                # La categoria verrà riletta al prossimo accesso
+                dict.pop(descriptions, category, None)
+                if os.path.exists(os.path.join(descriptions_dir, parts[1])):
+                    descriptions.available.add(category)
+                else:
+                    descriptions.available.discard(category)
+            else:
+                return False
+            self.revision += 1
+            return True
+        else:
+            return False
+        
+        # Testi dell'interfaccia cambiati: si ricalcolano catalogo piatto e cataloghi derivati
+        self._flat_translations[language] = flatten_translations(translations)
+        if language == self.default_language:
+            self._catalogs = {}
+        else:
+            self._catalogs.pop(language, None)
+        return True
+    
+    def get_loaded_languages(self) -> list:
+        """Ottieni la lista delle lingue già caricate in memoria"""
+        with self._lock:
+            return list(self.translations.keys())
+    
     def get_supported_languages(self) -> list:
         """Ottieni la lista delle lingue supportate"""
         return self.supported_languages.copy()
@@ -264,6 +782,16 @@ def main():
         for key in test_keys:
             text = i18n.get_text(key)
             print(f"{key}: {text}")
+        print()
+        
+        # Test cache LRU: più lingue della capacità, la lingua corrente resta tradotta
+        print("=== TEST CACHE LINGUE ===")
+        small = I18nManager(i18n.locales_dir, cache_size=2)
+        for language in small.get_supported_languages():
+            loaded = small.set_language(language)
+            title = small.get_text('app.title')
+            status = "OK" if loaded and language in small.translations and title != 'app.title' else "ERRORE"
+            print(f"  {language}: {title} [{status}]")
         
     except Exception as e:
         print(f"Errore: {e}")
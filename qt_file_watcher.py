@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Qt File Watcher - Notifiche Qt per il ricaricamento a caldo di domande e traduzioni
+Usa QFileSystemWatcher (inotify) e, se non disponibile, un controllo periodico
+"""
+
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from file_watcher import SourceWatcher, DEFAULT_POLL_INTERVAL
+
+# Attesa dopo l'ultimo evento prima di controllare i file: un salvataggio
+# (file temporaneo + rename) produce più eventi ravvicinati
+RELOAD_DEBOUNCE_MS = 300
+
+
+class QtSourceWatcher(QObject):
+    """
+    Osserva domande e traduzioni e ricarica solo i file cambiati
+
+    Tutto avviene nel thread dell'interfaccia, quindi gli ascoltatori possono
+    aggiornare direttamente i widget.
+    """
+
+    # Nome del file della banca ricaricato
+    questions_changed = pyqtSignal(str)
+    # (lingua, percorso relativo del file di traduzione)
+    translations_changed = pyqtSignal(str, str)
+
+    def __init__(self, questions_loader=None, i18n_manager=None, parent=None,
+                 interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            questions_loader: Caricatore delle domande (opzionale)
+            i18n_manager: Gestore delle traduzioni (opzionale)
+            parent: QObject proprietario
+            interval: Intervallo del controllo periodico di riserva (secondi)
+        """
+        super().__init__(parent)
+        self.questions_loader = questions_loader
+        self.i18n_manager = i18n_manager
+        self.source_watcher = SourceWatcher(questions_loader, i18n_manager, interval)
+        # Gli ascoltatori registrati, tenuti per poterli rimuovere in stop():
+        # ogni accesso a segnale.emit crea un nuovo oggetto metodo
+        self._questions_listener = self._on_questions_changed
+        self._translations_listener = self._on_translations_changed
+        if questions_loader is not None:
+            questions_loader.add_change_listener(self._questions_listener)
+        if i18n_manager is not None:
+            i18n_manager.add_change_listener(self._translations_listener)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setSingleShot(True)
+        self.poll_timer.setInterval(RELOAD_DEBOUNCE_MS)
+        self.poll_timer.timeout.connect(self.poll)
+
+        self.fs_watcher = QFileSystemWatcher(self)
+        self.fs_watcher.directoryChanged.connect(self.schedule_poll)
+        self.fs_watcher.fileChanged.connect(self.schedule_poll)
+        if not self._watch_paths():
+            # Nessuna notifica dal sistema: controllo periodico
+            self.poll_timer.setSingleShot(False)
+            self.poll_timer.setInterval(int(interval * 1000))
+            self.poll_timer.start()
+
+    def _on_questions_changed(self, filename: str):
+        self.questions_changed.emit(filename)
+
+    def _on_translations_changed(self, language: str, filename: str):
+        self.translations_changed.emit(language, filename)
+
+    def _watch_paths(self) -> bool:
+        """
+        Aggiunge al QFileSystemWatcher directory e file non ancora osservati
+
+        I file sostituiti con un rename smettono di essere osservati, quindi
+        l'elenco viene riallineato dopo ogni controllo.
+
+        Returns:
+            True se il sistema di notifica osserva almeno un percorso
+        """
+        watched = set(self.fs_watcher.directories()) | set(self.fs_watcher.files())
+        wanted = self.source_watcher.directories() + self.source_watcher.files()
+        missing = [path for path in wanted if path not in watched]
+        if missing:
+            self.fs_watcher.addPaths(missing)
+        return bool(self.fs_watcher.directories() or self.fs_watcher.files())
+
+    def schedule_poll(self, path: str = ''):
+        """Controlla i file dopo una breve pausa dall'ultimo evento"""
+        if self.poll_timer.isSingleShot():
+            self.poll_timer.start()
+
+    def poll(self):
+        """Ricarica i file cambiati; i segnali partono dagli ascoltatori di caricatore e traduzioni"""
+        self.source_watcher.poll()
+        if self.poll_timer.isSingleShot():
+            self._watch_paths()
+
+    def stop(self):
+        """Smette di osservare i file, rimuove gli ascoltatori e aggiorna la cache della banca"""
+        self.poll_timer.stop()
+        paths = self.fs_watcher.directories() + self.fs_watcher.files()
+        if paths:
+            self.fs_watcher.removePaths(paths)
+        if self.questions_loader is not None:
+            self.questions_loader.remove_change_listener(self._questions_listener)
+        if self.i18n_manager is not None:
+            self.i18n_manager.remove_change_listener(self._translations_listener)
+        if self.questions_loader is not None:
+            self.questions_loader.flush_cache()
@@ -5,35 +5,138 @@ Editor per la modifica delle domande con supporto i18n completo
 """
 
 import sys
+import copy
 import json
 import os
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QGridLayout, QLabel, QLineEdit, 
                              QTextEdit, QComboBox, QPushButton, QTableWidget, 
-                             QTableWidgetItem, QTabWidget, QGroupBox, QSplitter,
+                             QTableWidgetItem, QTableView, QTabWidget, QGroupBox, QSplitter,
                              QMessageBox, QFileDialog, QHeaderView, QCheckBox,
-                             QSpinBox, QFrame, QScrollArea)
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+                             QSpinBox, QFrame, QScrollArea, QProgressBar)
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QObject, QThread
 from PyQt6.QtGui import QFont, QIcon, QPalette, QColor
 
 from i18n_manager import I18nManager
-from questions_loader import QuestionsLoader
+from questions_loader import QuestionsLoader, category_key_for
+from question_table_model import QuestionsTableModel, QuestionsFilterProxy, QuestionFilterIndex
+from qt_file_watcher import QtSourceWatcher
+from editor_persistence import (write_jobs, apply_change, json_text, text_digest, TranslationStore,
+                                ChangeJournal, DEFAULT_JOURNAL_PATH)
+
+# Pausa dopo l'ultimo tasto prima di applicare la ricerca (ms)
+FILTER_DEBOUNCE_MS = 150
+
+
+def discard_committed(journal, jobs, errors, committed):
+    """Toglie dal giornale le modifiche dei file scritti senza errori"""
+    failed = {path for path, _ in errors}
+    keys = set()
+    for path, _ in jobs:
+        if path not in failed:
+            keys.update(committed.get(path, ()))
+    journal.discard(keys)
+
+
+class SaveWorker(QObject):
+    """Scrive i file modificati in un thread separato da quello grafico"""
+    
+    # (file scritti, totale, percorso)
+    progress = pyqtSignal(int, int, str)
+    # (percorso, messaggio di errore)
+    failed = pyqtSignal(str, str)
+    # Numero di file non scritti
+    finished = pyqtSignal(int)
+    
+    def __init__(self, jobs, journal=None, records=None, committed=None):
+        """
+        Args:
+            jobs: File da scrivere, coppie (percorso, dati)
+            journal: Giornale delle modifiche (opzionale)
+            records: Modifiche da aggiungere al giornale
+            committed: Percorso -> chiavi del giornale (vedi journal_key) delle
+                       modifiche da togliere dal giornale se il file viene scritto
+        """
+        super().__init__()
+        self.jobs = jobs
+        self.journal = journal
+        self.records = records or []
+        self.committed = committed or {}
+        
+    def run(self):
+        """Scrive giornale e file, segnalando avanzamento ed errori"""
+        errors = []
+        if self.records:
+            try:
+                self.journal.append(self.records)
+            except OSError as e:
+                errors.append((self.journal.path, str(e)))
+        file_errors = write_jobs(self.jobs, self.progress.emit)
+        errors.extend(file_errors)
+        if self.journal is not None:
+            try:
+                discard_committed(self.journal, self.jobs, file_errors, self.committed)
+            except OSError as e:
+                errors.append((self.journal.path, str(e)))
+        for path, message in errors:
+            self.failed.emit(path, message)
+        self.finished.emit(len(errors))
 
 
 class QuestionEditor(QMainWindow):
-    def __init__(self):
+    def __init__(self, journal_path=None):
+        """
+        Args:
+            journal_path: File del giornale delle modifiche (opzionale): se
+                          indicato i salvataggi aggiungono solo le modifiche al
+                          giornale e i file vengono riscritti alla compattazione
+        """
         super().__init__()
         self.i18n = I18nManager()
         self.questions_loader = QuestionsLoader(i18n_manager=self.i18n)
         self.current_question = None
         self.current_category = None
+        # ID stabile della domanda nell'editor (None per una domanda nuova)
+        self.current_question_id = None
         self.questions_data = {}
         self.modified = False
+        # Categorie modificate dall'ultimo salvataggio; le traduzioni tengono
+        # le categorie modificate per ogni lingua
+        self.dirty_categories = set()
+        self.translations = TranslationStore()
+        # Categoria -> impronta del file su cui si basano le modifiche del
+        # giornale (quello letto dal disco o l'ultimo in scrittura)
+        self.category_bases = {}
+        
+        # Giornale opzionale e modifiche non ancora registrate
+        self.journal = ChangeJournal(journal_path) if journal_path else None
+        self.pending_changes = []
+        
+        # Salvataggio in background: thread, worker e file in scrittura
+        self._save_thread = None
+        self._save_worker = None
+        self._save_categories = {}
+        self._save_translations = {}
+        self._save_bases = {}
+        self._save_records = []
+        self._save_errors = []
+        self._save_interactive = False
+        self._save_requested = False
+        self._restoring_selection = False
+        # Percorso -> (mtime, dimensione) dei file scritti dall'editor: il
+        # ricaricamento a caldo ignora i propri salvataggi
+        self._own_writes = {}
         
         self.init_ui()
         self.load_questions_data()
         self.refresh_ui_texts()
+        self.replay_journal()
+        
+        # Ricaricamento dei file modificati fuori dall'editor
+        self.source_watcher = QtSourceWatcher(self.questions_loader, self.i18n, self)
+        self.source_watcher.questions_changed.connect(self.on_questions_file_changed)
+        self.source_watcher.translations_changed.connect(self.on_translations_file_changed)
         
         # Auto-save timer
         self.auto_save_timer = QTimer()
@@ -65,8 +168,12 @@ class QuestionEditor(QMainWindow):
         # Imposta proporzioni
         splitter.setSizes([400, 1000])
         
-        # Barra di stato
+        # Barra di stato, con l'avanzamento del salvataggio
         self.statusBar().showMessage(self.i18n.get_text("editor.messages.ready"))
+        self.save_progress = QProgressBar()
+        self.save_progress.setMaximumWidth(200)
+        self.save_progress.setVisible(False)
+        self.statusBar().addPermanentWidget(self.save_progress)
         
         # Menu
         self.create_menu_bar()
@@ -109,20 +216,47 @@ class QuestionEditor(QMainWindow):
         self.language_filter = QComboBox()
         self.language_filter.addItem("All")
         for lang in self.i18n.get_supported_languages():
-            self.language_filter.addItem(lang.upper())
+            self.language_filter.addItem(lang.upper(), lang)
         self.language_filter.currentTextChanged.connect(self.filter_questions)
         language_layout.addWidget(self.language_filter)
         filters_layout.addLayout(language_layout)
         
+        # Ricerca su comando e descrizione, applicata a fine digitazione
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(QLabel("Search:"))
+        self.search_edit = QLineEdit()
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.textChanged.connect(self.schedule_filter)
+        search_layout.addWidget(self.search_edit)
+        filters_layout.addLayout(search_layout)
+        
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.filter_questions)
+        
         layout.addWidget(filters_group)
         
-        # Tabella domande
-        self.questions_table = QTableWidget()
-        self.questions_table.setColumnCount(4)
-        self.questions_table.setHorizontalHeaderLabels(["Command", "Category", "Difficulty", "Language"])
+        # Tabella domande: vista su un modello che legge direttamente i dati
+        # delle categorie, così vengono disegnate solo le righe visibili;
+        # i filtri passano per un proxy con le righe ammesse già calcolate
+        self.questions_model = QuestionsTableModel(self)
+        self.filter_index = QuestionFilterIndex(self.questions_model)
+        self.questions_proxy = QuestionsFilterProxy(self)
+        self.questions_proxy.setSourceModel(self.questions_model)
+        for signal in (self.questions_model.modelReset, self.questions_model.rowsInserted,
+                       self.questions_model.rowsRemoved, self.questions_model.dataChanged):
+            signal.connect(self.on_questions_changed)
+        self.questions_table = QTableView()
+        self.questions_table.setModel(self.questions_proxy)
         self.questions_table.horizontalHeader().setStretchLastSection(True)
-        self.questions_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.questions_table.itemSelectionChanged.connect(self.on_question_selected)
+        self.questions_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        # Righe ad altezza fissa: la vista non deve misurare ogni riga
+        self.questions_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.questions_table.verticalHeader().setDefaultSectionSize(24)
+        self.questions_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.questions_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.questions_table.selectionModel().currentRowChanged.connect(self.on_question_selected)
         layout.addWidget(self.questions_table)
         
         # Pulsanti azione
@@ -338,13 +472,16 @@ class QuestionEditor(QMainWindow):
     def load_questions_data(self):
         """Carica tutti i dati delle domande"""
         self.questions_data = {}
+        self.category_bases = {}
         
         # Carica tutte le categorie
         for category_file in Path("questions").glob("*.json"):
             with open(category_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                text = f.read()
+                data = json.loads(text)
                 category_name = category_file.stem
                 self.questions_data[category_name] = data
+                self.category_bases[category_name] = text_digest(text)
                 
                 # Aggiungi categoria al combo
                 if category_name not in [self.category_filter.itemText(i) for i in range(self.category_filter.count())]:
@@ -359,50 +496,72 @@ class QuestionEditor(QMainWindow):
         self.populate_questions_table()
         
     def populate_questions_table(self):
-        """Popola la tabella delle domande"""
-        questions = []
-        
-        for category_name, category_data in self.questions_data.items():
-            for question in category_data.get('questions', []):
-                questions.append({
-                    'command': question.get('command', ''),
-                    'category': category_name,
-                    'difficulty': category_data.get('difficulty', 'beginner'),
-                    'question_data': question,
-                    'category_data': category_data
-                })
-        
-        self.questions_table.setRowCount(len(questions))
-        
-        for row, question in enumerate(questions):
-            self.questions_table.setItem(row, 0, QTableWidgetItem(question['command']))
-            self.questions_table.setItem(row, 1, QTableWidgetItem(question['category']))
-            self.questions_table.setItem(row, 2, QTableWidgetItem(question['difficulty']))
-            self.questions_table.setItem(row, 3, QTableWidgetItem("EN"))
-            
-        self.questions_table.resizeColumnsToContents()
+        """Ricarica la tabella delle domande da questions_data"""
+        self.questions_model.reset(self.questions_data)
+        
+    def schedule_filter(self):
+        """Riapplica i filtri dopo una breve pausa (la digitazione non rifiltra a ogni tasto)"""
+        self.filter_timer.start()
+        
+    def on_questions_changed(self):
+        """Le righe del modello sono cambiate: con un filtro attivo lo si riapplica"""
+        # filter_index segue da solo i segnali del modello (riga per riga)
+        if self.questions_proxy.is_filtered():
+            self.schedule_filter()
+        
+    def _has_translation(self, language):
+        """Funzione (categoria, domanda) -> True se la domanda ha un testo nella lingua"""
+        if language == 'en':
+            return lambda category, question: bool(question.get('description'))
+        return lambda category, question: bool(self.translations.get(language, self.translation_key(category),
+                                                                      question.get('command', '')))
         
     def filter_questions(self):
         """Filtra le domande in base ai criteri selezionati"""
-        # Implementazione del filtro
-        pass
+        self.filter_timer.stop()
+        
+        # Categorie ammesse da filtro di categoria e difficoltà (None: tutte)
+        categories = None
+        if self.category_filter.currentIndex() > 0:
+            categories = [self.category_filter.currentText()]
+        if self.difficulty_filter.currentIndex() > 0:
+            difficulty = self.difficulty_filter.currentText()
+            categories = [name for name in (categories or self.questions_data)
+                          if self.questions_data.get(name, {}).get('difficulty', 'beginner') == difficulty]
+        language = self.language_filter.currentData() if self.language_filter.currentIndex() > 0 else None
+        query = self.search_edit.text().strip()
+        
+        if categories is None and language is None and not query:
+            rows = None
+        else:
+            rows = self.filter_index.select(categories, query, language,
+                                            self._has_translation(language) if language else None)
+        
+        # Il filtro azzera la vista: si riseleziona la domanda corrente se è ancora visibile
+        self.questions_proxy.set_filter_rows(rows)
+        source_row = self.questions_model.row_of(self.current_question_id)
+        if source_row >= 0:
+            proxy_index = self.questions_proxy.mapFromSource(self.questions_model.index(source_row, 0))
+            if proxy_index.isValid():
+                # Non ricarica la domanda nell'editor (perderebbe le modifiche in corso)
+                self._restoring_selection = True
+                self.questions_table.setCurrentIndex(proxy_index)
+                self._restoring_selection = False
+        
+        shown = self.questions_proxy.rowCount()
+        self.statusBar().showMessage(f"{shown}/{self.questions_model.rowCount()} questions")
         
     def on_question_selected(self):
         """Gestisce la selezione di una domanda"""
-        current_row = self.questions_table.currentRow()
-        if current_row >= 0:
-            command = self.questions_table.item(current_row, 0).text()
-            category = self.questions_table.item(current_row, 1).text()
-            
-            # Trova la domanda nei dati
-            for cat_name, cat_data in self.questions_data.items():
-                if cat_name == category:
-                    for question in cat_data.get('questions', []):
-                        if question.get('command') == command:
-                            self.load_question_into_editor(question, cat_name, cat_data)
-                            break
-                    break
-                    
+        if self._restoring_selection:
+            return
+        row = self.questions_proxy.source_row(self.questions_table.currentIndex().row())
+        question_id = self.questions_model.id_at(row)
+        record = self.questions_model.record(question_id)
+        if record is not None:
+            category, question = record
+            self.load_question_into_editor(question, category, self.questions_data[category])
+            self.current_question_id = question_id
             self.delete_question_btn.setEnabled(True)
         else:
             self.clear_editor()
@@ -425,11 +584,9 @@ class QuestionEditor(QMainWindow):
             if lang != 'en':  # Inglese è già nel campo description
                 desc_key = f"{lang}_description"
                 if desc_key in self.translation_edits:
-                    translated_desc = self.i18n.get_question_description(question.get('command', ''), lang)
-                    if translated_desc != question.get('command', ''):
-                        self.translation_edits[desc_key].setPlainText(translated_desc)
-                    else:
-                        self.translation_edits[desc_key].setPlainText('')
+                    translated_desc = self.translations.get(lang, self.translation_key(category),
+                                                            question.get('command', ''))
+                    self.translation_edits[desc_key].setPlainText(translated_desc or '')
         
         # Opzioni di risposta
         self.load_options_into_table(question.get('options', []))
@@ -458,6 +615,7 @@ class QuestionEditor(QMainWindow):
         """Pulisce l'editor"""
         self.current_question = None
         self.current_category = None
+        self.current_question_id = None
         
         self.command_edit.clear()
         self.description_edit.clear()
@@ -500,12 +658,19 @@ class QuestionEditor(QMainWindow):
         
         if reply == QMessageBox.StandardButton.Yes:
             # Rimuovi la domanda dai dati
-            category_data = self.questions_data[self.current_category]
-            if self.current_question in category_data.get('questions', []):
-                category_data['questions'].remove(self.current_question)
-                self.modified = True
-                self.populate_questions_table()
+            category, question = self.current_category, self.current_question
+            question_id = self.current_question_id
+            index = self._question_index(category, question)
+            if index is not None:
+                del self.questions_data[category]['questions'][index]
+                self.dirty_categories.add(category)
+                self.record_change({'op': 'delete_question', 'category': category, 'index': index,
+                                    'command': question.get('command', '')})
+                self._drop_orphan_translations(category, question.get('command', ''))
+                # Rimuovendo la riga la selezione passa alla domanda successiva,
+                # che viene caricata nell'editor
                 self.clear_editor()
+                self.questions_model.remove_question(question_id)
                 
     def add_option(self):
         """Aggiunge una nuova opzione di risposta"""
@@ -532,6 +697,7 @@ class QuestionEditor(QMainWindow):
             return
             
         # Aggiorna i dati della domanda
+        old_command = self.current_question.get('command', '')
         self.current_question['command'] = self.command_edit.text()
         self.current_question['description'] = self.description_edit.toPlainText()
         self.current_question['explanation'] = self.explanation_edit.toPlainText()
@@ -551,65 +717,381 @@ class QuestionEditor(QMainWindow):
         self.current_question['options'] = options
         
         # Se è una nuova domanda, aggiungila alla categoria
-        if self.current_question not in self.questions_data[self.current_category]['questions']:
-            self.questions_data[self.current_category]['questions'].append(self.current_question)
+        questions = self.questions_data[self.current_category]['questions']
+        index = self._question_index(self.current_category, self.current_question)
+        if index is None:
+            index = len(questions)
+            questions.append(self.current_question)
+            self.current_question_id = self.questions_model.append_question(self.current_category,
+                                                                            self.current_question)
+        else:
+            self.questions_model.question_changed(self.current_question_id)
             
         # Aggiorna la difficoltà della categoria se necessario
         new_difficulty = self.difficulty_combo.currentText()
         if self.questions_data[self.current_category]['difficulty'] != new_difficulty:
             self.questions_data[self.current_category]['difficulty'] = new_difficulty
+            self.questions_model.category_changed()
+        
+        # La categoria va riscritta al prossimo salvataggio
+        self.dirty_categories.add(self.current_category)
+        self.record_change({'op': 'put_question', 'category': self.current_category, 'index': index,
+                            'question': copy.deepcopy(self.current_question),
+                            'difficulty': new_difficulty})
+        
+        # Traduzioni: solo le lingue il cui testo è cambiato diventano da salvare
+        command = self.current_question['command']
+        for lang in self.i18n.get_supported_languages():
+            desc_key = f"{lang}_description"
+            if lang == 'en' or desc_key not in self.translation_edits:
+                continue
+            text = self.translation_edits[desc_key].toPlainText().strip()
+            self.set_translation(lang, self.current_category, command, text)
+        if old_command and old_command != command:
+            self._drop_orphan_translations(self.current_category, old_command)
             
-        self.populate_questions_table()
         self.modified = False
         self.statusBar().showMessage("Question saved")
         
-    def save_all_changes(self):
-        """Salva tutte le modifiche nei file"""
+    def _question_index(self, category, question):
+        """Posizione di una domanda nella sua categoria (per identità), o None"""
+        for index, candidate in enumerate(self.questions_data[category].get('questions', [])):
+            if candidate is question:
+                return index
+        return None
+        
+    def record_change(self, record):
+        """
+        Registra una modifica per il giornale (se attivo)
+        
+        Le modifiche alle domande portano l'impronta del file su cui si
+        basano, così non vengono riapplicate a un file già riscritto.
+        """
+        if self.journal is not None:
+            if record['op'] != 'set_translation':
+                record['base'] = self.category_bases.get(record['category'])
+            self.pending_changes.append(record)
+        
+    def translation_key(self, category):
+        """Chiave delle descrizioni tradotte di una categoria (campo "key" o nome del file)"""
+        data = self.questions_data.get(category, {})
+        return category_key_for(data, category)
+        
+    def set_translation(self, language, category, command, text):
+        """Aggiorna una traduzione, segnando la lingua da salvare se cambia"""
+        category = self.translation_key(category)
+        if self.translations.set(language, category, command, text):
+            self.filter_index.invalidate_languages()
+            self.record_change({'op': 'set_translation', 'language': language, 'category': category,
+                                'command': command, 'text': text})
+        
+    def _drop_orphan_translations(self, category, command):
+        """Rimuove le traduzioni di un comando non più presente nella categoria"""
+        if not command:
+            return
+        for question in self.questions_data[category].get('questions', []):
+            if question.get('command') == command:
+                return
+        for lang in self.i18n.get_supported_languages():
+            if lang != 'en':
+                self.set_translation(lang, category, command, '')
+        
+    def replay_journal(self):
+        """Riapplica le modifiche del giornale non ancora scritte nei file"""
+        if self.journal is None:
+            return
         try:
-            # Salva i file delle domande
-            for category_name, category_data in self.questions_data.items():
-                file_path = Path("questions") / f"{category_name}.json"
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(category_data, f, indent=2, ensure_ascii=False)
-            
-            # Salva le traduzioni
-            self.save_translations()
-            
+            records = self.journal.read()
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to read change journal: {str(e)}")
+            return
+        applied = sum(apply_change(record, self.questions_data, self.translations,
+                                   self.dirty_categories, self.category_bases)
+                      for record in records)
+        if applied:
+            self.populate_questions_table()
+        skipped = len(records) - applied
+        if skipped:
+            self.statusBar().showMessage(f"Recovered {applied} changes from the journal, "
+                                         f"skipped {skipped} already saved or out of date")
+        elif records:
+            self.statusBar().showMessage(f"Recovered {applied} changes from the journal")
+        
+    def has_unsaved_changes(self):
+        """True se ci sono modifiche non ancora salvate né registrate nel giornale"""
+        if self.modified or self.pending_changes:
+            return True
+        if self.journal is None:
+            return bool(self.dirty_categories) or self.translations.is_dirty()
+        return False
+        
+    def has_dirty_files(self):
+        """True se qualche file su disco non contiene ancora le modifiche"""
+        return bool(self.dirty_categories) or self.translations.is_dirty()
+        
+    def save_all_changes(self, interactive=True, compact=False):
+        """
+        Salva le modifiche in un thread separato
+        
+        Senza giornale vengono riscritti solo i file delle categorie e delle
+        lingue modificate, ognuno in modo atomico. Con il giornale si
+        aggiungono solo le nuove modifiche, e i file vengono riscritti
+        quando il giornale supera la soglia di compattazione. Avanzamento
+        ed errori arrivano tramite i segnali del SaveWorker.
+        
+        Args:
+            interactive: Mostra un messaggio al termine (False per l'auto-save)
+            compact: Riscrive comunque i file modificati e svuota il giornale
+        """
+        if self._save_thread is not None:
+            # Un salvataggio è già in corso: si ripete appena termina
+            self._save_requested = True
+            return
+        
+        if self.journal is not None and not compact and not self.journal.needs_compaction():
+            jobs = []
+            records = self.pending_changes
+            committed = {}
+        else:
+            jobs = self.build_save_jobs()
+            # Anche alla compattazione le modifiche vanno prima nel giornale:
+            # se un file non viene scritto restano recuperabili
+            records = self.pending_changes if self.journal is not None else []
+            committed = self.committed_journal_keys()
+        
+        if not jobs and not records:
             self.modified = False
-            self.statusBar().showMessage("All changes saved")
-            QMessageBox.information(self, "Success", "All changes have been saved successfully!")
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save changes: {str(e)}")
-            
-    def save_translations(self):
-        """Salva le traduzioni nei file appropriati"""
-        for lang in self.i18n.get_supported_languages():
-            if lang == 'en':
+            self.statusBar().showMessage("No changes to save")
+            return
+        
+        self.pending_changes = []
+        self._save_records = records
+        self._save_errors = []
+        self._save_interactive = interactive
+        self.modified = False
+        
+        self.save_progress.setRange(0, max(1, len(jobs)))
+        self.save_progress.setValue(0)
+        self.save_progress.setVisible(True)
+        self.save_all_btn.setEnabled(False)
+        self.statusBar().showMessage("Saving...")
+        
+        thread = QThread(self)
+        worker = SaveWorker(jobs, self.journal, records, committed)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self.on_save_progress)
+        worker.failed.connect(self.on_save_failed)
+        worker.finished.connect(self.on_save_finished)
+        # Connessione diretta: il thread termina anche se quello grafico è in attesa
+        worker.finished.connect(thread.quit, Qt.ConnectionType.DirectConnection)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        self._save_thread = thread
+        self._save_worker = worker
+        thread.start()
+        
+    def build_save_jobs(self):
+        """
+        Prepara i file da scrivere per le categorie e le lingue modificate
+        
+        I dati vengono copiati, così il thread di salvataggio non legge
+        strutture che l'editor sta modificando. Le modifiche vengono azzerate
+        e ripristinate da on_save_failed per i file non scritti.
+        
+        Returns:
+            Lista di coppie (percorso, dati)
+        """
+        jobs = []
+        self._save_categories = {}
+        self._save_bases = {}
+        for category_name in sorted(self.dirty_categories):
+            if category_name not in self.questions_data:
                 continue
-                
-            translations = {}
-            
-            # Raccoglie tutte le traduzioni delle descrizioni
-            for category_name, category_data in self.questions_data.items():
-                for question in category_data.get('questions', []):
-                    command = question.get('command', '')
-                    if command:
-                        # Cerca la traduzione nell'editor
-                        desc_key = f"{lang}_description"
-                        if desc_key in self.translation_edits:
-                            translated_desc = self.translation_edits[desc_key].toPlainText()
-                            if translated_desc.strip():
-                                translations[command] = translated_desc
-                                
-            # Salva nel file delle traduzioni
-            if translations:
-                trans_file = Path("locales") / lang / "question_descriptions.json"
-                trans_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(trans_file, 'w', encoding='utf-8') as f:
-                    json.dump(translations, f, indent=2, ensure_ascii=False)
+            file_path = str(Path("questions") / f"{category_name}.json")
+            data = copy.deepcopy(self.questions_data[category_name])
+            jobs.append((file_path, data))
+            self._save_categories[file_path] = category_name
+            # Le modifiche successive si basano sul file in scrittura
+            self._save_bases[category_name] = self.category_bases.get(category_name)
+            self.category_bases[category_name] = text_digest(json_text(data))
+        self.dirty_categories.clear()
+        
+        translation_jobs, self._save_translations = self.translations.take_jobs()
+        jobs.extend(translation_jobs)
+        return jobs
+        
+    def committed_journal_keys(self):
+        """Percorso in scrittura -> chiavi del giornale delle modifiche che contiene"""
+        committed = {path: {('questions', category)} for path, category in self._save_categories.items()}
+        for path, (language, categories) in self._save_translations.items():
+            committed[path] = {('translations', language, category) for category in categories}
+        return committed
+        
+    def on_save_progress(self, done, total, path):
+        """Aggiorna l'avanzamento del salvataggio"""
+        self._remember_write(path)
+        self.save_progress.setValue(done)
+        self.statusBar().showMessage(f"Saving {done}/{total}: {os.path.basename(path)}")
+        
+    def on_save_failed(self, path, message):
+        """Registra un file non salvato: le sue modifiche restano da salvare"""
+        self._save_errors.append(f"{path}: {message}")
+        category_name = self._save_categories.get(path)
+        if category_name is not None:
+            self.dirty_categories.add(category_name)
+            # Il file su disco è ancora il precedente: le modifiche fatte nel
+            # frattempo si basano di nuovo su quello
+            written_base = self.category_bases.get(category_name)
+            base = self._save_bases.get(category_name)
+            self.category_bases[category_name] = base
+            for record in self.pending_changes:
+                if record.get('category') == category_name and record.get('base') == written_base:
+                    record['base'] = base
+        if path in self._save_translations:
+            language, categories = self._save_translations[path]
+            self.translations.mark_dirty(language, categories)
+        if self.journal is not None and path == self.journal.path and self._save_records:
+            # Modifiche non registrate nel giornale: si riprova al prossimo salvataggio
+            self.pending_changes = self._save_records + self.pending_changes
+            self._save_records = []
+        
+    def on_save_finished(self, error_count):
+        """Conclude il salvataggio in background"""
+        self._save_thread = None
+        self._save_worker = None
+        self.save_progress.setVisible(False)
+        self.save_all_btn.setEnabled(True)
+        
+        if error_count:
+            self.statusBar().showMessage("Save failed")
+            QMessageBox.critical(self, "Error", "Failed to save changes:\n" + "\n".join(self._save_errors))
+        else:
+            self.statusBar().showMessage("All changes saved")
+            if self._save_interactive:
+                QMessageBox.information(self, "Success", "All changes have been saved successfully!")
+        
+        if self._save_requested:
+            self._save_requested = False
+            self.save_all_changes(interactive=False)
+        
+    def wait_for_save(self):
+        """Attende la fine del salvataggio in corso, se presente"""
+        if self._save_thread is not None:
+            self._save_thread.wait()
+            # Consegna i segnali in coda (errori e fine del salvataggio)
+            QApplication.processEvents()
+        
+    def save_all_changes_now(self):
+        """Riscrive in modo sincrono i file modificati e li toglie dal giornale (usato alla chiusura)"""
+        self.wait_for_save()
+        jobs = self.build_save_jobs()
+        # Le modifiche in sospeso restano tali se il giornale non si può scrivere
+        self._save_records = []
+        errors = []
+        if self.journal is not None and self.pending_changes:
+            try:
+                self.journal.append(self.pending_changes)
+                self.pending_changes = []
+            except OSError as e:
+                errors.append((self.journal.path, str(e)))
+        file_errors = write_jobs(jobs, lambda done, total, path: self._remember_write(path))
+        errors.extend(file_errors)
+        if self.journal is not None:
+            try:
+                discard_committed(self.journal, jobs, file_errors, self.committed_journal_keys())
+            except OSError as e:
+                errors.append((self.journal.path, str(e)))
+        if errors:
+            for path, message in errors:
+                self.on_save_failed(path, message)
+            QMessageBox.critical(self, "Error", "Failed to save changes:\n" +
+                                 "\n".join(f"{path}: {message}" for path, message in errors))
+            return False
+        self.pending_changes = []
+        self.modified = False
+        return True
                     
+    def _remember_write(self, path):
+        """Registra lo stato di un file appena scritto dall'editor"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+        self._own_writes[os.path.abspath(path)] = (stat.st_mtime_ns, stat.st_size)
+        
+    def _is_own_write(self, path):
+        """True se il file è ancora quello scritto dall'ultimo salvataggio dell'editor"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return self._own_writes.get(os.path.abspath(path)) == (stat.st_mtime_ns, stat.st_size)
+        
+    def on_questions_file_changed(self, filename):
+        """
+        Ricarica una categoria modificata fuori dall'editor
+        
+        Una categoria con modifiche non salvate non viene toccata: al
+        prossimo salvataggio prevalgono le modifiche dell'editor.
+        """
+        path = os.path.join("questions", filename)
+        if self._is_own_write(path):
+            return
+        category_name = Path(filename).stem
+        saving = self._save_thread is not None and path in self._save_categories
+        if (category_name in self.dirty_categories or saving or
+                (self.modified and self.current_category == category_name)):
+            self.statusBar().showMessage(f"{filename} changed on disk, keeping unsaved changes")
+            return
+        
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                data = json.loads(text)
+            except (OSError, json.JSONDecodeError):
+                # File a metà scrittura: arriverà un'altra notifica
+                return
+            self.questions_data[category_name] = data
+            self.category_bases[category_name] = text_digest(text)
+            if self.category_filter.findText(category_name) < 0:
+                self.category_filter.addItem(category_name)
+                self.category_combo.addItem(category_name)
+        else:
+            self.questions_data.pop(category_name, None)
+            self.category_bases.pop(category_name, None)
+            # Il primo elemento del filtro è "All"
+            if self.category_filter.findText(category_name) > 0:
+                self.category_filter.removeItem(self.category_filter.findText(category_name))
+            if self.category_combo.findText(category_name) >= 0:
+                self.category_combo.removeItem(self.category_combo.findText(category_name))
+        
+        if self.current_category == category_name:
+            self.clear_editor()
+        # Le domande delle altre categorie mantengono il loro ID (e la selezione)
+        self.populate_questions_table()
+        self.filter_questions()
+        self.statusBar().showMessage(f"Reloaded {filename}")
+        
+    def on_translations_file_changed(self, language, filename):
+        """Aggiorna testi e traduzioni dopo una modifica esterna dei file di una lingua"""
+        if language == self.i18n.get_current_language():
+            self.refresh_ui_texts()
+        if self._is_own_write(os.path.join(self.translations.locales_dir, language, filename)):
+            return
+        saving = self._save_thread is not None and any(
+            owner_language == language for owner_language, _ in self._save_translations.values())
+        if self.translations.dirty.get(language) or saving:
+            self.statusBar().showMessage(f"{language}/{filename} changed on disk, keeping unsaved changes")
+            return
+        # Le descrizioni della lingua si rileggono dal disco alla prossima richiesta
+        self.translations.languages.pop(language, None)
+        self.filter_index.invalidate_languages()
+        if self.current_question is not None and not self.modified:
+            self.load_question_into_editor(self.current_question, self.current_category,
+                                           self.questions_data[self.current_category])
+        
     def revert_changes(self):
         """Ripristina le modifiche non salvate"""
         if self.current_question and self.current_category:
@@ -629,7 +1111,7 @@ class QuestionEditor(QMainWindow):
         self.setWindowTitle(self.i18n.get_text("editor.title"))
         
         # Aggiorna i testi del pannello domande
-        self.questions_table.setHorizontalHeaderLabels([
+        self.questions_model.set_headers([
             self.i18n.get_text("editor.questions_panel.table_headers.command"),
             self.i18n.get_text("editor.questions_panel.table_headers.category"),
             self.i18n.get_text("editor.questions_panel.table_headers.difficulty"),
@@ -656,8 +1138,11 @@ class QuestionEditor(QMainWindow):
         
     def auto_save(self):
         """Salvataggio automatico"""
-        if self.modified:
-            self.save_all_changes()
+        if self.has_unsaved_changes():
+            self.save_all_changes(interactive=False)
+        elif self.journal is not None and self.journal.needs_compaction() and self.has_dirty_files():
+            # Compattazione periodica del giornale
+            self.save_all_changes(interactive=False, compact=True)
             
     def show_about(self):
         """Mostra la finestra About"""
@@ -669,7 +1154,7 @@ class QuestionEditor(QMainWindow):
         
     def closeEvent(self, event):
         """Gestisce la chiusura dell'applicazione"""
-        if self.modified:
+        if self.has_unsaved_changes():
             reply = QMessageBox.question(self, "Unsaved Changes", 
                                        "You have unsaved changes. Do you want to save them?",
                                        QMessageBox.StandardButton.Yes | 
@@ -677,24 +1162,39 @@ class QuestionEditor(QMainWindow):
                                        QMessageBox.StandardButton.Cancel)
             
             if reply == QMessageBox.StandardButton.Yes:
-                self.save_all_changes()
-                event.accept()
+                if self.save_all_changes_now():
+                    event.accept()
+                else:
+                    event.ignore()
             elif reply == QMessageBox.StandardButton.No:
+                self.wait_for_save()
+                event.accept()
+            else:
+                event.ignore()
+        elif self.journal is not None and self.has_dirty_files():
+            # Le modifiche sono già nel giornale: si riportano nei file prima di uscire
+            if self.save_all_changes_now():
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.wait_for_save()
             event.accept()
+        if event.isAccepted():
+            self.source_watcher.stop()
 
 
 def main():
-    app = QApplication(sys.argv)
+    # --journal registra i salvataggi in un giornale delle modifiche
+    journal_path = DEFAULT_JOURNAL_PATH if '--journal' in sys.argv else None
+    argv = [arg for arg in sys.argv if arg != '--journal']
+    app = QApplication(argv)
     
     # Imposta lo stile dell'applicazione
     app.setStyle('Fusion')
     
     # Crea e mostra la finestra principale
-    window = QuestionEditor()
+    window = QuestionEditor(journal_path)
     window.show()
     
     sys.exit(app.exec())
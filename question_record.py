@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Question Record - Rappresentazione compatta di una domanda Vim
+Record con __slots__ e stringhe condivise, accessibile come un dizionario
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Nome della chiave del dizionario -> nome dello slot corrispondente
+_KEY_TO_SLOT = {
+    'command': 'command',
+    'description': 'description',
+    'category': 'subcategory',
+    'source_category': 'source_category',
+    'source_file': 'source_file',
+    'difficulty': 'difficulty',
+    'category_key': 'category_key',
+}
+
+_MISSING = object()
+
+
+class Question:
+    """
+    Domanda del quiz con campi fissi
+
+    Categoria, file sorgente, difficoltà e chiave di traduzione della
+    categoria sono stringhe internate, quindi
+    tutte le domande di un pacchetto condividono lo stesso oggetto invece di
+    duplicarlo. I campi non previsti del JSON finiscono in `extra`.
+    Il record supporta l'accesso in stile dizionario (`q['command']`,
+    `q.get('difficulty')`) per compatibilità con il codice esistente.
+    """
+
+    __slots__ = ('command', 'description', 'subcategory', 'source_category',
+                 'source_file', 'difficulty', 'extra', 'category_key')
+
+    def __init__(self, command: str = '', description: str = '', subcategory: Optional[str] = None,
+                 source_category: Optional[str] = None, source_file: Optional[str] = None,
+                 difficulty: Optional[str] = None, extra: Optional[Dict[str, Any]] = None,
+                 category_key: Optional[str] = None):
+        self.command = command
+        self.description = description
+        self.subcategory = sys.intern(subcategory) if subcategory is not None else None
+        self.source_category = sys.intern(source_category) if source_category is not None else None
+        self.source_file = sys.intern(source_file) if source_file is not None else None
+        self.difficulty = sys.intern(difficulty) if difficulty is not None else None
+        self.extra = extra or None
+        self.category_key = sys.intern(category_key) if category_key is not None else None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source_category: Optional[str] = None,
+                  source_file: Optional[str] = None, difficulty: Optional[str] = None,
+                  category_key: Optional[str] = None) -> 'Question':
+        """
+        Crea un record da un dizionario letto dal JSON
+
+        Args:
+            data: Dizionario della domanda
+            source_category: Categoria del pacchetto di provenienza
+            source_file: Nome del file di provenienza
+            difficulty: Difficoltà del pacchetto
+            category_key: Chiave di traduzione della categoria del pacchetto
+        """
+        extra = {key: value for key, value in data.items() if key not in _KEY_TO_SLOT}
+        return cls(data.get('command', ''), data.get('description', ''), data.get('category'),
+                   source_category if source_category is not None else data.get('source_category'),
+                   source_file if source_file is not None else data.get('source_file'),
+                   difficulty if difficulty is not None else data.get('difficulty'),
+                   extra, category_key if category_key is not None else data.get('category_key'))
+
+    def __reduce__(self):
+        # Serializzazione compatta per la cache compilata: una tupla di campi
+        return (_restore_question, (self.command, self.description, self.subcategory, self.source_category,
+                                    self.source_file, self.difficulty, self.extra, self.category_key))
+
+    def _lookup(self, key: str) -> Any:
+        slot = _KEY_TO_SLOT.get(key)
+        if slot is not None:
+            value = getattr(self, slot)
+            return _MISSING if value is None else value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        return _MISSING
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        slot = _KEY_TO_SLOT.get(key)
+        if slot is not None:
+            setattr(self, slot, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Come dict.get"""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def keys(self) -> List[str]:
+        """Chiavi presenti, come per un dizionario"""
+        keys = [key for key, slot in _KEY_TO_SLOT.items() if getattr(self, slot) is not None]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def items(self) -> List[Tuple[str, Any]]:
+        """Coppie chiave/valore presenti, come per un dizionario"""
+        return [(key, self[key]) for key in self.keys()]
+
+    def copy(self) -> 'Question':
+        """Copia superficiale del record"""
+        return Question(self.command, self.description, self.subcategory, self.source_category,
+                        self.source_file, self.difficulty, dict(self.extra) if self.extra else None,
+                        self.category_key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte il record in un dizionario"""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"Question({self.to_dict()!r})"
+
+
+def _restore_question(command, description, subcategory, source_category, source_file,
+                      difficulty, extra, category_key) -> Question:
+    """
+    Ricrea un record dalla cache compilata senza passare da __init__
+
+    Pickle salva una sola volta le stringhe condivise, quindi i record letti
+    dalla cache condividono già categoria, file e difficoltà: internarle di
+    nuovo costerebbe quanto il resto del caricamento.
+    """
+    question = Question.__new__(Question)
+    question.command = command
+    question.description = description
+    question.subcategory = subcategory
+    question.source_category = source_category
+    question.source_file = source_file
+    question.difficulty = difficulty
+    question.extra = extra
+    question.category_key = category_key
+    return question
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Question Table Model - Modello Qt della lista domande dell'editor
+Legge direttamente dai dati delle categorie, senza copiare le domande in celle;
+i filtri usano insiemi di righe precalcolati e un proxy con mappatura diretta
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+
+from questions_index import FIELD_SEPARATOR
+
+# Colonne della tabella
+COLUMN_COMMAND = 0
+COLUMN_CATEGORY = 1
+COLUMN_DIFFICULTY = 2
+COLUMN_LANGUAGE = 3
+COLUMN_COUNT = 4
+
+# Ruolo con cui la vista (o il proxy) legge l'ID stabile della domanda di una riga
+ROLE_QUESTION_ID = Qt.ItemDataRole.UserRole
+
+
+class QuestionsTableModel(QAbstractTableModel):
+    """
+    Una riga per domanda, identificata da un ID stabile
+
+    Ogni domanda riceve un ID intero che non cambia finché l'editor è aperto
+    (nemmeno se altre righe vengono aggiunte o rimosse) e la mappa
+    ID -> (nome della categoria, dizionario della domanda) affianca
+    questions_data. Le righe contengono solo gli ID, quindi trovare la
+    domanda selezionata è un accesso diretto, corretto anche con comandi
+    duplicati nella stessa categoria.
+
+    La vista chiede solo le celle visibili, quindi il costo di apertura non
+    dipende dal numero di domande; le modifiche emettono segnali mirati
+    (dataChanged, rowsInserted, rowsRemoved) invece di ricostruire la tabella.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.questions_data = {}
+        self.records = {}
+        self._rows = []
+        # ID -> riga, ricalcolata alla prima richiesta dopo una rimozione
+        self._row_by_id = {}
+        self._next_id = 0
+        self._headers = ["Command", "Category", "Difficulty", "Language"]
+
+    def reset(self, questions_data: Dict[str, Any]):
+        """
+        Ricostruisce le righe dai dati delle categorie
+
+        Le domande già presenti (stesso oggetto) mantengono il loro ID, le
+        altre ne ricevono uno nuovo.
+
+        Args:
+            questions_data: Nome della categoria -> contenuto del file JSON
+        """
+        self.beginResetModel()
+        # I record precedenti restano vivi fino alla fine: gli id() non si riusano
+        previous_records = self.records
+        previous_ids = {id(question): question_id
+                        for question_id, (_, question) in previous_records.items()}
+        self.questions_data = questions_data
+        self.records = {}
+        self._rows = []
+        for category_name, category_data in questions_data.items():
+            for question in category_data.get('questions', []):
+                question_id = previous_ids.pop(id(question), None)
+                if question_id is None:
+                    question_id = self._next_id
+                    self._next_id += 1
+                self.records[question_id] = (category_name, question)
+                self._rows.append(question_id)
+        self._row_by_id = {question_id: row for row, question_id in enumerate(self._rows)}
+        self.endResetModel()
+
+    def set_headers(self, headers: List[str]):
+        """Imposta le intestazioni delle colonne (es. dopo un cambio lingua)"""
+        self._headers = list(headers)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, COLUMN_COUNT - 1)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else COLUMN_COUNT
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        question_id = self._rows[index.row()]
+        if role == ROLE_QUESTION_ID:
+            return question_id
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        category_name, question = self.records[question_id]
+        column = index.column()
+        if column == COLUMN_COMMAND:
+            return question.get('command', '')
+        if column == COLUMN_CATEGORY:
+            return category_name
+        if column == COLUMN_DIFFICULTY:
+            return self.questions_data.get(category_name, {}).get('difficulty', 'beginner')
+        if column == COLUMN_LANGUAGE:
+            return "EN"
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self._headers):
+                return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def entries(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Righe del modello come coppie (categoria, domanda), nell'ordine della tabella"""
+        records = self.records
+        return [records[question_id] for question_id in self._rows]
+
+    def id_at(self, row: int) -> Optional[int]:
+        """ID della domanda di una riga, o None se la riga non esiste"""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def record(self, question_id: Optional[int]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Categoria e domanda di un ID, o None se l'ID non esiste più"""
+        return self.records.get(question_id)
+
+    def row_of(self, question_id: Optional[int]) -> int:
+        """Riga di una domanda, o -1 se non è nel modello"""
+        if question_id not in self.records:
+            return -1
+        if self._row_by_id is None:
+            self._row_by_id = {qid: row for row, qid in enumerate(self._rows)}
+        return self._row_by_id[question_id]
+
+    def append_question(self, category_name: str, question: Dict[str, Any]) -> int:
+        """
+        Aggiunge in fondo la riga di una nuova domanda
+
+        Returns:
+            ID assegnato alla domanda
+        """
+        question_id = self._next_id
+        self._next_id += 1
+        row = len(self._rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.records[question_id] = (category_name, question)
+        self._rows.append(question_id)
+        if self._row_by_id is not None:
+            self._row_by_id[question_id] = row
+        self.endInsertRows()
+        return question_id
+
+    def remove_question(self, question_id: int):
+        """Rimuove la riga di una domanda eliminata"""
+        row = self.row_of(question_id)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self.records[question_id]
+        # Le righe successive scalano: la mappa si ricalcola quando serve
+        self._row_by_id = None
+        self.endRemoveRows()
+
+    def question_changed(self, question_id: int):
+        """Aggiorna le celle della riga di una domanda modificata"""
+        row = self.row_of(question_id)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, COLUMN_COUNT - 1))
+
+    def category_changed(self):
+        """Aggiorna la colonna della difficoltà (che dipende dalla categoria)"""
+        if self._rows:
+            self.dataChanged.emit(self.index(0, COLUMN_DIFFICULTY),
+                                  self.index(len(self._rows) - 1, COLUMN_DIFFICULTY))
+
+
+def _search_text(question: Dict[str, Any]) -> str:
+    """Comando e descrizione in minuscolo, come li confronta la ricerca"""
+    return f"{question.get('command', '')}{FIELD_SEPARATOR}{question.get('description', '')}".lower()
+
+
+class QuestionFilterIndex:
+    """
+    Strutture precalcolate per i filtri della lista domande
+
+    Categoria -> righe, lingua -> righe con una traduzione e testo in
+    minuscolo di comando e descrizione per ogni riga. La ricerca scorre solo
+    le righe già ammesse dagli altri filtri. Le strutture si costruiscono
+    alla prima richiesta di un filtro e seguono poi i segnali del modello:
+    una domanda salvata o aggiunta aggiorna solo la sua riga, mentre reset e
+    rimozioni (che spostano le righe successive) le fanno ricalcolare.
+    """
+
+    def __init__(self, model: QuestionsTableModel):
+        self.model = model
+        self.invalidate()
+        model.modelReset.connect(self.invalidate)
+        model.rowsRemoved.connect(self.invalidate)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.dataChanged.connect(self._on_data_changed)
+
+    def invalidate(self):
+        """Scarta tutte le strutture (righe ricaricate o rimosse)"""
+        self._by_category = None
+        self._texts = None
+        self._by_language = {}
+        # Lingua -> funzione (categoria, domanda) con cui è stato calcolato l'insieme
+        self._language_checks = {}
+
+    def invalidate_languages(self):
+        """Scarta gli insiemi delle lingue (traduzioni modificate)"""
+        self._by_language = {}
+        self._language_checks = {}
+
+    def _entry(self, row: int) -> Tuple[str, Dict[str, Any]]:
+        return self.model.record(self.model.id_at(row))
+
+    def _update_languages(self, row: int, category_name: str, question: Dict[str, Any]):
+        for language, rows in self._by_language.items():
+            if self._language_checks[language](category_name, question):
+                rows.add(row)
+            else:
+                rows.discard(row)
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        if last != self.model.rowCount() - 1:
+            # Inserimento in mezzo: le righe successive scalano
+            self.invalidate()
+            return
+        for row in range(first, last + 1):
+            category_name, question = self._entry(row)
+            if self._by_category is not None:
+                self._by_category.setdefault(category_name, set()).add(row)
+            if self._texts is not None:
+                self._texts.append(_search_text(question))
+            self._update_languages(row, category_name, question)
+
+    def _on_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        # La sola colonna della difficoltà (category_changed) non tocca testi e
+        # traduzioni; la categoria di una riga non cambia mai
+        if top_left.column() > COLUMN_COMMAND:
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            category_name, question = self._entry(row)
+            if self._texts is not None:
+                self._texts[row] = _search_text(question)
+            self._update_languages(row, category_name, question)
+
+    def _category_rows(self) -> Dict[str, Set[int]]:
+        if self._by_category is None:
+            by_category = {}
+            for row, (category_name, _) in enumerate(self.model.entries()):
+                by_category.setdefault(category_name, set()).add(row)
+            self._by_category = by_category
+        return self._by_category
+
+    def _search_texts(self) -> List[str]:
+        if self._texts is None:
+            self._texts = [_search_text(question) for _, question in self.model.entries()]
+        return self._texts
+
+    def _find(self, query: str, rows: Optional[Set[int]] = None) -> Set[int]:
+        """Righe (tra quelle indicate, o tutte) che contengono il testo cercato"""
+        texts = self._search_texts()
+        if rows is None:
+            return {row for row, text in enumerate(texts) if query in text}
+        return {row for row in rows if query in texts[row]}
+
+    def language_rows(self, language: str,
+                      has_translation: Callable[[str, Dict[str, Any]], bool]) -> Set[int]:
+        """Righe delle domande tradotte in una lingua (calcolate una volta per lingua)"""
+        rows = self._by_language.get(language)
+        if rows is None:
+            rows = {row for row, (category_name, question) in enumerate(self.model.entries())
+                    if has_translation(category_name, question)}
+            self._by_language[language] = rows
+            self._language_checks[language] = has_translation
+        return rows
+
+    def select(self, categories: Optional[Iterable[str]] = None, query: str = '',
+               language: Optional[str] = None,
+               has_translation: Optional[Callable[[str, Dict[str, Any]], bool]] = None) -> Set[int]:
+        """
+        Righe che soddisfano tutti i filtri indicati
+
+        Args:
+            categories: Categorie ammesse (None: tutte)
+            query: Testo da cercare in comando e descrizione (vuoto: nessun filtro)
+            language: Lingua in cui la domanda deve essere tradotta (opzionale)
+            has_translation: Funzione (categoria, domanda) -> bool per la lingua
+
+        Returns:
+            Insieme delle righe del modello
+        """
+        candidates = []
+        if categories is not None:
+            by_category = self._category_rows()
+            rows = set()
+            for category_name in categories:
+                rows |= by_category.get(category_name, set())
+            candidates.append(rows)
+        if language is not None and has_translation is not None:
+            candidates.append(self.language_rows(language, has_translation))
+        if not candidates:
+            if query:
+                return self._find(query.lower())
+            return set(range(self.model.rowCount()))
+
+        # Si parte dall'insieme più piccolo per ridurre il costo delle intersezioni
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for rows in candidates[1:]:
+            result &= rows
+        if query:
+            result = self._find(query.lower(), result)
+        return result
+
+
+class QuestionsFilterProxy(QAbstractProxyModel):
+    """
+    Proxy che mostra solo le righe scelte dai filtri
+
+    A differenza di QSortFilterProxyModel non interroga una funzione per ogni
+    riga: riceve l'elenco delle righe ammesse e mappa gli indici con una lista
+    e un dizionario, quindi cambiare filtro costa in proporzione alle righe
+    mostrate.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # None: nessun filtro, le righe coincidono con quelle del modello sorgente
+        self._rows = None
+        self._proxy_rows = None
+
+    def setSourceModel(self, model: QuestionsTableModel):
+        super().setSourceModel(model)
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self._on_source_reset)
+        model.dataChanged.connect(self._on_source_data_changed)
+        model.headerDataChanged.connect(self.headerDataChanged)
+        model.rowsAboutToBeInserted.connect(self._on_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self._on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self._on_rows_removed)
+
+    def is_filtered(self) -> bool:
+        """True se è attivo un filtro"""
+        return self._rows is not None
+
+    def set_filter_rows(self, rows: Optional[Iterable[int]]):
+        """
+        Mostra solo le righe indicate del modello sorgente
+
+        Args:
+            rows: Righe del modello sorgente da mostrare (None: tutte)
+        """
+        self.beginResetModel()
+        self._set_rows(None if rows is None else sorted(rows))
+        self.endResetModel()
+
+    def _set_rows(self, rows: Optional[List[int]]):
+        self._rows = rows
+        self._proxy_rows = None if rows is None else {source_row: row for row, source_row in enumerate(rows)}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        if self._rows is None:
+            return self.sourceModel().rowCount()
+        return len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < self.rowCount()) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, child: Optional[QModelIndex] = None):
+        # Senza argomenti è il parent QObject; per gli indici la tabella è piatta
+        if child is None:
+            return super().parent()
+        return QModelIndex()
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and self.sourceModel() is not None:
+            return self.sourceModel().headerData(section, orientation, role)
+        return super().headerData(section, orientation, role)
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        row = proxy_index.row()
+        if self._rows is not None:
+            row = self._rows[row]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        if self._proxy_rows is not None:
+            row = self._proxy_rows.get(row)
+            if row is None:
+                return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def source_row(self, row: int) -> int:
+        """Riga del modello sorgente corrispondente a una riga del proxy (-1 se non valida)"""
+        if row < 0:
+            return -1
+        if self._rows is None:
+            return row
+        return self._rows[row] if row < len(self._rows) else -1
+
+    def _on_source_reset(self):
+        self._set_rows(None)
+        self.endResetModel()
+
+    def _on_source_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        first, last = top_left.row(), bottom_right.row()
+        if self._rows is not None:
+            visible = [self._proxy_rows[row] for row in range(first, last + 1) if row in self._proxy_rows]
+            if not visible:
+                return
+            first, last = min(visible), max(visible)
+        self.dataChanged.emit(self.index(first, top_left.column()), self.index(last, bottom_right.column()))
+
+    # Senza filtro le modifiche strutturali si inoltrano così come sono; con un
+    # filtro attivo le righe nascoste si rimappano e la vista viene azzerata
+    def _on_rows_about_to_be_inserted(self, parent: QModelIndex, first: int, last: int):
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def _on_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        if self._rows is None:
+            self.endInsertRows()
+            return
+        count = last - first + 1
+        self._set_rows([row if row < first else row + count for row in self._rows])
+        self.endResetModel()
+
+    def _on_rows_about_to_be_removed(self, parent: QModelIndex, first: int, last: int):
+        if self._rows is None:
+            self.beginRemoveRows(QModelIndex(), first, last)
+        else:
+            self.beginResetModel()
+
+    def _on_rows_removed(self, parent: QModelIndex, first: int, last: int):
+        if self._rows is None:
+            self.endRemoveRows()
+            return
+        count = last - first + 1
+        self._set_rows([row if row < first else row - count
+                        for row in self._rows if not first <= row <= last])
+        self.endResetModel()
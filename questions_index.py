@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Questions Index - Indici di ricerca per la banca delle domande Vim
+Mappa comando -> domande e indice invertito a n-grammi/token sulle descrizioni
+
+La mappa dei comandi si costruisce subito; l'indice dei testi solo alla
+prima ricerca, così l'avvio non dipende dalla lunghezza delle descrizioni.
+"""
+
+import re
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Lunghezza degli n-grammi indicizzati: le query lunghe almeno NGRAM caratteri
+# partono dalla lista di posizioni più corta tra i loro trigrammi e verificano
+# solo quei candidati; le query più corte scorrono i testi già in minuscolo
+NGRAM = 3
+
+# Separatore tra i campi di testo di una domanda (non compare mai nelle query)
+FIELD_SEPARATOR = '\x00'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _ngrams(text: str) -> Set[str]:
+    """Restituisce tutti gli n-grammi distinti di NGRAM caratteri di un testo"""
+    return {text[start:start + NGRAM] for start in range(len(text) - NGRAM + 1)}
+
+
+class QuestionsIndex:
+    def __init__(self):
+        """Inizializza un indice vuoto"""
+        self.questions = []
+        self.by_command = {}
+        self.indexed_languages = set()
+        # Posizioni liberate da remove (None in questions), recuperate alla ricostruzione
+        self.removed_count = 0
+        self._texts = []
+        self._ngrams = {}
+        self._tokens = {}
+        self._commands = {}
+        self._positions = {}
+        # False finché _texts, _ngrams e _tokens non sono stati costruiti
+        self._texts_ready = True
+
+    def build(self, questions: List[Any]):
+        """
+        Ricostruisce l'indice da zero
+
+        Solo la mappa dei comandi viene costruita subito: l'indice dei testi
+        è rimandato alla prima ricerca (vedi _ensure_texts).
+
+        Args:
+            questions: Lista delle domande (l'ordine definisce le posizioni,
+                       None indica una posizione libera)
+        """
+        self.questions = list(questions)
+        self.by_command = {}
+        self.indexed_languages = set()
+        self.removed_count = 0
+        self._texts = []
+        self._ngrams = {}
+        self._tokens = {}
+        self._commands = {}
+        self._positions = {}
+        self._texts_ready = False
+
+        for position, question in enumerate(self.questions):
+            if question is None:
+                self.removed_count += 1
+                continue
+            self._index_command(position, question)
+
+    def command_state(self) -> Dict[str, Any]:
+        """
+        Stato della mappa dei comandi, da salvare nella cache compilata
+
+        Va serializzato insieme alle domande (stesso pickle) perché contiene
+        riferimenti agli stessi record.
+        """
+        return {
+            'questions': self.questions,
+            'by_command': self.by_command,
+            'commands': self._commands,
+            'removed_count': self.removed_count,
+        }
+
+    def restore(self, state: Dict[str, Any]):
+        """
+        Ripristina la mappa dei comandi salvata con command_state
+
+        Costa una sola passata per le posizioni (indicizzate per id, quindi
+        non salvabili); l'indice dei testi resta da costruire come dopo build.
+        """
+        self.questions = state['questions']
+        self.by_command = state['by_command']
+        self._commands = state['commands']
+        self.removed_count = state['removed_count']
+        self.indexed_languages = set()
+        self._positions = {id(question): position for position, question in enumerate(self.questions)
+                           if question is not None}
+        self._texts = []
+        self._ngrams = {}
+        self._tokens = {}
+        self._texts_ready = False
+
+    def _index_command(self, position: int, question: Any):
+        """Indicizza il comando della domanda in una posizione"""
+        command = question.get('command', '')
+        self._positions[id(question)] = position
+        self.by_command.setdefault(command, []).append(question)
+        self._commands.setdefault(command.lower(), []).append(position)
+
+    def _index_texts(self, position: int, question: Any):
+        """Indicizza comando e descrizione originale della domanda in una posizione"""
+        self._add_text(position, question.get('command', ''))
+        self._add_text(position, question.get('description', ''))
+
+    def _ensure_texts(self):
+        """Costruisce l'indice dei testi (comandi e descrizioni originali) se manca"""
+        if self._texts_ready:
+            return
+        self._texts = [''] * len(self.questions)
+        self._ngrams = {}
+        self._tokens = {}
+        for position, question in enumerate(self.questions):
+            if question is not None:
+                self._index_texts(position, question)
+        self._texts_ready = True
+
+    def append(self, questions: List[Any]) -> range:
+        """
+        Aggiunge domande in coda all'indice senza toccare le posizioni esistenti
+
+        Le descrizioni tradotte delle nuove domande vanno aggiunte con
+        add_language per ogni lingua già indicizzata.
+
+        Returns:
+            Posizioni assegnate alle domande
+        """
+        start = len(self.questions)
+        self.questions.extend(questions)
+        for position in range(start, len(self.questions)):
+            self._index_command(position, self.questions[position])
+        if self._texts_ready:
+            self._texts.extend([''] * len(questions))
+            for position in range(start, len(self.questions)):
+                self._index_texts(position, self.questions[position])
+        return range(start, len(self.questions))
+
+    def remove(self, positions: Iterable[int]):
+        """
+        Toglie dall'indice le domande nelle posizioni indicate
+
+        Le posizioni restano libere (le altre non cambiano): le voci rimaste
+        negli indici invertiti non corrispondono più a nessun testo e vengono
+        scartate dalla verifica finale delle ricerche.
+        """
+        for position in positions:
+            question = self.questions[position]
+            if question is None:
+                continue
+            command = question.get('command', '')
+            remaining = [match for match in self.by_command.get(command, ()) if match is not question]
+            if remaining:
+                self.by_command[command] = remaining
+            else:
+                self.by_command.pop(command, None)
+            del self._positions[id(question)]
+            self.questions[position] = None
+            if self._texts_ready:
+                self._texts[position] = ''
+            self.removed_count += 1
+
+    def add_language(self, language: str, descriptions: Iterable[Tuple[int, str]]):
+        """
+        Aggiunge all'indice le descrizioni tradotte di una lingua
+
+        Args:
+            language: Codice lingua
+            descriptions: Coppie (posizione della domanda, descrizione tradotta)
+        """
+        self._ensure_texts()
+        for position, description in descriptions:
+            self._add_text(position, description)
+        self.indexed_languages.add(language)
+
+    def _add_text(self, position: int, text: str):
+        """Indicizza un campo di testo per la domanda in una data posizione"""
+        if not text:
+            return
+        text = text.lower()
+        current = self._texts[position]
+        self._texts[position] = f"{current}{FIELD_SEPARATOR}{text}" if current else text
+
+        # Le liste di posizioni sono array di interi: molto più compatte dei set
+        for gram in _ngrams(text):
+            self._ngrams.setdefault(gram, array('i')).append(position)
+        for token in set(_TOKEN_RE.findall(text)):
+            self._tokens.setdefault(token, array('i')).append(position)
+
+    def position_of(self, question: Any) -> Optional[int]:
+        """Posizione di una domanda presente nell'indice (None se non c'è)"""
+        return self._positions.get(id(question))
+
+    def lookup_command(self, command: str) -> List[Any]:
+        """Ottieni le domande con esattamente questo comando"""
+        return self.by_command.get(command, [])
+
+    def find_substring(self, query: str) -> Set[int]:
+        """
+        Trova le posizioni delle domande che contengono la sottostringa
+
+        Args:
+            query: Testo da cercare (già in minuscolo)
+
+        Returns:
+            Insieme delle posizioni corrispondenti
+        """
+        if not query:
+            return {position for position, question in enumerate(self.questions) if question is not None}
+        self._ensure_texts()
+        if len(query) < NGRAM:
+            return {position for position, text in enumerate(self._texts) if query in text}
+
+        # Parte dalla lista di posizioni più corta tra i trigrammi della query
+        shortest = None
+        for gram in _ngrams(query):
+            posting = self._ngrams.get(gram)
+            if not posting:
+                return set()
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+
+        # Verifica finale: i trigrammi possono comparire in punti diversi
+        texts = self._texts
+        return {position for position in shortest if query in texts[position]}
+
+    def search(self, query: str, within: Optional[Set[int]] = None) -> List[Any]:
+        """
+        Cerca le domande che contengono il testo nel comando o in una descrizione
+
+        Args:
+            query: Testo da cercare
+            within: Considera solo queste posizioni (opzionale)
+
+        Returns:
+            Domande corrispondenti, nell'ordine della banca
+        """
+        positions = self.find_substring(query.lower())
+        if within is not None:
+            positions &= within
+        return [self.questions[position] for position in sorted(positions)]
+
+    def search_ranked(self, query: str, limit: Optional[int] = None,
+                      within: Optional[Set[int]] = None) -> List[Any]:
+        """
+        Ricerca a più termini ordinata per rilevanza
+
+        Ogni termine contribuisce al punteggio di una domanda: 3 punti se è
+        esattamente il comando, 2 se è una parola intera di una descrizione,
+        1 se compare solo come sottostringa.
+
+        Args:
+            query: Termini di ricerca separati da spazi
+            limit: Numero massimo di risultati (opzionale)
+            within: Considera solo queste posizioni (opzionale)
+
+        Returns:
+            Domande ordinate per punteggio decrescente
+        """
+        scores = {}
+        self._ensure_texts()
+        for term in query.lower().split():
+            exact = set(self._commands.get(term, ()))
+            words = set(self._tokens.get(term, ()))
+            for position in self.find_substring(term):
+                if within is not None and position not in within:
+                    continue
+                if position in exact:
+                    points = 3
+                elif position in words:
+                    points = 2
+                else:
+                    points = 1
+                scores[position] = scores.get(position, 0) + points
+
+        ranked = sorted(scores, key=lambda position: (-scores[position], position))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [self.questions[position] for position in ranked]
@@ -4,54 +4,578 @@ Questions Loader - Sistema di caricamento dinamico delle domande Vim
 Carica le domande dai file JSON organizzati per categoria
 """
 
+import gc
+import hashlib
+import hmac
 import json
 import os
+import pickle
 import random
-from typing import Dict, List, Any, Optional
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from command_normalizer import CommandIndex
+from question_record import Question
+from questions_index import QuestionsIndex
+
+# Versione del formato della cache compilata: va incrementata ogni volta che
+# cambia la struttura dei dati salvati, così le cache vecchie vengono ignorate
+CACHE_FORMAT_VERSION = 6
+
+# Chiave segreta dell'utente con cui si firma la cache compilata: pickle può
+# eseguire codice, quindi si legge solo una cache scritta da questo utente
+CACHE_SECRET_PATH = os.path.join(os.path.expanduser("~"), ".vimquiz", "cache.key")
+
+# Intestazione del file di cache, seguita dalla firma HMAC-SHA256 del pickle
+CACHE_MAGIC = b'VQCACHE1'
+_CACHE_DIGEST_SIZE = hashlib.sha256().digest_size
+
+
+def category_key_for(data: Dict[str, Any], filename: str) -> str:
+    """
+    Chiave di traduzione di un pacchetto di domande
+    
+    È il campo "key" del pacchetto, se presente, altrimenti il nome del file
+    senza estensione (basic_movement.json -> basic_movement): le descrizioni
+    tradotte stanno in question_descriptions sotto questa chiave.
+    """
+    key = data.get('key')
+    if isinstance(key, str) and key.strip():
+        return key.strip()
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def _is_private_file(stat_result: os.stat_result, mask: int) -> bool:
+    """
+    True se il file è dell'utente corrente e non ha i permessi indicati da mask
+
+    Dove non esistono proprietari e permessi POSIX (Windows) il controllo passa.
+    """
+    if not hasattr(os, 'getuid'):
+        return True
+    return stat_result.st_uid == os.getuid() and not stat_result.st_mode & mask
+
+
+def _cache_secret(path: str = CACHE_SECRET_PATH) -> Optional[bytes]:
+    """
+    Legge (o crea al primo uso) la chiave con cui si firma la cache compilata
+
+    Returns:
+        La chiave, oppure None se non è utilizzabile (la cache resta disattivata)
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(os.urandom(32))
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return None
+    except OSError:
+        return None
+    with os.fdopen(fd, 'rb') as f:
+        # Una chiave leggibile da altri utenti permetterebbe loro di firmare una cache
+        if not _is_private_file(os.fstat(f.fileno()), 0o077):
+            return None
+        secret = f.read()
+    return secret or None
+
 
 class QuestionsLoader:
-    def __init__(self, questions_dir: str = "questions", i18n_manager=None):
+    def __init__(self, questions_dir: str = "questions", i18n_manager=None,
+                 use_cache: bool = True, cache_file: Optional[str] = None):
         """
         Inizializza il caricatore delle domande
         
         Args:
             questions_dir: Directory contenente i file delle domande
             i18n_manager: Gestore delle traduzioni (opzionale)
+            use_cache: Usa la cache compilata della banca domande
+            cache_file: Percorso della cache (predefinito: accanto a questions_dir)
         """
         self.questions_dir = questions_dir
         self.i18n_manager = i18n_manager
+        self.use_cache = use_cache
+        self.cache_file = cache_file or self.default_cache_path(questions_dir)
         self.categories = {}
         self.all_questions = []
+        # File JSON -> nome della categoria che contiene (per i ricaricamenti parziali)
+        self.category_files = {}
+        self.index = QuestionsIndex()
+        self._index_revision = None
+        # Categorie le cui descrizioni tradotte sono già nell'indice: (lingua, categoria)
+        self._indexed_categories = set()
+        # Viste tradotte per lingua: lingua -> (revisione i18n, domande tradotte per
+        # posizione, None finché una domanda non viene richiesta)
+        self._translated_views = {}
+        # Indice dei filtri: (categoria o None, difficoltà o None) -> posizioni
+        # (crescenti) nell'indice di ricerca, stabili tra i ricaricamenti parziali
+        self.filter_index = {}
+        # File JSON -> posizioni delle sue domande nell'indice di ricerca
+        self._file_positions = {}
+        # Classi di equivalenza dei comandi per le risposte scritte (costruite al primo uso)
+        self._command_index = None
+        # Funzioni richiamate dopo ogni ricaricamento parziale: callback(nome del file)
+        self._change_listeners = []
+        # Chiave della cache ancora da scrivere dopo i ricaricamenti parziali (vedi flush_cache)
+        self._stale_cache_key = None
+        # File JSON non validi -> errore, salvati nella cache e riportati a ogni avvio
+        self.skipped_files = {}
         self.load_all_questions()
     
+    @staticmethod
+    def default_cache_path(questions_dir: str) -> str:
+        """Percorso predefinito della cache, accanto alla directory delle domande"""
+        questions_dir = os.path.normpath(questions_dir)
+        parent = os.path.dirname(questions_dir)
+        name = os.path.basename(questions_dir)
+        return os.path.join(parent, f".{name}_cache.pickle")
+    
+    def _list_question_files(self) -> List[str]:
+        """Elenca i file JSON delle domande in ordine stabile"""
+        return sorted(f for f in os.listdir(self.questions_dir) if f.endswith('.json'))
+    
+    def _compute_cache_key(self, filenames: List[str]) -> Tuple:
+        """
+        Calcola la chiave della cache a partire da nome, mtime e dimensione dei file
+        
+        Args:
+            filenames: File JSON presenti nella directory delle domande
+            
+        Returns:
+            Tupla che identifica lo stato corrente dei file sorgente
+        """
+        entries = []
+        for filename in filenames:
+            stat = os.stat(os.path.join(self.questions_dir, filename))
+            entries.append((filename, stat.st_mtime_ns, stat.st_size))
+        return (CACHE_FORMAT_VERSION, tuple(entries))
+    
+    def _load_cache(self, cache_key: Tuple) -> bool:
+        """
+        Carica la banca domande dalla cache compilata se ancora valida
+        
+        La cache si deserializza solo se il file appartiene all'utente, non è
+        scrivibile da altri e la firma corrisponde alla chiave dell'utente:
+        un file estraneo (ad esempio arrivato con una copia della cartella)
+        viene ignorato e riscritto.
+        
+        Returns:
+            True se la cache è stata usata, False se va ricostruita
+        """
+        secret = _cache_secret()
+        if secret is None:
+            return False
+        try:
+            with open(self.cache_file, 'rb') as f:
+                if not _is_private_file(os.fstat(f.fileno()), 0o022):
+                    return False
+                header = f.read(len(CACHE_MAGIC) + _CACHE_DIGEST_SIZE)
+                data = f.read()
+            if header[:len(CACHE_MAGIC)] != CACHE_MAGIC:
+                return False
+            digest = hmac.new(secret, data, hashlib.sha256).digest()
+            if not hmac.compare_digest(header[len(CACHE_MAGIC):], digest):
+                return False
+            # Il garbage collector scatterebbe più volte durante la creazione
+            # di centinaia di migliaia di oggetti che restano comunque vivi
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                payload = pickle.loads(data)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+            if payload.get('key') != cache_key:
+                return False
+            self.categories = payload['categories']
+            self.all_questions = payload['all_questions']
+            self.category_files = payload['category_files']
+            self.index.restore(payload['index'])
+            self.filter_index = payload['filter_index']
+            self._file_positions = payload['file_positions']
+            self.skipped_files = payload['skipped_files']
+            self._reset_derived()
+            self._report_skipped_files()
+            return True
+        except Exception:
+            # Cache assente, corrotta o di un'altra versione: si ricostruisce in silenzio
+            return False
+    
+    def _save_cache(self, cache_key: Tuple, cache_file: Optional[str] = None) -> bool:
+        """
+        Scrive la cache compilata in modo atomico (file temporaneo + rename)
+        
+        Il file è leggibile e scrivibile solo dall'utente ed è firmato con la
+        sua chiave (vedi _load_cache).
+        
+        Returns:
+            True se il file è stato scritto
+        """
+        secret = _cache_secret()
+        if secret is None:
+            return False
+        cache_file = cache_file or self.cache_file
+        payload = {
+            'key': cache_key,
+            'categories': self.categories,
+            'all_questions': self.all_questions,
+            'category_files': self.category_files,
+            # Indici già pronti: all'avvio dalla cache non si ricalcola nulla
+            'index': self.index.command_state(),
+            'filter_index': self.filter_index,
+            'file_positions': self._file_positions,
+            'skipped_files': self.skipped_files,
+        }
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hmac.new(secret, data, hashlib.sha256).digest()
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(CACHE_MAGIC)
+                f.write(digest)
+                f.write(data)
+            os.replace(tmp_file, cache_file)
+            return True
+        except OSError:
+            # Directory in sola lettura o simili: la cache è solo un'ottimizzazione
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return False
+    
+    def flush_cache(self) -> bool:
+        """
+        Scrive la cache compilata se dei ricaricamenti parziali l'hanno resa vecchia
+        
+        Chiamata alla chiusura dagli osservatori dei file. Se non viene mai
+        chiamata la cache non corrisponde più ai file e al prossimo avvio la
+        banca si ricostruisce dai sorgenti.
+        
+        Returns:
+            True se il file è stato scritto
+        """
+        if self._stale_cache_key is None:
+            return False
+        cache_key, self._stale_cache_key = self._stale_cache_key, None
+        return self._save_cache(cache_key)
+    
+    def write_compiled_bank(self, cache_file: Optional[str] = None) -> bool:
+        """
+        Scrive la banca caricata come cache compilata (vedi vimquiz_build.py)
+        
+        Args:
+            cache_file: Percorso di destinazione (predefinito: la cache del caricatore)
+            
+        Returns:
+            True se il file è stato scritto
+        """
+        cache_key = self._compute_cache_key(self._list_question_files())
+        return self._save_cache(cache_key, cache_file)
+    
     def load_all_questions(self):
-        """Carica tutte le domande da tutti i file JSON"""
+        """Carica tutte le domande da tutti i file JSON (o dalla cache compilata)"""
         if not os.path.exists(self.questions_dir):
             raise FileNotFoundError(f"Directory {self.questions_dir} non trovata")
         
+        self.categories = {}
+        self.all_questions = []
+        self.category_files = {}
+        self._stale_cache_key = None
+        self.skipped_files = {}
+        filenames = self._list_question_files()
+        cache_key = None
+        if self.use_cache:
+            cache_key = self._compute_cache_key(filenames)
+            if self._load_cache(cache_key):
+                return
+        
         # Carica tutti i file JSON nella directory
-        for filename in os.listdir(self.questions_dir):
-            if filename.endswith('.json'):
-                filepath = os.path.join(self.questions_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        category_name = data.get('category', 'Unknown')
-                        self.categories[category_name] = data
-                        
-                        # Aggiungi le domande alla lista generale
-                        category_difficulty = data.get('difficulty', 'beginner')
-                        for question in data.get('questions', []):
-                            question['source_category'] = category_name
-                            question['source_file'] = filename
-                            question['difficulty'] = category_difficulty
-                            self.all_questions.append(question)
-                            
-                except (json.JSONDecodeError, KeyError) as e:
-                    print(f"Errore nel caricamento di {filename}: {e}")
-                    continue
+        for filename in filenames:
+            data = self._parse_question_file(filename)
+            if data is None:
+                continue
+            category_name = data.get('category', 'Unknown')
+            self.categories[category_name] = data
+            self.category_files[filename] = category_name
+            
+            # Aggiungi le domande alla lista generale
+            self.all_questions.extend(data['questions'])
         
         print(f"Caricate {len(self.all_questions)} domande da {len(self.categories)} categorie")
+        
+        self._build_index()
+        if self.use_cache:
+            self._save_cache(cache_key)
+    
+    def _parse_question_file(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Legge un file della banca convertendo le domande in record
+        
+        Returns:
+            Dati della categoria, oppure None se il file non è valido
+        """
+        filepath = os.path.join(self.questions_dir, filename)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            category_name = data.get('category', 'Unknown')
+            category_difficulty = data.get('difficulty', 'beginner')
+            # Risolta una volta qui: ogni record condivide la stessa stringa internata
+            category_key = sys.intern(category_key_for(data, filename))
+            data['key'] = category_key
+            data['questions'] = [Question.from_dict(question, category_name, filename, category_difficulty,
+                                                    category_key)
+                                 for question in data.get('questions', [])]
+            self.skipped_files.pop(filename, None)
+            return data
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
+            self.skipped_files[filename] = str(e)
+            print(f"Errore nel caricamento di {filename}: {e}")
+            return None
+    
+    def _report_skipped_files(self):
+        """Ripete gli errori dei file scartati quando la banca arriva dalla cache"""
+        for filename, error in sorted(self.skipped_files.items()):
+            print(f"Errore nel caricamento di {filename}: {error}")
+    
+    def reload(self):
+        """Ricarica la banca domande e ricostruisce gli indici"""
+        self.load_all_questions()
+    
+    def add_change_listener(self, callback: Callable[[str], None]):
+        """
+        Registra una funzione richiamata dopo ogni reload_file riuscito
+        
+        Args:
+            callback: Funzione che riceve il nome del file ricaricato
+        """
+        self._change_listeners.append(callback)
+    
+    def remove_change_listener(self, callback: Callable[[str], None]):
+        """Rimuove una funzione registrata con add_change_listener"""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+    
+    def reload_file(self, filename: str) -> bool:
+        """
+        Rilegge un solo file della banca (aggiunto, modificato o eliminato)
+        
+        Gli altri file non vengono riletti e gli indici derivati (filtri,
+        ricerca, viste tradotte) si aggiornano solo per le righe del file:
+        le vecchie domande liberano le loro posizioni, le nuove vengono
+        aggiunte in coda alla banca. Un file non valido (ad esempio a metà
+        scrittura) lascia la banca invariata.
+        
+        Args:
+            filename: Nome (o percorso) del file JSON nella directory delle domande
+            
+        Returns:
+            True se la banca è cambiata
+        """
+        filename = os.path.basename(filename)
+        if not filename.endswith('.json'):
+            return False
+        
+        data = None
+        if os.path.exists(os.path.join(self.questions_dir, filename)):
+            data = self._parse_question_file(filename)
+            if data is None:
+                return False
+        else:
+            self.skipped_files.pop(filename, None)
+            if filename not in self.category_files:
+                return False
+        
+        previous_category = self.category_files.pop(filename, None)
+        if previous_category is not None and previous_category not in self.category_files.values():
+            self.categories.pop(previous_category, None)
+        if data is not None:
+            category_name = data.get('category', 'Unknown')
+            self.categories[category_name] = data
+            self.category_files[filename] = category_name
+        
+        # Nuova lista (non modificata sul posto): chi tiene la precedente, come
+        # le sessioni in corso, continua a vedere una banca coerente. La banca
+        # segue l'ordine delle posizioni, quindi le righe del file vanno in coda
+        old_positions = self._file_positions.pop(filename, ())
+        new_questions = data['questions'] if data is not None else []
+        if old_positions:
+            offset = sum(len(positions) for positions in self._file_positions.values()
+                         if positions and positions[0] < old_positions[0])
+            self.all_questions = (self.all_questions[:offset] +
+                                  self.all_questions[offset + len(old_positions):] + new_questions)
+        else:
+            self.all_questions = self.all_questions + new_questions
+        
+        if self.use_cache:
+            # Riscrivere la cache costa quanto la banca: si rimanda a flush_cache,
+            # una volta sola per tutti i ricaricamenti (la chiave si calcola ora,
+            # sullo stato dei file appena letti)
+            self._stale_cache_key = self._compute_cache_key(self._list_question_files())
+        self._replace_file_rows(filename, old_positions, new_questions)
+        
+        for callback in list(self._change_listeners):
+            callback(filename)
+        return True
+    
+    def _build_index(self):
+        """Ricostruisce gli indici di ricerca sulla banca corrente"""
+        self.index.build(self.all_questions)
+        self._build_filter_index()
+        self._reset_derived()
+    
+    def _reset_derived(self):
+        """Azzera le strutture costruite al primo uso (viste tradotte, equivalenze, traduzioni indicizzate)"""
+        self._translated_views = {}
+        self._command_index = None
+        # Le traduzioni si indicizzano per categoria alla prima ricerca che le riguarda
+        self._index_revision = None
+        self._indexed_categories = set()
+    
+    @staticmethod
+    def _filter_keys(question: Dict[str, Any]) -> Tuple:
+        """Chiavi di filter_index (oltre a (None, None)) sotto cui compare una domanda"""
+        category = question.get('source_category')
+        difficulty = question.get('difficulty', 'beginner')
+        return ((category, difficulty), (category, None), (None, difficulty))
+    
+    def _build_filter_index(self):
+        """Precalcola le posizioni delle domande per ogni combinazione di categoria e difficoltà"""
+        filter_index = {(None, None): list(range(len(self.all_questions)))}
+        file_positions = {}
+        for position, question in enumerate(self.all_questions):
+            for key in self._filter_keys(question):
+                filter_index.setdefault(key, []).append(position)
+            file_positions.setdefault(question.source_file, []).append(position)
+        self.filter_index = filter_index
+        self._file_positions = file_positions
+    
+    def _replace_file_rows(self, filename: str, old_positions, new_questions: List[Dict[str, Any]]):
+        """
+        Sostituisce negli indici derivati le righe di un file ricaricato
+        
+        Costa in proporzione alle righe del file, non alla banca: le posizioni
+        liberate restano vuote finché non superano le domande presenti, poi
+        si ricostruisce tutto da capo.
+        
+        Args:
+            filename: Nome del file ricaricato
+            old_positions: Posizioni occupate dalle domande precedenti del file
+            new_questions: Domande attuali del file (vuota se il file è stato eliminato)
+        """
+        self._command_index = None
+        if self.index.removed_count + len(old_positions) > len(self.all_questions):
+            self._build_index()
+            return
+        
+        # Filtri: nuovo dizionario e nuove liste solo per le chiavi toccate,
+        # così chi sta scorrendo quelle precedenti non le vede cambiare
+        filter_index = dict(self.filter_index)
+        if old_positions:
+            removed = set(old_positions)
+            first, last = old_positions[0], old_positions[-1]
+            for key, positions in self.filter_index.items():
+                start, end = bisect_left(positions, first), bisect_right(positions, last)
+                if start == end:
+                    continue
+                kept = [position for position in positions[start:end] if position not in removed]
+                positions = positions[:start] + kept + positions[end:]
+                if positions or key == (None, None):
+                    filter_index[key] = positions
+                else:
+                    del filter_index[key]
+        
+        # Viste tradotte ancora valide: si tolgono le vecchie righe e si aggiungono le nuove
+        revision = self.i18n_manager.revision if self.i18n_manager else None
+        self._translated_views = {language: view for language, view in self._translated_views.items()
+                                  if view[0] == revision}
+        for _, translated in self._translated_views.values():
+            for position in old_positions:
+                translated[position] = None
+        
+        self.index.remove(old_positions)
+        new_positions = self.index.append(new_questions)
+        added = {(None, None): list(new_positions)}
+        for position, question in zip(new_positions, new_questions):
+            for key in self._filter_keys(question):
+                added.setdefault(key, []).append(position)
+        for key, positions in added.items():
+            filter_index[key] = filter_index.get(key, []) + positions
+        self.filter_index = filter_index
+        if new_positions:
+            self._file_positions[filename] = new_positions
+        
+        for _, translated in self._translated_views.values():
+            translated.extend([None] * len(new_positions))
+        
+        if self._index_revision == revision:
+            # Le nuove righe di una categoria già indicizzata vanno aggiunte subito
+            for language in {language for language, _ in self._indexed_categories}:
+                positions = [position for position, question in zip(new_positions, new_questions)
+                             if (language, question.get('source_category')) in self._indexed_categories]
+                self.index.add_language(language, self._translated_descriptions(language, positions))
+    
+    def question_at(self, position: int) -> Dict[str, Any]:
+        """Domanda originale (non tradotta) in una posizione di filter_index"""
+        return self.index.questions[position]
+    
+    def _questions_at(self, positions: List[int]) -> List[Dict[str, Any]]:
+        """Restituisce le domande (tradotte se possibile) nelle posizioni indicate"""
+        if not self.i18n_manager:
+            return [self.index.questions[position] for position in positions]
+        translated = self._get_translated_view()
+        return [self._translated_at(translated, position) for position in positions]
+    
+    def _sync_index_languages(self, category: Optional[str] = None):
+        """
+        Aggiunge all'indice le descrizioni tradotte mancanti nelle lingue caricate
+        
+        Args:
+            category: Indicizza solo questa categoria (predefinito: tutte); le
+                      descrizioni delle altre categorie non vengono lette
+        """
+        if not self.i18n_manager:
+            return
+        if self._index_revision != self.i18n_manager.revision and self._indexed_categories:
+            # Le traduzioni sono state ricaricate: si riparte dalle sole domande
+            # (le posizioni non cambiano)
+            self.index.build(self.index.questions)
+            self._indexed_categories = set()
+        self._index_revision = self.i18n_manager.revision
+        
+        if category:
+            categories = [category]
+        else:
+            categories = [category for category, difficulty in self.filter_index
+                          if category is not None and difficulty is None]
+        for language in self.i18n_manager.get_loaded_languages():
+            for category in categories:
+                if (language, category) in self._indexed_categories:
+                    continue
+                positions = self.filter_index.get((category, None), [])
+                self.index.add_language(language, self._translated_descriptions(language, positions))
+                self._indexed_categories.add((language, category))
+    
+    def _translated_descriptions(self, language: str, positions) -> List[Tuple[int, str]]:
+        """Coppie (posizione, descrizione tradotta) delle domande indicate in una lingua caricata"""
+        descriptions = []
+        for position in positions:
+            question = self.index.questions[position]
+            category_key = question.get('category_key') if question is not None else None
+            if not category_key:
+                continue
+            translated = self.i18n_manager.get_question_descriptions(language, category_key)
+            description = translated.get(question.get('command', ''))
+            if description:
+                descriptions.append((position, description))
+        return descriptions
     
     def get_questions_by_category(self, category: str) -> List[Dict[str, Any]]:
         """
@@ -79,78 +603,135 @@ class QuestionsLoader:
         Returns:
             Lista delle domande della difficoltà
         """
-        questions = [q for q in self.all_questions if q.get('difficulty', 'beginner') == difficulty]
-        return self.get_translated_questions(questions)
+        return self._questions_at(self.filter_index.get((None, difficulty), []))
+    
+    def get_filtered_questions(self, category: Optional[str] = None,
+                               difficulty: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Ottieni le domande che rispettano i filtri, nell'ordine della banca
+        
+        Args:
+            category: Categoria specifica (opzionale)
+            difficulty: Difficoltà specifica (opzionale)
+            
+        Returns:
+            Lista delle domande filtrate
+        """
+        return self._questions_at(self.filter_index.get((category or None, difficulty or None), []))
     
     def get_all_questions(self) -> List[Dict[str, Any]]:
         """Ottieni tutte le domande"""
-        return self.get_translated_questions(self.all_questions.copy())
+        if not self.i18n_manager:
+            return self.all_questions.copy()
+        return self._questions_at(self.filter_index.get((None, None), []))
+    
+    def _translate_question(self, question: Dict[str, Any], language: Optional[str] = None) -> Dict[str, Any]:
+        """Restituisce la domanda con la descrizione nella lingua indicata (predefinita: la corrente)"""
+        category_key = question.get('category_key')
+        if not category_key:
+            return question
+        command = question.get('command', '')
+        
+        # Ottieni la descrizione tradotta
+        translated_description = self.i18n_manager.get_question_description(category_key, command, language)
+        # Se trovata una traduzione diversa da quella originale
+        if (translated_description and translated_description != command and
+                translated_description != question.get('description')):
+            translated_question = question.copy()
+            translated_question['description'] = translated_description
+            return translated_question
+        return question
+    
+    def _get_translated_view(self) -> List[Optional[Dict[str, Any]]]:
+        """
+        Ottieni la vista tradotta della banca per la lingua corrente
+        
+        Ogni domanda viene tradotta alla prima richiesta (vedi _translated_at),
+        così le descrizioni delle categorie mai estratte non vengono lette. La
+        vista è invalidata solo quando le traduzioni vengono ricaricate.
+        
+        Returns:
+            Domande tradotte nelle posizioni dell'indice di ricerca (None se
+            non ancora tradotte)
+        """
+        language = self.i18n_manager.get_current_language()
+        revision = self.i18n_manager.revision
+        view = self._translated_views.get(language)
+        if view is None or view[0] != revision:
+            view = (revision, [None] * len(self.index.questions))
+            self._translated_views[language] = view
+        return view[1]
+    
+    def _translated_at(self, translated: List[Optional[Dict[str, Any]]], position: int) -> Dict[str, Any]:
+        """Domanda tradotta in una posizione della vista, tradotta ora se serve"""
+        question = translated[position]
+        if question is None:
+            question = self._translate_question(self.index.questions[position])
+            translated[position] = question
+        return question
     
     def get_translated_questions(self, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Ottieni le domande con le descrizioni tradotte"""
+        """
+        Ottieni le domande con le descrizioni tradotte
+        
+        Le domande restituite sono riferimenti condivisi alla vista tradotta
+        della lingua corrente: non vanno modificate dal chiamante.
+        """
         if not self.i18n_manager:
             return questions
         
-        # Mappa delle categorie per le chiavi di traduzione
-        category_mapping = {
-            "File Operations": "file_operations",
-            "Basic Movement": "basic_movement",
-            "Screen Movement": "screen_movement",
-            "Insert Mode": "insert_mode",
-            "Editing": "editing",
-            "Visual Mode": "visual_mode",
-            "Copy/Paste": "copy_paste",
-            "Search and Replace": "search_replace",
-            "Macros": "macros",
-            "Marks and Jumps": "marks_jumps"
-        }
-        
+        translated = self._get_translated_view()
         translated_questions = []
         for question in questions:
-            translated_question = question.copy()
-            category = question.get('source_category', 'File Operations')
-            command = question.get('command', '')
-            
-            # Mappa la categoria per la traduzione
-            translation_category = category_mapping.get(category, 'file_operations')
-            
-            # Ottieni la descrizione tradotta
-            translated_description = self.i18n_manager.get_question_description(translation_category, command)
-            # Se trovata una traduzione (non è uguale al comando originale)
-            if translated_description and translated_description != command:
-                translated_question['description'] = translated_description
-            
-            translated_questions.append(translated_question)
+            position = self.index.position_of(question)
+            if position is None:
+                # Domanda esterna alla banca: traduzione puntuale
+                translated_questions.append(self._translate_question(question))
+            else:
+                translated_questions.append(self._translated_at(translated, position))
         
         return translated_questions
     
+    def retranslate_questions(self, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Riporta nella lingua corrente domande ottenute in un'altra lingua
+        
+        Args:
+            questions: Domande restituite in precedenza dal caricatore
+            
+        Returns:
+            Le stesse domande, nello stesso ordine, con le descrizioni aggiornate
+        """
+        originals = []
+        for question in questions:
+            matches = self.index.lookup_command(question.get('command', ''))
+            original = next((match for match in matches
+                             if match.get('source_category') == question.get('source_category')), None)
+            originals.append(original if original is not None else question)
+        return self.get_translated_questions(originals)
+    
     def get_random_questions(self, count: int, category: Optional[str] = None, 
-                           difficulty: Optional[str] = None) -> List[Dict[str, Any]]:
+                           difficulty: Optional[str] = None,
+                           seed: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Ottieni un numero casuale di domande
         
+        Il campionamento avviene sugli indici precalcolati dei filtri, quindi
+        il costo dipende dal numero di domande richieste e non dalla banca.
+        
         Args:
             count: Numero di domande da ottenere
             category: Categoria specifica (opzionale)
             difficulty: Difficoltà specifica (opzionale)
+            seed: Seme del generatore casuale, per estrazioni riproducibili (opzionale)
             
         Returns:
             Lista casuale di domande
         """
-        questions = self.all_questions.copy()
-        
-        # Filtra per categoria se specificata
-        if category:
-            questions = [q for q in questions if q.get('source_category') == category]
-        
-        # Filtra per difficoltà se specificata
-        if difficulty:
-            questions = [q for q in questions if q.get('difficulty', 'beginner') == difficulty]
-        
-        # Mescola e prendi il numero richiesto
-        random.shuffle(questions)
-        selected_questions = questions[:count]
-        return self.get_translated_questions(selected_questions)
+        positions = self.filter_index.get((category or None, difficulty or None), [])
+        rng = random.Random(seed) if seed is not None else random
+        selected_positions = rng.sample(positions, max(0, min(count, len(positions))))
+        return self._questions_at(selected_positions)
     
     def get_categories(self) -> List[str]:
         """Ottieni la lista delle categorie disponibili"""
@@ -158,10 +739,8 @@ class QuestionsLoader:
     
     def get_difficulties(self) -> List[str]:
         """Ottieni la lista delle difficoltà disponibili"""
-        difficulties = set()
-        for question in self.all_questions:
-            difficulties.add(question.get('difficulty', 'beginner'))
-        return sorted(list(difficulties))
+        return sorted(difficulty for category, difficulty in self.filter_index
+                      if category is None and difficulty is not None)
     
     def get_question_count_by_category(self) -> Dict[str, int]:
         """Ottieni il conteggio delle domande per categoria"""
@@ -172,33 +751,46 @@ class QuestionsLoader:
     
     def get_question_count_by_difficulty(self) -> Dict[str, int]:
         """Ottieni il conteggio delle domande per difficoltà"""
-        counts = {}
-        for question in self.all_questions:
-            difficulty = question.get('difficulty', 'beginner')
-            counts[difficulty] = counts.get(difficulty, 0) + 1
-        return counts
+        return {difficulty: len(positions) for (category, difficulty), positions in self.filter_index.items()
+                if category is None and difficulty is not None}
+    
+    def _category_positions(self, category: Optional[str]) -> Optional[set]:
+        """Posizioni di una categoria per limitare una ricerca (None: nessun limite)"""
+        if not category:
+            return None
+        return set(self.filter_index.get((category, None), []))
     
-    def search_questions(self, query: str) -> List[Dict[str, Any]]:
+    def search_questions(self, query: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Cerca domande per comando o descrizione
         
         Args:
             query: Termine di ricerca
+            category: Cerca solo in questa categoria (opzionale): le descrizioni
+                      tradotte delle altre categorie non vengono lette
             
         Returns:
-            Lista delle domande che corrispondono alla ricerca
+            Lista delle domande che corrispondono alla ricerca (comando o
+            descrizione in una qualsiasi delle lingue caricate)
         """
-        query = query.lower()
-        results = []
+        self._sync_index_languages(category)
+        return self.index.search(query, self._category_positions(category))
+    
+    def search_questions_ranked(self, query: str, limit: Optional[int] = None,
+                                category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Cerca domande con più termini, ordinate per rilevanza
         
-        for question in self.all_questions:
-            command = question.get('command', '').lower()
-            description = question.get('description', '').lower()
+        Args:
+            query: Termini di ricerca separati da spazi
+            limit: Numero massimo di risultati (opzionale)
+            category: Cerca solo in questa categoria (opzionale)
             
-            if query in command or query in description:
-                results.append(question)
-        
-        return results
+        Returns:
+            Lista delle domande ordinate per punteggio decrescente
+        """
+        self._sync_index_languages(category)
+        return self.index.search_ranked(query, limit, self._category_positions(category))
     
     def get_question_by_command(self, command: str) -> Optional[Dict[str, Any]]:
         """
@@ -210,10 +802,38 @@ class QuestionsLoader:
         Returns:
             Dizionario della domanda o None se non trovata
         """
-        for question in self.all_questions:
-            if question.get('command') == command:
-                return question
-        return None
+        matches = self.index.lookup_command(command)
+        return matches[0] if matches else None
+    
+    def get_command_description(self, command: str) -> str:
+        """
+        Descrizione nella lingua corrente di un comando (il comando stesso se non c'è)
+        
+        Se il comando compare in più domande vale l'ultima nell'ordine della
+        banca; viene tradotta solo quella.
+        """
+        matches = self.index.lookup_command(command)
+        if not matches:
+            return command
+        return self.get_translated_questions(matches[-1:])[0]['description']
+    
+    def get_questions_by_command(self, command: str) -> List[Dict[str, Any]]:
+        """Ottieni tutte le domande con un dato comando (anche in categorie diverse)"""
+        return list(self.index.lookup_command(command))
+    
+    def get_command_index(self) -> CommandIndex:
+        """Indice dei comandi equivalenti, costruito una volta per ogni versione della banca"""
+        if self._command_index is None:
+            self._command_index = CommandIndex(self.all_questions)
+        return self._command_index
+    
+    def get_equivalent_commands(self, command: str) -> List[str]:
+        """Comandi equivalenti a un comando, lui compreso (es. D e d$)"""
+        return self.get_command_index().equivalents(command)
+    
+    def get_confusable_commands(self, command: str) -> List[str]:
+        """Comandi equivalenti o con la stessa descrizione (es. iw e viw), da non usare come distrattori"""
+        return self.get_command_index().confusable(command)
     
     def get_statistics(self) -> Dict[str, Any]:
         """Ottieni statistiche complete sulle domande"""
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Quiz Engine - Logica del quiz indipendente dall'interfaccia grafica
+Gestisce estrazione delle domande, opzioni di risposta, punteggio ed errori
+"""
+
+import random
+import time
+from typing import Dict, List, Any, Optional
+
+from distractors import DistractorEngine, MODE_RANDOM
+
+# Numero di opzioni mostrate per ogni domanda (1 corretta + distrattori)
+DEFAULT_OPTION_COUNT = 4
+
+
+class QuizSession:
+    def __init__(self, questions_loader, option_count: int = DEFAULT_OPTION_COUNT,
+                 rng: Optional[random.Random] = None, distractor_mode: str = MODE_RANDOM,
+                 history=None, distractors: Optional[DistractorEngine] = None):
+        """
+        Inizializza una sessione di quiz
+
+        Args:
+            questions_loader: Caricatore delle domande (QuestionsLoader)
+            option_count: Numero di opzioni per domanda
+            rng: Generatore casuale (opzionale, per sessioni riproducibili)
+            distractor_mode: Modalità di scelta delle risposte sbagliate
+                             (vedi distractors.DISTRACTOR_MODES)
+            history: Storico persistente delle risposte (AnswerHistory, opzionale)
+            distractors: Generatore dei distrattori già costruito, condiviso
+                         tra più sessioni (opzionale, sostituisce distractor_mode)
+        """
+        self.questions_loader = questions_loader
+        self.option_count = option_count
+        self.rng = rng or random.Random()
+        if distractors is None:
+            distractors = DistractorEngine(questions_loader.all_questions, distractor_mode,
+                                           questions_loader.get_confusable_commands)
+        self.distractors = distractors
+        self.history = history
+        self._scheduler = None
+        self._question_started = None
+
+        self.questions = []
+        self.current_question = 0
+        self.total_questions = 0
+        self.score = 0
+        self.wrong_answers = []
+        self.current_options = []
+        self.correct_answer = ""
+        self.answered = False
+
+    def refresh_commands(self):
+        """
+        Riallinea la sessione alla banca dopo un ricaricamento
+
+        Le descrizioni dei comandi si leggono dal caricatore quando servono
+        (vedi get_description), quindi seguono già la lingua corrente.
+        """
+        if self.distractors.questions is not self.questions_loader.all_questions:
+            # La banca è stata ricaricata: si ricalcolano gli insiemi dei distrattori
+            self.distractors.build(self.questions_loader.all_questions)
+
+    def load_questions(self, limit: int, category: Optional[str] = None,
+                       difficulty: Optional[str] = None):
+        """
+        Estrae le domande della sessione e azzera il punteggio
+
+        Args:
+            limit: Numero massimo di domande
+            category: Categoria specifica (opzionale)
+            difficulty: Difficoltà specifica (opzionale)
+        """
+        seed = self.rng.getrandbits(32)
+        self.questions = self.questions_loader.get_random_questions(limit, category, difficulty, seed=seed)
+        self.total_questions = len(self.questions)
+        self.reset()
+
+    def load_review_questions(self, limit: int, category: Optional[str] = None,
+                              difficulty: Optional[str] = None):
+        """
+        Estrae le domande da ripassare secondo lo storico (ripetizione dilazionata)
+
+        Senza storico equivale a load_questions.
+        """
+        if self.history is None:
+            self.load_questions(limit, category, difficulty)
+            return
+        if self._scheduler is None:
+            # Importato qui per non caricare sqlite3 quando lo storico non si usa
+            from answer_history import ReviewScheduler
+            self._scheduler = ReviewScheduler(self.history, self.questions_loader)
+        self.questions = self._scheduler.build_session(limit, category, difficulty, rng=self.rng)
+        self.total_questions = len(self.questions)
+        self.reset()
+
+    def reset(self):
+        """Riparte dalla prima domanda con punteggio azzerato"""
+        self.current_question = 0
+        self.score = 0
+        self.wrong_answers = []
+        self.current_options = []
+        self.correct_answer = ""
+        self.answered = False
+
+    def shuffle(self):
+        """Mescola le domande e riparte da capo"""
+        self.rng.shuffle(self.questions)
+        self.reset()
+
+    def is_finished(self) -> bool:
+        """True se tutte le domande sono state presentate"""
+        return self.current_question >= self.total_questions
+
+    def get_current_question(self) -> Optional[Dict[str, Any]]:
+        """Ottieni la domanda corrente, o None se il quiz è finito"""
+        if self.is_finished():
+            return None
+        return self.questions[self.current_question]
+
+    def generate_options(self, correct_answer: str) -> List[str]:
+        """
+        Genera le opzioni di risposta: quella corretta più i distrattori
+
+        Args:
+            correct_answer: Comando corretto
+
+        Returns:
+            Opzioni mescolate
+        """
+        options = [correct_answer] + self.distractors.sample(correct_answer, self.option_count - 1, self.rng)
+        self.rng.shuffle(options)
+        return options
+
+    def prepare_question(self) -> Optional[Dict[str, Any]]:
+        """
+        Prepara la domanda corrente generando le opzioni di risposta
+
+        Returns:
+            La domanda corrente, o None se il quiz è finito
+        """
+        question = self.get_current_question()
+        if question is None:
+            return None
+        self.correct_answer = question['command']
+        self.current_options = self.generate_options(self.correct_answer)
+        self.answered = False
+        self._question_started = time.perf_counter()
+        return question
+
+    def get_description(self, command: str) -> str:
+        """Descrizione (tradotta) di un comando"""
+        return self.questions_loader.get_command_description(command)
+
+    def answer(self, selected_answer: str) -> Dict[str, Any]:
+        """
+        Valuta la risposta alla domanda corrente
+
+        Args:
+            selected_answer: Comando scelto dall'utente
+
+        Returns:
+            Dizionario con 'correct', 'correct_answer', 'selected', 'description'
+            e 'latency_ms' (tempo di risposta)
+        """
+        return self._record_answer(selected_answer, selected_answer == self.correct_answer)
+
+    def answer_typed(self, typed_answer: str) -> Dict[str, Any]:
+        """
+        Valuta un comando scritto dall'utente
+
+        Sono accettate le forme equivalenti al comando corretto: abbreviazioni
+        (:w e :write), notazioni dei tasti (<C-o> e Ctrl+o), valori al posto
+        dei segnaposto (10G per nG) e comandi con lo stesso effetto (D e d$).
+
+        Args:
+            typed_answer: Comando scritto dall'utente
+
+        Returns:
+            Come answer()
+        """
+        typed_answer = typed_answer.strip()
+        index = self.questions_loader.get_command_index()
+        return self._record_answer(typed_answer, index.matches(typed_answer, self.correct_answer))
+
+    def _record_answer(self, selected_answer: str, is_correct: bool) -> Dict[str, Any]:
+        """Aggiorna punteggio, errori e storico con una risposta già valutata"""
+        question = self.questions[self.current_question]
+        description = self.get_description(self.correct_answer)
+        latency_ms = None
+        if self._question_started is not None:
+            latency_ms = (time.perf_counter() - self._question_started) * 1000
+
+        if is_correct:
+            self.score += 1
+        else:
+            self.wrong_answers.append({
+                'question': self.current_question + 1,
+                'correct': self.correct_answer,
+                'selected': selected_answer,
+                'description': description,
+                'category': question.get('source_category', 'Unknown'),
+                'difficulty': question.get('difficulty', 'beginner')
+            })
+        self.answered = True
+
+        if self.history is not None:
+            self.history.record_answer(self.correct_answer, question.get('source_category', ''),
+                                       is_correct, latency_ms)
+
+        return {
+            'correct': is_correct,
+            'correct_answer': self.correct_answer,
+            'selected': selected_answer,
+            'description': description,
+            'latency_ms': latency_ms
+        }
+
+    def answer_option(self, option_index: int) -> Dict[str, Any]:
+        """Valuta la risposta indicata come indice nelle opzioni correnti"""
+        return self.answer(self.current_options[option_index])
+
+    def next_question(self):
+        """Passa alla domanda successiva"""
+        self.current_question += 1
+
+    def get_percentage(self) -> float:
+        """Percentuale di risposte corrette sul totale delle domande"""
+        if self.total_questions == 0:
+            return 0.0
+        return (self.score / self.total_questions) * 100
+
+    def get_results(self) -> Dict[str, Any]:
+        """Riepilogo della sessione"""
+        return {
+            'score': self.score,
+            'total': self.total_questions,
+            'percentage': self.get_percentage(),
+            'wrong_answers': list(self.wrong_answers)
+        }
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Quiz Server - Quiz VIM via HTTP/JSON per più utenti
+Server asyncio senza dipendenze esterne: caricatore e traduzioni sono caricati
+una volta e condivisi in sola lettura, ogni utente ha la propria sessione di quiz
+
+Endpoint:
+    POST   /sessions                 crea una sessione {limit, category, difficulty}
+    POST   /sessions/<id>/next       domanda corrente (o successiva, dopo una risposta)
+    POST   /sessions/<id>/answer     risponde {option: indice} oppure {answer: comando}
+    GET    /sessions/<id>/results    punteggio ed errori
+    DELETE /sessions/<id>            chiude la sessione
+    GET    /health                   stato del server
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Tuple
+
+from distractors import DISTRACTOR_MODES, MODE_RANDOM, DistractorEngine
+from i18n_manager import I18nManager
+from questions_loader import QuestionsLoader
+from quiz_engine import DEFAULT_OPTION_COUNT, QuizSession
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+
+# Limiti della memoria: sessioni tenute (le meno recenti vengono chiuse),
+# inattività massima e domande per sessione (come il selettore della GUI)
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_SESSION_TTL = 1800.0
+DEFAULT_QUESTION_LIMIT = 20
+MAX_QUESTION_LIMIT = 100
+
+# Limiti delle richieste HTTP
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+
+# Una risposta: (stato HTTP, dati JSON)
+Response = Tuple[int, Optional[Dict[str, Any]]]
+
+
+class SessionStore:
+    """
+    Sessioni di quiz per ID, con numero massimo e scadenza per inattività
+
+    Le sessioni sono in ordine di ultimo accesso: oltre il massimo si chiude
+    quella usata meno di recente, così la memoria resta limitata.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, ttl: float = DEFAULT_SESSION_TTL):
+        """
+        Args:
+            max_sessions: Numero massimo di sessioni aperte
+            ttl: Secondi di inattività dopo i quali una sessione scade
+        """
+        self.max_sessions = max(1, max_sessions)
+        self.ttl = ttl
+        # ID -> (sessione, ultimo accesso)
+        self._sessions = OrderedDict()
+        self.evicted = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def add(self, session: QuizSession) -> str:
+        """Registra una sessione e restituisce il suo ID"""
+        session_id = secrets.token_urlsafe(16)
+        self._sessions[session_id] = (session, time.monotonic())
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        return session_id
+
+    def get(self, session_id: str) -> Optional[QuizSession]:
+        """Sessione di un ID, o None se non esiste o è scaduta"""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        session, last_access = entry
+        now = time.monotonic()
+        if now - last_access > self.ttl:
+            del self._sessions[session_id]
+            self.expired += 1
+            return None
+        self._sessions[session_id] = (session, now)
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        """Chiude una sessione; True se esisteva"""
+        return self._sessions.pop(session_id, None) is not None
+
+    def expire(self) -> int:
+        """
+        Chiude le sessioni scadute
+
+        Returns:
+            Numero di sessioni chiuse
+        """
+        deadline = time.monotonic() - self.ttl
+        count = 0
+        # Le meno recenti sono in testa: ci si ferma alla prima ancora valida
+        while self._sessions:
+            session_id, (_, last_access) = next(iter(self._sessions.items()))
+            if last_access > deadline:
+                break
+            del self._sessions[session_id]
+            count += 1
+        self.expired += count
+        return count
+
+
+class QuizServer:
+    """
+    Logica degli endpoint e server HTTP
+
+    Caricatore, traduzioni, generatore dei distrattori e indice dei comandi
+    equivalenti sono condivisi da tutte le sessioni e non vengono modificati
+    dopo l'avvio (le descrizioni si leggono dal caricatore quando servono);
+    ogni sessione tiene solo le proprie domande e il punteggio.
+    Tutto gira nel ciclo di eventi asyncio, senza lock.
+    """
+
+    def __init__(self, questions_loader: QuestionsLoader, i18n_manager: Optional[I18nManager] = None,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS, session_ttl: float = DEFAULT_SESSION_TTL,
+                 option_count: int = DEFAULT_OPTION_COUNT, distractor_mode: str = MODE_RANDOM):
+        """
+        Args:
+            questions_loader: Caricatore delle domande già costruito
+            i18n_manager: Gestore delle traduzioni (con la lingua già impostata)
+            max_sessions: Numero massimo di sessioni aperte
+            session_ttl: Secondi di inattività dopo i quali una sessione scade
+            option_count: Numero di opzioni per domanda
+            distractor_mode: Modalità di scelta dei distrattori
+        """
+        self.questions_loader = questions_loader
+        self.i18n_manager = i18n_manager
+        self.option_count = option_count
+        self.sessions = SessionStore(max_sessions, session_ttl)
+        self.distractors = DistractorEngine(questions_loader.all_questions, distractor_mode,
+                                            questions_loader.get_confusable_commands)
+        # Indice dei comandi equivalenti per le risposte scritte, costruito subito
+        questions_loader.get_command_index()
+        # Un solo generatore casuale: le sessioni non girano in parallelo
+        self.rng = random.Random()
+        self.categories = set(questions_loader.get_categories())
+        self.difficulties = set(questions_loader.get_difficulties())
+        self.requests = 0
+        self._server = None
+        self._expiry_task = None
+
+    # --- Endpoint ---------------------------------------------------------
+
+    def handle(self, method: str, path: str, data: Dict[str, Any]) -> Response:
+        """
+        Esegue una richiesta già decodificata
+
+        Args:
+            method: Metodo HTTP
+            path: Percorso (senza query string)
+            data: Corpo JSON della richiesta (dizionario vuoto se assente)
+
+        Returns:
+            (stato HTTP, dati della risposta)
+        """
+        self.requests += 1
+        parts = [part for part in path.split('/') if part]
+        if parts == ['health']:
+            if method != 'GET':
+                return _error(HTTPStatus.METHOD_NOT_ALLOWED, "Use GET")
+            return HTTPStatus.OK, {'status': 'ok', 'sessions': len(self.sessions),
+                                   'questions': len(self.questions_loader.all_questions),
+                                   'language': self._language(), 'requests': self.requests,
+                                   'evicted': self.sessions.evicted, 'expired': self.sessions.expired}
+        if not parts or parts[0] != 'sessions' or len(parts) > 3:
+            return _error(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+
+        if len(parts) == 1:
+            if method != 'POST':
+                return _error(HTTPStatus.METHOD_NOT_ALLOWED, "Use POST")
+            return self.create_session(data)
+
+        session_id = parts[1]
+        session = self.sessions.get(session_id)
+        if session is None:
+            return _error(HTTPStatus.NOT_FOUND, "Unknown or expired session")
+
+        action = parts[2] if len(parts) == 3 else None
+        routes = {
+            (None, 'DELETE'): lambda: self.delete_session(session_id),
+            ('next', 'POST'): lambda: self.next_question(session),
+            ('answer', 'POST'): lambda: self.answer(session, data),
+            ('results', 'GET'): lambda: self.results(session),
+        }
+        route = routes.get((action, method))
+        if route is None:
+            if any(key[0] == action for key in routes):
+                return _error(HTTPStatus.METHOD_NOT_ALLOWED, "Method not allowed")
+            return _error(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+        return route()
+
+    def create_session(self, data: Dict[str, Any]) -> Response:
+        """Crea una sessione con domande estratte dalla banca condivisa"""
+        limit = data.get('limit', DEFAULT_QUESTION_LIMIT)
+        category = data.get('category') or None
+        difficulty = data.get('difficulty') or None
+        if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= MAX_QUESTION_LIMIT:
+            return _error(HTTPStatus.BAD_REQUEST, f"limit must be between 1 and {MAX_QUESTION_LIMIT}")
+        if not isinstance(category, (str, type(None))) or not isinstance(difficulty, (str, type(None))):
+            return _error(HTTPStatus.BAD_REQUEST, "category and difficulty must be strings")
+        if category is not None and category not in self.categories:
+            return _error(HTTPStatus.BAD_REQUEST, "Unknown category")
+        if difficulty is not None and difficulty not in self.difficulties:
+            return _error(HTTPStatus.BAD_REQUEST, "Unknown difficulty")
+
+        session = QuizSession(self.questions_loader, self.option_count, rng=self.rng,
+                              distractors=self.distractors)
+        session.load_questions(limit, category, difficulty)
+        session_id = self.sessions.add(session)
+        return HTTPStatus.CREATED, {'session': session_id, 'total': session.total_questions}
+
+    def delete_session(self, session_id: str) -> Response:
+        self.sessions.remove(session_id)
+        return HTTPStatus.OK, {'deleted': True}
+
+    def next_question(self, session: QuizSession) -> Response:
+        """
+        Domanda da mostrare
+
+        Finché la domanda corrente non ha risposta viene restituita di nuovo
+        (la richiesta si può ripetere); dopo una risposta si passa alla successiva.
+        """
+        if session.answered and not session.is_finished():
+            session.next_question()
+            question = session.prepare_question()
+        elif session.current_options and not session.answered:
+            question = session.get_current_question()
+        else:
+            question = session.prepare_question()
+        if question is None:
+            return HTTPStatus.OK, {'finished': True, 'results': session.get_results()}
+        return HTTPStatus.OK, {
+            'finished': False,
+            'question': {
+                'index': session.current_question + 1,
+                'total': session.total_questions,
+                'description': question.get('description', ''),
+                'category': question.get('source_category', ''),
+                'difficulty': question.get('difficulty', ''),
+                'options': list(session.current_options),
+            },
+        }
+
+    def answer(self, session: QuizSession, data: Dict[str, Any]) -> Response:
+        """Valuta la risposta alla domanda corrente"""
+        if session.is_finished() or not session.current_options:
+            return _error(HTTPStatus.CONFLICT, "No question to answer: request the next question first")
+        if session.answered:
+            return _error(HTTPStatus.CONFLICT, "Question already answered")
+
+        option = data.get('option')
+        if option is not None:
+            if not isinstance(option, int) or isinstance(option, bool) or \
+                    not 0 <= option < len(session.current_options):
+                return _error(HTTPStatus.BAD_REQUEST, "Invalid option index")
+            result = session.answer_option(option)
+        elif isinstance(data.get('answer'), str):
+            result = session.answer_typed(data['answer'])
+        else:
+            return _error(HTTPStatus.BAD_REQUEST, "Send 'option' (index) or 'answer' (command)")
+
+        result = dict(result)
+        result['score'] = session.score
+        result['finished'] = session.current_question + 1 >= session.total_questions
+        return HTTPStatus.OK, result
+
+    def results(self, session: QuizSession) -> Response:
+        results = session.get_results()
+        results['answered'] = min(session.current_question + (1 if session.answered else 0),
+                                  session.total_questions)
+        results['finished'] = results['answered'] >= session.total_questions
+        return HTTPStatus.OK, results
+
+    def _language(self) -> Optional[str]:
+        return self.i18n_manager.get_current_language() if self.i18n_manager else None
+
+    # --- HTTP -------------------------------------------------------------
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """Apre il socket e avvia la pulizia periodica delle sessioni scadute"""
+        self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                  limit=MAX_HEADER_BYTES)
+        self._expiry_task = asyncio.ensure_future(self._expire_sessions())
+        return self._server
+
+    async def stop(self):
+        if self._expiry_task is not None:
+            self._expiry_task.cancel()
+            self._expiry_task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _expire_sessions(self):
+        interval = max(1.0, min(60.0, self.sessions.ttl / 4))
+        while True:
+            await asyncio.sleep(interval)
+            self.sessions.expire()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve le richieste di una connessione (HTTP/1.1 con keep-alive)"""
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except asyncio.LimitOverrunError:
+                    await _write_response(writer, *_error(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                                          "Headers too large"), keep_alive=False)
+                    break
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+
+                try:
+                    method, path, version, headers = _parse_head(head)
+                except ValueError:
+                    await _write_response(writer, *_error(HTTPStatus.BAD_REQUEST, "Malformed request"),
+                                          keep_alive=False)
+                    break
+                keep_alive = _keep_alive(version, headers)
+
+                try:
+                    length = int(headers.get('content-length', '0'))
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY_BYTES:
+                    await _write_response(writer, *_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                                          "Invalid or too large body"), keep_alive=False)
+                    break
+                # Anche il corpo ha un limite di tempo: un client lento non tiene aperta la connessione
+                body = await asyncio.wait_for(reader.readexactly(length), KEEP_ALIVE_TIMEOUT) if length else b''
+
+                status, payload = self._dispatch(method, path, body)
+                await _write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, method: str, path: str, body: bytes) -> Response:
+        """Decodifica il corpo JSON ed esegue la richiesta, convertendo gli errori in risposte"""
+        data = {}
+        if body:
+            try:
+                data = json.loads(body)
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                return _error(HTTPStatus.BAD_REQUEST, "Invalid JSON body")
+            if not isinstance(data, dict):
+                return _error(HTTPStatus.BAD_REQUEST, "JSON body must be an object")
+        try:
+            return self.handle(method, path.split('?', 1)[0], data)
+        except Exception as e:
+            print(f"Errore nella richiesta {method} {path}: {e}")
+            return _error(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal error")
+
+
+def _error(status: HTTPStatus, message: str) -> Response:
+    return status, {'error': message}
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+    """Riga di richiesta e intestazioni (nomi in minuscolo)"""
+    lines = head.decode('latin-1').split('\r\n')
+    method, path, version = lines[0].split(' ')
+    if not version.startswith('HTTP/'):
+        raise ValueError(version)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return method.upper(), path, version, headers
+
+
+def _keep_alive(version: str, headers: Dict[str, str]) -> bool:
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.0':
+        return connection == 'keep-alive'
+    return connection != 'close'
+
+
+async def _write_response(writer: asyncio.StreamWriter, status: int,
+                          payload: Optional[Dict[str, Any]], keep_alive: bool):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8') if payload is not None else b''
+    status = HTTPStatus(status)
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+async def serve(server: QuizServer, host: str, port: int):
+    await server.start(host, port)
+    print(f"VIM QUIZ server in ascolto su http://{host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Server HTTP/JSON del quiz VIM")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Indirizzo di ascolto")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Porta di ascolto")
+    parser.add_argument('--language', default='en', help="Lingua delle domande")
+    parser.add_argument('--questions-dir', default='questions', help="Directory delle domande")
+    parser.add_argument('--locales-dir', default='locales', help="Directory delle traduzioni")
+    parser.add_argument('--max-sessions', type=int, default=DEFAULT_MAX_SESSIONS,
+                        help="Sessioni aperte al massimo (le meno recenti vengono chiuse)")
+    parser.add_argument('--session-ttl', type=float, default=DEFAULT_SESSION_TTL,
+                        help="Secondi di inattività dopo i quali una sessione scade")
+    parser.add_argument('--distractor-mode', choices=DISTRACTOR_MODES, default=MODE_RANDOM,
+                        help="Modalità di scelta dei distrattori")
+    args = parser.parse_args()
+
+    # Caricati una volta: le sessioni li condividono in sola lettura
+    i18n = I18nManager(args.locales_dir)
+    if not i18n.set_language(args.language):
+        parser.error(f"Lingua non disponibile: {args.language}")
+    loader = QuestionsLoader(args.questions_dir, i18n_manager=i18n)
+    server = QuizServer(loader, i18n, args.max_sessions, args.session_ttl,
+                        distractor_mode=args.distractor_mode)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
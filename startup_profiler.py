@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler - Misura dei tempi delle fasi di avvio
+Registra la durata di ogni fase e stampa un riepilogo con --profile-startup
+"""
+
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO, Tuple
+
+# Opzione da riga di comando che attiva il profilo di avvio
+PROFILE_STARTUP_FLAG = '--profile-startup'
+
+
+class StartupProfiler:
+    def __init__(self, enabled: bool = False, start: Optional[float] = None):
+        """
+        Inizializza il profilo di avvio
+
+        Args:
+            enabled: Se False le misure non vengono registrate né stampate
+            start: Istante iniziale (time.perf_counter), predefinito: adesso
+        """
+        self.enabled = enabled
+        self.start = start if start is not None else time.perf_counter()
+        self.phases = []
+        self._last = self.start
+        self._lock = threading.Lock()
+        self._reported = False
+
+    @classmethod
+    def from_argv(cls, argv: List[str], start: Optional[float] = None) -> Tuple['StartupProfiler', List[str]]:
+        """
+        Crea il profilo in base alla riga di comando
+
+        Returns:
+            Coppia (profilo, argomenti senza l'opzione del profilo), così
+            l'opzione non arriva a QApplication
+        """
+        enabled = PROFILE_STARTUP_FLAG in argv
+        remaining = [arg for arg in argv if arg != PROFILE_STARTUP_FLAG]
+        return cls(enabled, start), remaining
+
+    def mark(self, phase: str):
+        """
+        Chiude una fase: la sua durata è il tempo trascorso dalla fase precedente
+
+        Può essere chiamato anche da thread diversi da quello principale.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.perf_counter()
+            thread = threading.current_thread().name
+            self.phases.append((phase, (now - self._last) * 1000, (now - self.start) * 1000, thread))
+            self._last = now
+
+    def report(self, stream: Optional[TextIO] = None):
+        """Stampa il riepilogo delle fasi (una sola volta)"""
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        stream = stream or sys.stderr
+        print("Profilo di avvio (ms):", file=stream)
+        print(f"  {'fase':<24} {'durata':>9} {'totale':>9}  thread", file=stream)
+        for phase, duration, elapsed, thread in self.phases:
+            print(f"  {phase:<24} {duration:>9.1f} {elapsed:>9.1f}  {thread}", file=stream)
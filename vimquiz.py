@@ -4,69 +4,174 @@ VIM QUIZ - Quiz interattivo per imparare i comandi Vim
 Versione con GUI Qt6 e sistema modulare delle domande
 """
 
+import time
+
+# Istante di avvio del processo, prima di importare Qt (per --profile-startup)
+_PROCESS_START = time.perf_counter()
+
 import sys
-import random
-import os
+import threading
+from collections import deque
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QRadioButton, 
                              QButtonGroup, QProgressBar, QTextEdit, QGroupBox,
-                             QMessageBox, QMenuBar, QStatusBar, QSplitter,
-                             QComboBox, QCheckBox, QSpinBox)
+                             QMessageBox, QStatusBar, QSplitter,
+                             QComboBox, QCheckBox, QSpinBox, QLineEdit)
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QFont, QPalette, QColor
 
-# Importa il caricatore delle domande e il sistema i18n
-from questions_loader import QuestionsLoader
+# Il sistema i18n serve subito per i testi della finestra; caricatore delle
+# domande, sessione e storico sono importati nel thread di caricamento
 from i18n_manager import I18nManager
+from quiz_engine import DEFAULT_OPTION_COUNT
+from startup_profiler import StartupProfiler
+
+# Numero di tempi di visualizzazione delle domande conservati per le statistiche
+RENDER_LATENCY_SAMPLES = 200
 
 class VimQuizApp(QMainWindow):
-    def __init__(self):
+    # Emesso dal thread di caricamento: (caricatore, sessione, errore)
+    questions_ready = pyqtSignal(object, object, object)
+    
+    def __init__(self, profiler: StartupProfiler = None, history_path: str = None):
+        """
+        Args:
+            profiler: Profilo delle fasi di avvio (opzionale)
+            history_path: Database dello storico delle risposte (predefinito:
+                          ~/.vimquiz/answer_history.db)
+        """
         super().__init__()
+        self.profiler = profiler or StartupProfiler()
+        self.history_path = history_path
         
-        # Inizializza il sistema i18n
-        try:
-            self.i18n = I18nManager()
-            # Forza l'inglese come lingua predefinita all'avvio
-            self.i18n.set_language("en")
-        except Exception as e:
-            print(f"Error initializing i18n: {e}")
-            # Fallback all'inglese
-            self.i18n = I18nManager()
+        # Inizializza il sistema i18n: il costruttore carica già la lingua
+        # predefinita (inglese), le altre vengono precaricate dopo la prima visualizzazione
+        self.i18n = I18nManager()
+        self.profiler.mark("i18n")
         
         # Imposta il titolo della finestra
         self.setWindowTitle(self.i18n.get_text("app.title"))
         self.setGeometry(100, 100, 1000, 700)
         
-        # Inizializza il caricatore delle domande
-        try:
-            self.questions_loader = QuestionsLoader(i18n_manager=self.i18n)
-            self.vim_commands = self._build_commands_dict()
-        except Exception as e:
-            QMessageBox.critical(self, self.i18n.get_text("errors.load_questions", error=str(e)), 
-                               self.i18n.get_text("errors.load_questions", error=str(e)))
-            sys.exit(1)
+        # Caricatore e sessione arrivano dal thread di caricamento (start_loading)
+        self.questions_loader = None
+        self.session = None
+        self._loader_thread = None
+        # Ricaricamento a caldo dei file cambiati, attivo dopo il caricamento
+        self.source_watcher = None
+        self.questions_ready.connect(self._on_questions_ready)
         
         # Variabili del quiz
-        self.current_question = 0
-        self.total_questions = 0
-        self.score = 0
-        self.wrong_answers = []
-        self.questions = []
-        self.current_options = []
-        self.correct_answer = ""
         self.selected_category = self.i18n.get_text("quiz.all_categories")
         self.selected_difficulty = self.i18n.get_text("quiz.all_difficulties")
         self.question_limit = 20
+        # Tempi di visualizzazione delle ultime domande (ms)
+        self.render_latencies = deque(maxlen=RENDER_LATENCY_SAMPLES)
         
         self.init_ui()
+        self._set_quiz_controls_enabled(False)
+        self.status_bar.showMessage(self.i18n.get_text("ui.status_loading"))
+        self.profiler.mark("window")
+    
+    def start_loading(self):
+        """
+        Avvia il caricamento della banca delle domande in un thread separato
+        
+        Va chiamato dopo aver mostrato la finestra: il risultato arriva nel
+        thread dell'interfaccia tramite il segnale questions_ready.
+        """
+        if self._loader_thread is not None:
+            return
+        self._loader_thread = threading.Thread(target=self._load_bank, name="questions-loader", daemon=True)
+        self._loader_thread.start()
+    
+    def _load_bank(self):
+        """Costruisce caricatore, sessione e storico (eseguito nel thread di caricamento)"""
+        try:
+            from questions_loader import QuestionsLoader
+            from quiz_engine import QuizSession
+            
+            loader = QuestionsLoader(i18n_manager=self.i18n)
+            # Comandi equivalenti (distrattori e risposte scritte): costruiti qui,
+            # non alla prima domanda nel thread grafico
+            loader.get_command_index()
+            self.profiler.mark("questions_loader")
+            # Sessione di quiz: contiene stato e logica, la finestra la pilota
+            session = QuizSession(loader, history=self._open_history())
+            self.profiler.mark("quiz_session")
+        except Exception as e:
+            self.questions_ready.emit(None, None, e)
+            return
+        self.questions_ready.emit(loader, session, None)
+    
+    def _on_questions_ready(self, loader, session, error):
+        """Completa l'avvio quando la banca delle domande è pronta"""
+        if error is not None:
+            QMessageBox.critical(self, self.i18n.get_text("errors.load_questions", error=str(error)), 
+                               self.i18n.get_text("errors.load_questions", error=str(error)))
+            QApplication.exit(1)
+            return
+        
+        self.questions_loader = loader
+        self.session = session
+        self.populate_filters()
+        self.review_checkbox.setEnabled(session.history is not None)
+        self._set_quiz_controls_enabled(True)
         self.setup_quiz()
+        self.status_bar.showMessage(self.i18n.get_text("ui.status_ready"))
+        self.profiler.mark("first_question")
+        self._start_source_watcher()
+        
+        # Le altre lingue si caricano in background, pronte per il cambio lingua
+        self.i18n.preload_languages()
+        self.profiler.report()
+    
+    def _start_source_watcher(self):
+        """Osserva domande e traduzioni e applica le modifiche senza riavviare"""
+        from qt_file_watcher import QtSourceWatcher
+        
+        self.source_watcher = QtSourceWatcher(self.questions_loader, self.i18n, self)
+        self.source_watcher.questions_changed.connect(self.on_questions_file_changed)
+        self.source_watcher.translations_changed.connect(self.on_translations_file_changed)
+    
+    def on_questions_file_changed(self, filename):
+        """Aggiorna filtri e comandi dopo il ricaricamento di un file della banca"""
+        # Le domande del quiz in corso restano quelle già estratte
+        self.session.refresh_commands()
+        self.repopulate_filters()
+        self.status_bar.showMessage(self.i18n.get_text("ui.status_file_reloaded", file=filename))
+    
+    def on_translations_file_changed(self, language, filename):
+        """Aggiorna i testi dopo il ricaricamento di un file di traduzione"""
+        if language != self.i18n.get_current_language():
+            return
+        self.session.questions = self.questions_loader.retranslate_questions(self.session.questions)
+        self.session.refresh_commands()
+        if self.session.questions and not self.session.is_finished():
+            self.load_question()
+        self.refresh_ui_texts()
+        self.status_bar.showMessage(self.i18n.get_text("ui.status_file_reloaded", 
+                                                       file=f"{language}/{filename}"))
     
-    def _build_commands_dict(self):
-        """Costruisce il dizionario dei comandi dal caricatore delle domande"""
-        commands = {}
-        for question in self.questions_loader.get_all_questions():
-            commands[question['command']] = question['description']
-        return commands
+    def _set_quiz_controls_enabled(self, enabled: bool):
+        """Abilita o disabilita i controlli che richiedono la banca delle domande"""
+        # Anche la lingua: il thread di caricamento legge le traduzioni dall'i18n
+        for widget in (self.category_combo, self.difficulty_combo, self.update_quiz_button,
+                       self.restart_button, self.shuffle_button, self.language_combo):
+            widget.setEnabled(enabled)
+        for action in self.quiz_actions:
+            action.setEnabled(enabled)
+    
+    def _open_history(self):
+        """Apre lo storico persistente delle risposte (None se non disponibile)"""
+        # Importato qui come i moduli di _load_bank: l'avvio della finestra non lo attende
+        from answer_history import AnswerHistory, DEFAULT_HISTORY_PATH
+        
+        try:
+            return AnswerHistory(self.history_path or DEFAULT_HISTORY_PATH)
+        except Exception as e:
+            print(f"Error opening answer history: {e}")
+            return None
         
     def init_ui(self):
         """Inizializza l'interfaccia utente"""
@@ -118,8 +223,6 @@ class VimQuizApp(QMainWindow):
         filter_row.addWidget(self.category_label)
         self.category_combo = QComboBox()
         self.category_combo.addItem(self.i18n.get_text("quiz.all_categories"))
-        for category in self.questions_loader.get_categories():
-            self.category_combo.addItem(category)
         self.category_combo.currentTextChanged.connect(self.on_category_changed)
         filter_row.addWidget(self.category_combo)
         
@@ -128,9 +231,6 @@ class VimQuizApp(QMainWindow):
         filter_row.addWidget(self.difficulty_label)
         self.difficulty_combo = QComboBox()
         self.difficulty_combo.addItem(self.i18n.get_text("quiz.all_difficulties"))
-        for difficulty in self.questions_loader.get_difficulties():
-            translated_difficulty = self.i18n.get_text(f"questions.difficulties.{difficulty}")
-            self.difficulty_combo.addItem(translated_difficulty, difficulty)
         self.difficulty_combo.currentTextChanged.connect(self.on_difficulty_changed)
         filter_row.addWidget(self.difficulty_combo)
         
@@ -144,6 +244,16 @@ class VimQuizApp(QMainWindow):
         self.question_limit_spin.valueChanged.connect(self.on_limit_changed)
         filter_row.addWidget(self.question_limit_spin)
         
+        # Ripasso dilazionato basato sullo storico delle risposte
+        self.review_checkbox = QCheckBox(self.i18n.get_text("quiz.review_mode"))
+        self.review_checkbox.setEnabled(False)
+        filter_row.addWidget(self.review_checkbox)
+        
+        # Risposta scritta invece della scelta tra le opzioni
+        self.typed_checkbox = QCheckBox(self.i18n.get_text("quiz.typed_mode"))
+        self.typed_checkbox.toggled.connect(self.on_typed_mode_toggled)
+        filter_row.addWidget(self.typed_checkbox)
+        
         # Pulsante aggiorna
         self.update_quiz_button = QPushButton(self.i18n.get_text("quiz.update_quiz_button"))
         self.update_quiz_button.clicked.connect(self.update_quiz_settings)
@@ -163,11 +273,42 @@ class VimQuizApp(QMainWindow):
         self.description_label.setFont(QFont("Arial", 11))
         self.description_label.setStyleSheet("QLabel { background-color: #f0f0f0; padding: 10px; border-radius: 5px; }")
         
-        self.options_group = QButtonGroup()
+        # Opzioni di risposta: un insieme fisso di radio button riutilizzati a
+        # ogni domanda, cambiando solo testo e stato
+        self.options_group = QButtonGroup(self)
         self.options_layout = QVBoxLayout()
+        self.option_font = QFont("Courier", 10)
+        self.option_font_bold = QFont(self.option_font)
+        self.option_font_bold.setBold(True)
+        self.option_buttons = []
+        for i in range(DEFAULT_OPTION_COUNT):
+            radio = QRadioButton()
+            radio.setFont(self.option_font)
+            self.options_group.addButton(radio, i)
+            self.options_layout.addWidget(radio)
+            self.option_buttons.append(radio)
+        
+        # Palette precalcolate per evidenziare le risposte senza fogli di stile
+        self.default_option_palette = QPalette(self.option_buttons[0].palette())
+        self.correct_option_palette = self._make_option_palette(QColor("green"))
+        self.wrong_option_palette = self._make_option_palette(QColor("red"))
+        self.highlighted_buttons = []
+        
+        # Campo per la risposta scritta (visibile solo in quella modalità)
+        self.typed_answer_edit = QLineEdit()
+        self.typed_answer_edit.setFont(self.option_font)
+        self.typed_answer_edit.setPlaceholderText(self.i18n.get_text("quiz.typed_placeholder"))
+        self.typed_answer_edit.returnPressed.connect(self.check_answer)
+        self.typed_answer_edit.setVisible(False)
+        self.default_typed_palette = QPalette(self.typed_answer_edit.palette())
+        self.correct_typed_palette = QPalette(self.default_typed_palette)
+        self.correct_typed_palette.setColor(QPalette.ColorRole.Text, QColor("green"))
+        self.wrong_typed_palette = QPalette(self.default_typed_palette)
+        self.wrong_typed_palette.setColor(QPalette.ColorRole.Text, QColor("red"))
         
         question_layout.addWidget(self.description_label)
         question_layout.addLayout(self.options_layout)
+        question_layout.addWidget(self.typed_answer_edit)
         
         # Pannello inferiore - Controlli
         self.controls_group = QGroupBox(self.i18n.get_text("ui.controls_group"))
@@ -221,9 +362,67 @@ class VimQuizApp(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage(self.i18n.get_text("ui.status_ready"))
         
+    def populate_filters(self):
+        """Riempie i filtri di categoria e difficoltà con i valori della banca"""
+        # Il primo elemento ("Tutte") resta, si aggiungono i valori della banca
+        for category in self.questions_loader.get_categories():
+            self.category_combo.addItem(category)
+        for difficulty in self.questions_loader.get_difficulties():
+            translated_difficulty = self.i18n.get_text(f"questions.difficulties.{difficulty}")
+            self.difficulty_combo.addItem(translated_difficulty, difficulty)
+    
+    def repopulate_filters(self):
+        """Rigenera i filtri dopo un cambio della banca, mantenendo la selezione se esiste ancora"""
+        category = self.category_combo.currentText()
+        difficulty = self.difficulty_combo.currentData()
+        for combo in (self.category_combo, self.difficulty_combo):
+            combo.blockSignals(True)
+            while combo.count() > 1:
+                combo.removeItem(combo.count() - 1)
+        self.populate_filters()
+        category_index = self.category_combo.findText(category)
+        difficulty_index = self.difficulty_combo.findData(difficulty) if difficulty else -1
+        self.category_combo.setCurrentIndex(max(category_index, 0))
+        self.difficulty_combo.setCurrentIndex(max(difficulty_index, 0))
+        for combo in (self.category_combo, self.difficulty_combo):
+            combo.blockSignals(False)
+        # La selezione scomparsa torna a "Tutte"
+        if category_index < 0:
+            self.selected_category = self.i18n.get_text("quiz.all_categories")
+        if difficulty and difficulty_index < 0:
+            self.selected_difficulty = self.i18n.get_text("quiz.all_difficulties")
+    
+    def _make_option_palette(self, color):
+        """Crea una palette per le opzioni con il colore del testo indicato"""
+        palette = QPalette(self.default_option_palette)
+        palette.setColor(QPalette.ColorRole.WindowText, color)
+        palette.setColor(QPalette.ColorRole.ButtonText, color)
+        return palette
+    
+    def _reset_option_buttons(self):
+        """Riporta le opzioni allo stato iniziale (nessuna selezione o evidenziazione)"""
+        for radio in self.highlighted_buttons:
+            radio.setPalette(self.default_option_palette)
+            radio.setFont(self.option_font)
+        self.highlighted_buttons = []
+        
+        # Con un gruppo esclusivo non è possibile deselezionare il pulsante attivo
+        self.options_group.setExclusive(False)
+        for radio in self.option_buttons:
+            radio.setChecked(False)
+        self.options_group.setExclusive(True)
+    
+    def _highlight_option(self, radio, palette):
+        """Evidenzia un'opzione con una palette precalcolata e il font in grassetto"""
+        radio.setPalette(palette)
+        radio.setFont(self.option_font_bold)
+        self.highlighted_buttons.append(radio)
+    
     def create_menu_bar(self):
         """Crea la barra del menu"""
         menubar = self.menuBar()
+        # Il menu viene ricreato al cambio lingua: si rimuove quello precedente
+        menubar.clear()
         
         # Menu Quiz
         quiz_menu = menubar.addMenu(self.i18n.get_text("menu.quiz"))
@@ -242,6 +441,11 @@ class VimQuizApp(QMainWindow):
         stats_action = quiz_menu.addAction(self.i18n.get_text("menu.statistics"))
         stats_action.triggered.connect(self.show_statistics)
         
+        # Azioni disponibili solo dopo il caricamento della banca delle domande
+        self.quiz_actions = [new_quiz_action, shuffle_action, update_action, stats_action]
+        for action in self.quiz_actions:
+            action.setEnabled(self.session is not None)
+        
         quiz_menu.addSeparator()
         
         exit_action = quiz_menu.addAction(self.i18n.get_text("menu.exit"))
@@ -252,13 +456,12 @@ class VimQuizApp(QMainWindow):
         
         about_action = help_menu.addAction(self.i18n.get_text("menu.about"))
         about_action.triggered.connect(self.show_about)
+        about_action.setEnabled(self.session is not None)
+        self.quiz_actions.append(about_action)
         
     def setup_quiz(self):
         """Configura il quiz iniziale"""
         self.load_questions()
-        self.current_question = 0
-        self.score = 0
-        self.wrong_answers = []
         
         self.update_ui()
         self.load_question()
@@ -268,27 +471,11 @@ class VimQuizApp(QMainWindow):
         category = self.selected_category if self.selected_category != self.i18n.get_text("quiz.all_categories") else None
         difficulty = self.selected_difficulty if self.selected_difficulty != self.i18n.get_text("quiz.all_difficulties") else None
         
-        # Ottieni le domande filtrate
-        if category and difficulty:
-            # Filtra per entrambi
-            category_questions = self.questions_loader.get_questions_by_category(category)
-            self.questions = [q for q in category_questions if q.get('difficulty', 'beginner') == difficulty]
-        elif category:
-            self.questions = self.questions_loader.get_questions_by_category(category)
-        elif difficulty:
-            self.questions = self.questions_loader.get_questions_by_difficulty(difficulty)
+        # Estrai direttamente il numero di domande richiesto (già in ordine casuale)
+        if self.review_checkbox.isChecked():
+            self.session.load_review_questions(self.question_limit, category, difficulty)
         else:
-            self.questions = self.questions_loader.get_all_questions()
-        
-        # Limita il numero di domande
-        if len(self.questions) > self.question_limit:
-            random.shuffle(self.questions)
-            self.questions = self.questions[:self.question_limit]
-        
-        self.total_questions = len(self.questions)
-        
-        # Mescola le domande
-        random.shuffle(self.questions)
+            self.session.load_questions(self.question_limit, category, difficulty)
     
     def on_language_changed(self, text):
         """Gestisce il cambio di lingua"""
@@ -310,14 +497,19 @@ class VimQuizApp(QMainWindow):
                 self.selected_difficulty == "Alle"):
                 self.selected_difficulty = self.i18n.get_text("quiz.all_difficulties")
             
-            # Ricarica le domande con le nuove traduzioni
-            self.load_questions()
+            # Prima del caricamento della banca si aggiornano solo i testi
+            if self.session is None:
+                self.refresh_ui_texts()
+                return
+            
+            # Traduci le domande della sessione mantenendo i progressi
+            self.session.questions = self.questions_loader.retranslate_questions(self.session.questions)
             
             # Aggiorna il dizionario dei comandi con le nuove traduzioni
-            self.vim_commands = self._build_commands_dict()
+            self.session.refresh_commands()
             
             # Ricarica la domanda corrente se il quiz è in corso
-            if self.questions:
+            if self.session.questions:
                 self.load_question()
             
             self.refresh_ui_texts()
@@ -355,10 +547,11 @@ class VimQuizApp(QMainWindow):
         self.results_group.setTitle(self.i18n.get_text("ui.results_group"))
         
         # Aggiorna le etichette
-        self.question_label.setText(self.i18n.get_text("quiz.question_label", 
-                                                      current=self.current_question + 1, 
-                                                      total=self.total_questions))
-        self.score_label.setText(self.i18n.get_text("quiz.score_label", score=self.score))
+        if self.session is not None:
+            self.question_label.setText(self.i18n.get_text("quiz.question_label", 
+                                                          current=self.session.current_question + 1, 
+                                                          total=self.session.total_questions))
+            self.score_label.setText(self.i18n.get_text("quiz.score_label", score=self.session.score))
         
         # Aggiorna i pulsanti
         self.answer_button.setText(self.i18n.get_text("quiz.answer_button"))
@@ -372,13 +565,17 @@ class VimQuizApp(QMainWindow):
         self.category_label.setText(self.i18n.get_text("quiz.category_label"))
         self.difficulty_label.setText(self.i18n.get_text("quiz.difficulty_label"))
         self.questions_label.setText(self.i18n.get_text("quiz.questions_label"))
+        self.review_checkbox.setText(self.i18n.get_text("quiz.review_mode"))
+        self.typed_checkbox.setText(self.i18n.get_text("quiz.typed_mode"))
+        self.typed_answer_edit.setPlaceholderText(self.i18n.get_text("quiz.typed_placeholder"))
         
         # Aggiorna i combo box
         self.category_combo.setItemText(0, self.i18n.get_text("quiz.all_categories"))
         self.difficulty_combo.setItemText(0, self.i18n.get_text("quiz.all_difficulties"))
         
         # Aggiorna le difficoltà tradotte
-        for i, difficulty in enumerate(self.questions_loader.get_difficulties(), 1):
+        for i in range(1, self.difficulty_combo.count()):
+            difficulty = self.difficulty_combo.itemData(i)
             translated_difficulty = self.i18n.get_text(f"questions.difficulties.{difficulty}")
             self.difficulty_combo.setItemText(i, translated_difficulty)
         
@@ -390,7 +587,8 @@ class VimQuizApp(QMainWindow):
         self.create_menu_bar()
         
         # Aggiorna la status bar
-        self.status_bar.showMessage(self.i18n.get_text("ui.status_ready"))
+        status_key = "ui.status_ready" if self.session is not None else "ui.status_loading"
+        self.status_bar.showMessage(self.i18n.get_text(status_key))
     
     def update_quiz_settings(self):
         """Aggiorna le impostazioni del quiz"""
@@ -400,29 +598,24 @@ class VimQuizApp(QMainWindow):
         
     def shuffle_questions(self):
         """Mescola le domande"""
-        random.shuffle(self.questions)
-        self.current_question = 0
-        self.score = 0
-        self.wrong_answers = []
+        self.session.shuffle()
         self.update_ui()
         self.load_question()
         self.status_bar.showMessage(self.i18n.get_text("ui.status_questions_shuffled"))
         
     def load_question(self):
         """Carica una nuova domanda"""
-        if self.current_question >= self.total_questions:
+        render_start = time.perf_counter()
+        
+        # Ottieni domanda corrente e genera le opzioni
+        current_question_data = self.session.prepare_question()
+        if current_question_data is None:
             self.show_final_results()
             return
             
         # Pulisci le opzioni precedenti
-        for i in reversed(range(self.options_layout.count())):
-            self.options_layout.itemAt(i).widget().setParent(None)
-        
-        self.options_group = QButtonGroup()
+        self._reset_option_buttons()
         
-        # Ottieni domanda corrente
-        current_question_data = self.questions[self.current_question]
-        self.correct_answer = current_question_data['command']
         description = current_question_data['description']
         category = current_question_data.get('source_category', 'Unknown')
         difficulty = current_question_data.get('difficulty', 'beginner')
@@ -436,26 +629,18 @@ class VimQuizApp(QMainWindow):
         
         self.description_label.setText(info_text)
         
-        # Genera opzioni
-        self.current_options = [self.correct_answer]
-        
-        # Aggiungi opzioni casuali da tutte le domande disponibili
-        all_commands = list(self.vim_commands.keys())
-        other_commands = [cmd for cmd in all_commands if cmd != self.correct_answer]
-        random.shuffle(other_commands)
-        
-        for cmd in other_commands[:3]:  # Aggiungi 3 opzioni casuali
-            self.current_options.append(cmd)
-        
-        # Mescola le opzioni
-        random.shuffle(self.current_options)
-        
-        # Crea radio buttons
-        for i, option in enumerate(self.current_options):
-            radio = QRadioButton(f"{option}")
-            radio.setFont(QFont("Courier", 10))
-            self.options_group.addButton(radio, i)
-            self.options_layout.addWidget(radio)
+        # Aggiorna i radio button riutilizzati
+        typed_mode = self.typed_checkbox.isChecked()
+        options = self.session.current_options
+        for i, radio in enumerate(self.option_buttons):
+            if i < len(options) and not typed_mode:
+                radio.setText(options[i])
+                radio.setVisible(True)
+            else:
+                radio.setVisible(False)
+        self._reset_typed_answer()
+        if typed_mode:
+            self.typed_answer_edit.setFocus()
         
         # Abilita il pulsante rispondi
         self.answer_button.setEnabled(True)
@@ -464,36 +649,59 @@ class VimQuizApp(QMainWindow):
         # Aggiorna UI
         self.update_ui()
         
-    def check_answer(self):
-        """Controlla la risposta selezionata"""
-        selected_id = self.options_group.checkedId()
+        self.render_latencies.append((time.perf_counter() - render_start) * 1000)
         
-        if selected_id == -1:
-            QMessageBox.warning(self, self.i18n.get_text("messages.select_answer"), 
-                               self.i18n.get_text("messages.select_answer"))
+    def on_typed_mode_toggled(self, checked):
+        """Passa dalla scelta tra le opzioni alla risposta scritta e viceversa"""
+        self.typed_answer_edit.setVisible(checked)
+        if self.session is None or self.session.answered:
             return
-        
-        selected_answer = self.current_options[selected_id]
-        is_correct = selected_answer == self.correct_answer
+        options = self.session.current_options
+        for i, radio in enumerate(self.option_buttons):
+            radio.setVisible(not checked and i < len(options))
+        if checked:
+            self.typed_answer_edit.setFocus()
+    
+    def _reset_typed_answer(self):
+        self.typed_answer_edit.clear()
+        self.typed_answer_edit.setReadOnly(False)
+        self.typed_answer_edit.setPalette(self.default_typed_palette)
+    
+    def check_answer(self):
+        """Controlla la risposta selezionata o scritta"""
+        if not self.answer_button.isEnabled():
+            # Invio nel campo di testo dopo aver già risposto
+            return
+        if self.typed_checkbox.isChecked():
+            typed_answer = self.typed_answer_edit.text().strip()
+            if not typed_answer:
+                QMessageBox.warning(self, self.i18n.get_text("messages.select_answer"), 
+                                   self.i18n.get_text("messages.select_answer"))
+                return
+            result = self.session.answer_typed(typed_answer)
+            self.typed_answer_edit.setReadOnly(True)
+            self.typed_answer_edit.setPalette(self.correct_typed_palette if result['correct']
+                                              else self.wrong_typed_palette)
+        else:
+            selected_id = self.options_group.checkedId()
+            
+            if selected_id == -1:
+                QMessageBox.warning(self, self.i18n.get_text("messages.select_answer"), 
+                                   self.i18n.get_text("messages.select_answer"))
+                return
+            
+            result = self.session.answer_option(selected_id)
+        selected_answer = result['selected']
+        is_correct = result['correct']
         
         if is_correct:
-            self.score += 1
             self.results_text.append(self.i18n.get_text("messages.correct_answer", 
-                                                       command=self.correct_answer, 
-                                                       description=self.vim_commands[self.correct_answer]))
+                                                       command=result['correct_answer'], 
+                                                       description=result['description']))
         else:
-            current_question_data = self.questions[self.current_question]
-            self.wrong_answers.append({
-                'question': self.current_question + 1,
-                'correct': self.correct_answer,
-                'selected': selected_answer,
-                'description': self.vim_commands[self.correct_answer],
-                'category': current_question_data.get('source_category', 'Unknown'),
-                'difficulty': current_question_data.get('difficulty', 'beginner')
-            })
             self.results_text.append(self.i18n.get_text("messages.wrong_answer", 
-                                                       command=self.correct_answer, 
-                                                       description=self.vim_commands[self.correct_answer]))
+                                                       command=result['correct_answer'], 
+                                                       description=result['description']))
         
         # Disabilita il pulsante rispondi e abilita prossima domanda
         self.answer_button.setEnabled(False)
@@ -503,16 +711,16 @@ class VimQuizApp(QMainWindow):
         self.update_ui()
         
         # Evidenzia la risposta corretta
-        for i, option in enumerate(self.current_options):
-            radio = self.options_group.button(i)
-            if option == self.correct_answer:
-                radio.setStyleSheet("QRadioButton { color: green; font-weight: bold; }")
+        for i, option in enumerate(self.session.current_options):
+            radio = self.option_buttons[i]
+            if option == result['correct_answer']:
+                self._highlight_option(radio, self.correct_option_palette)
             elif option == selected_answer and not is_correct:
-                radio.setStyleSheet("QRadioButton { color: red; font-weight: bold; }")
+                self._highlight_option(radio, self.wrong_option_palette)
         
     def next_question(self):
         """Passa alla prossima domanda"""
-        self.current_question += 1
+        self.session.next_question()
         self.load_question()
         
     def restart_quiz(self):
@@ -524,17 +732,18 @@ class VimQuizApp(QMainWindow):
     def update_ui(self):
         """Aggiorna l'interfaccia utente"""
         self.question_label.setText(self.i18n.get_text("quiz.question_label", 
-                                                      current=self.current_question + 1, 
-                                                      total=self.total_questions))
-        self.score_label.setText(self.i18n.get_text("quiz.score_label", score=self.score))
+                                                      current=self.session.current_question + 1, 
+                                                      total=self.session.total_questions))
+        self.score_label.setText(self.i18n.get_text("quiz.score_label", score=self.session.score))
         
-        if self.total_questions > 0:
-            progress = int((self.current_question / self.total_questions) * 100)
+        if self.session.total_questions > 0:
+            progress = int((self.session.current_question / self.session.total_questions) * 100)
             self.progress_bar.setValue(progress)
         
     def show_final_results(self):
         """Mostra i risultati finali"""
-        percentage = (self.score / self.total_questions) * 100
+        session = self.session
+        percentage = session.get_percentage()
         
         if percentage == 100:
             message = self.i18n.get_text("messages.perfect_score")
@@ -550,14 +759,14 @@ class VimQuizApp(QMainWindow):
         results_dialog.setWindowTitle(self.i18n.get_text("messages.quiz_completed"))
         results_dialog.setText(f"""
         <h2>{self.i18n.get_text('messages.quiz_completed')}</h2>
-        <p><b>{self.i18n.get_text('messages.final_score')}</b> {self.score}/{self.total_questions}</p>
+        <p><b>{self.i18n.get_text('messages.final_score')}</b> {session.score}/{session.total_questions}</p>
         <p><b>{self.i18n.get_text('messages.percentage')}</b> {percentage:.1f}%</p>
         <p><b>{self.i18n.get_text('messages.message')}</b> {message}</p>
         """)
         
-        if self.wrong_answers:
+        if session.wrong_answers:
             wrong_text = f"<h3>{self.i18n.get_text('messages.wrong_answers')}</h3><ul>"
-            for wrong in self.wrong_answers:
+            for wrong in session.wrong_answers:
                 wrong_text += f"<li><b>{self.i18n.get_text('messages.question_number', number=wrong['question'])}</b> {wrong['description']}<br>"
                 wrong_text += f"{self.i18n.get_text('messages.correct')} <span style='color: green'>{wrong['correct']}</span> | "
                 wrong_text += f"{self.i18n.get_text('messages.selected')} <span style='color: red'>{wrong['selected']}</span><br>"
@@ -577,7 +786,7 @@ class VimQuizApp(QMainWindow):
         self.next_button.setEnabled(False)
         
         self.status_bar.showMessage(self.i18n.get_text("ui.status_quiz_completed", 
-                                                      score=self.score, total=self.total_questions))
+                                                      score=session.score, total=session.total_questions))
     
     def show_statistics(self):
         """Mostra statistiche dettagliate sulle domande"""
@@ -609,6 +818,9 @@ class VimQuizApp(QMainWindow):
         </ul>
         """
         
+        if self.render_latencies:
+            stats_text += f"<p>{self.i18n.get_text('statistics.render_latency', average=sum(self.render_latencies) / len(self.render_latencies), worst=max(self.render_latencies), count=len(self.render_latencies))}</p>"
+        
         QMessageBox.about(self, self.i18n.get_text("statistics.title"), stats_text)
         
     def show_about(self):
@@ -638,15 +850,37 @@ class VimQuizApp(QMainWindow):
         </ul>
         """)
 
+    def closeEvent(self, event):
+        """Scrive le risposte in sospeso nello storico prima di chiudere"""
+        if self.source_watcher is not None:
+            self.source_watcher.stop()
+        if self.session is not None and self.session.history is not None:
+            self.session.history.close()
+        event.accept()
+
 def main():
-    app = QApplication(sys.argv)
+    # --profile-startup stampa la durata di ogni fase di avvio su stderr
+    profiler, argv = StartupProfiler.from_argv(sys.argv, start=_PROCESS_START)
+    profiler.mark("imports")
+    # --history PATH usa un altro database dello storico delle risposte
+    history_path = None
+    if '--history' in argv[:-1]:
+        position = argv.index('--history')
+        history_path = argv[position + 1]
+        argv = argv[:position] + argv[position + 2:]
+    
+    app = QApplication(argv)
     
     # Imposta lo stile dell'applicazione
     app.setStyle('Fusion')
+    profiler.mark("qapplication")
     
-    # Crea e mostra la finestra principale
-    window = VimQuizApp()
+    # Crea e mostra la finestra principale, poi carica le domande
+    window = VimQuizApp(profiler, history_path)
     window.show()
+    profiler.mark("show")
+    # Il caricamento parte dal ciclo degli eventi, dopo la prima visualizzazione
+    QTimer.singleShot(0, window.start_loading)
     
     sys.exit(app.exec())
 
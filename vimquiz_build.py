@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+VIM QUIZ Build - Validazione dei pacchetti di domande e banca compilata
+Controlla in parallelo file delle domande e traduzioni, riporta ogni problema
+con file e riga e, se non ci sono errori, scrive la banca compilata nel
+formato della cache del caricatore (la stessa cache pickle che il caricatore
+scrive e rilegge da solo). Il file di destinazione va sempre indicato.
+
+Il caricatore legge solo la sua cache, QuestionsLoader.default_cache_path
+della directory delle domande (.questions_cache.pickle accanto a questions/):
+una banca scritta altrove non viene usata all'avvio. La cache è firmata con
+la chiave dell'utente, quindi va scritta dallo stesso utente che avvia il quiz
+
+Uso:
+    python3 vimquiz_build.py [--questions-dir questions] [--locales-dir locales]
+                             (--output FILE | --check) [--jobs N] [--strict] [--errors-only]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from i18n_manager import DESCRIPTIONS_DIR
+from questions_loader import QuestionsLoader, category_key_for
+
+DIFFICULTIES = ("beginner", "intermediate", "advanced")
+
+SEVERITY_ERROR = 'error'
+SEVERITY_WARNING = 'warning'
+
+_QUESTIONS_ARRAY_RE = re.compile(r'"questions"\s*:\s*\[')
+_WHITESPACE_RE = re.compile(r'[\s,]*')
+
+
+def _problem(severity: str, path: str, line: int, message: str) -> Dict[str, Any]:
+    return {'severity': severity, 'file': path, 'line': line, 'message': message}
+
+
+def _line_of(text: str, offset: int) -> int:
+    return text.count('\n', 0, offset) + 1
+
+
+def _element_lines(text: str) -> List[int]:
+    """
+    Righe di inizio degli elementi dell'array "questions"
+
+    Gli elementi vengono decodificati uno alla volta con raw_decode, che
+    restituisce la posizione di fine di ognuno.
+    """
+    match = _QUESTIONS_ARRAY_RE.search(text)
+    if match is None:
+        return []
+    decoder = json.JSONDecoder()
+    lines = []
+    position = match.end()
+    while True:
+        position = _WHITESPACE_RE.match(text, position).end()
+        if position >= len(text) or text[position] == ']':
+            return lines
+        try:
+            _, end = decoder.raw_decode(text, position)
+        except json.JSONDecodeError:
+            return lines
+        lines.append(_line_of(text, position))
+        position = end
+
+
+def _key_line(text: str, key: str, start: int = 0) -> Tuple[int, int]:
+    """Riga e posizione di una chiave JSON a partire da start (riga 0 se assente)"""
+    match = re.compile(re.escape(json.dumps(key, ensure_ascii=False)) + r'\s*:').search(text, start)
+    if match is None:
+        match = re.compile(re.escape(json.dumps(key)) + r'\s*:').search(text, start)
+    if match is None:
+        return 0, start
+    return _line_of(text, match.start()), match.end()
+
+
+def validate_question_file(path: str) -> Dict[str, Any]:
+    """
+    Controlla un file di domande (eseguito in un processo del pool)
+
+    Returns:
+        Dizionario con 'problems', 'category', 'key' (chiave di traduzione)
+        e 'questions' (comando, descrizione, riga) per i controlli tra file
+    """
+    result = {'problems': [], 'category': None, 'key': None, 'path': path, 'questions': []}
+    problems = result['problems']
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        problems.append(_problem(SEVERITY_ERROR, path, 0, f"file non leggibile: {e}"))
+        return result
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        problems.append(_problem(SEVERITY_ERROR, path, e.lineno, f"JSON non valido: {e.msg} (colonna {e.colno})"))
+        return result
+
+    if not isinstance(data, dict):
+        problems.append(_problem(SEVERITY_ERROR, path, 1, "il file deve contenere un oggetto JSON"))
+        return result
+    category = data.get('category')
+    if not isinstance(category, str) or not category.strip():
+        problems.append(_problem(SEVERITY_ERROR, path, _key_line(text, 'category')[0] or 1,
+                                 "campo 'category' mancante o vuoto"))
+    else:
+        result['category'] = category
+    if 'key' in data and (not isinstance(data['key'], str) or not data['key'].strip()):
+        problems.append(_problem(SEVERITY_ERROR, path, _key_line(text, 'key')[0],
+                                 "il campo 'key' deve essere una stringa non vuota"))
+    result['key'] = category_key_for(data, path)
+    difficulty = data.get('difficulty', 'beginner')
+    if difficulty not in DIFFICULTIES:
+        problems.append(_problem(SEVERITY_ERROR, path, _key_line(text, 'difficulty')[0],
+                                 f"difficoltà sconosciuta '{difficulty}' (ammesse: {', '.join(DIFFICULTIES)})"))
+    questions = data.get('questions')
+    if not isinstance(questions, list):
+        problems.append(_problem(SEVERITY_ERROR, path, _key_line(text, 'questions')[0] or 1,
+                                 "campo 'questions' mancante o non è una lista"))
+        return result
+    if not questions:
+        problems.append(_problem(SEVERITY_WARNING, path, _key_line(text, 'questions')[0], "nessuna domanda"))
+
+    lines = _element_lines(text)
+    seen = {}
+    for number, question in enumerate(questions):
+        line = lines[number] if number < len(lines) else 0
+        if not isinstance(question, dict):
+            problems.append(_problem(SEVERITY_ERROR, path, line, f"la domanda {number + 1} non è un oggetto"))
+            continue
+        command = question.get('command')
+        description = question.get('description')
+        if not isinstance(command, str) or not command.strip():
+            problems.append(_problem(SEVERITY_ERROR, path, line, f"domanda {number + 1}: 'command' mancante o vuoto"))
+            continue
+        if command != command.strip():
+            problems.append(_problem(SEVERITY_WARNING, path, line, f"spazi iniziali o finali nel comando {command!r}"))
+        if not isinstance(description, str) or not description.strip():
+            problems.append(_problem(SEVERITY_ERROR, path, line, f"comando {command!r}: 'description' mancante o vuota"))
+            description = ''
+        if 'difficulty' in question and question['difficulty'] not in DIFFICULTIES:
+            problems.append(_problem(SEVERITY_ERROR, path, line,
+                                     f"comando {command!r}: difficoltà sconosciuta '{question['difficulty']}'"))
+        previous = seen.get(command)
+        if previous is not None:
+            problems.append(_problem(SEVERITY_WARNING, path, line,
+                                     f"comando {command!r} già presente alla riga {previous}"))
+        else:
+            seen[command] = line
+        result['questions'].append((command, description, line))
+    return result
+
+
+def validate_language(locales_dir: str, language: str) -> Dict[str, Any]:
+    """
+    Legge le descrizioni tradotte di una lingua (eseguito in un processo del pool)
+
+    Returns:
+        Dizionario con 'problems' e 'sections': chiave di categoria ->
+        {comando: (file, riga)}
+    """
+    result = {'language': language, 'problems': [], 'sections': {}}
+    language_dir = os.path.join(locales_dir, language)
+    sources = []
+    split_dir = os.path.join(language_dir, DESCRIPTIONS_DIR)
+    if os.path.isdir(split_dir):
+        for filename in sorted(os.listdir(split_dir)):
+            if filename.endswith('.json'):
+                sources.append((os.path.join(split_dir, filename), filename[:-5]))
+    else:
+        sources.append((os.path.join(language_dir, "question_descriptions.json"), None))
+
+    for path, section in sources:
+        if not os.path.exists(path):
+            result['problems'].append(_problem(SEVERITY_WARNING, path, 0, "descrizioni tradotte assenti"))
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            data = json.loads(text)
+        except (OSError, UnicodeDecodeError) as e:
+            result['problems'].append(_problem(SEVERITY_ERROR, path, 0, f"file non leggibile: {e}"))
+            continue
+        except json.JSONDecodeError as e:
+            result['problems'].append(_problem(SEVERITY_ERROR, path, e.lineno,
+                                               f"JSON non valido: {e.msg} (colonna {e.colno})"))
+            continue
+        sections = {section: data} if section is not None else data
+        if not isinstance(sections, dict):
+            result['problems'].append(_problem(SEVERITY_ERROR, path, 1, "il file deve contenere un oggetto JSON"))
+            continue
+        for key, descriptions in sections.items():
+            start = 0
+            if section is None:
+                _, start = _key_line(text, key)
+            if not isinstance(descriptions, dict):
+                result['problems'].append(_problem(SEVERITY_ERROR, path, _line_of(text, start),
+                                                   f"la sezione '{key}' non è un oggetto"))
+                continue
+            entries = {}
+            position = start
+            for command, description in descriptions.items():
+                line, position = _key_line(text, command, position)
+                entries[command] = (path, line)
+                if not isinstance(description, str) or not description.strip():
+                    result['problems'].append(_problem(SEVERITY_WARNING, path, line,
+                                                       f"descrizione vuota per {command!r}"))
+            result['sections'][key] = entries
+    return result
+
+
+def cross_check(files: List[Dict[str, Any]], languages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Controlli tra file: comandi duplicati tra categorie, chiavi di traduzione
+    condivise e traduzioni mancanti o superflue
+    """
+    problems = []
+    first_seen = {}
+    key_owners = {}
+    for result in files:
+        path = result['path']
+        owner = key_owners.setdefault(result['key'], path)
+        if owner != path:
+            problems.append(_problem(SEVERITY_WARNING, path, 0,
+                                     f"chiave di traduzione '{result['key']}' usata anche da {owner}"))
+        for command, _, line in result['questions']:
+            previous = first_seen.get(command)
+            if previous is not None and previous[0] != path:
+                problems.append(_problem(SEVERITY_WARNING, path, line,
+                                         f"comando {command!r} presente anche in {previous[0]}:{previous[1]}"))
+            else:
+                first_seen.setdefault(command, (path, line))
+
+    for language in languages:
+        sections = language['sections']
+        for result in files:
+            category_key = result['key']
+            path = result['path']
+            translated = sections.get(category_key, {})
+            for command, _, line in result['questions']:
+                if command not in translated:
+                    problems.append(_problem(SEVERITY_WARNING, path, line,
+                                             f"manca la traduzione '{language['language']}' di {command!r}"))
+            commands = {command for command, _, _ in result['questions']}
+            for command, (locale_path, locale_line) in translated.items():
+                if command not in commands:
+                    problems.append(_problem(SEVERITY_WARNING, locale_path, locale_line,
+                                             f"traduzione di {command!r} per un comando che non è "
+                                             f"nella categoria '{category_key}'"))
+        known = {result['key'] for result in files}
+        for key, entries in sections.items():
+            if key not in known:
+                locale_path, locale_line = next(iter(entries.values()), (language['language'], 0))
+                problems.append(_problem(SEVERITY_WARNING, locale_path, locale_line,
+                                         f"sezione di traduzione '{key}' senza categoria corrispondente"))
+    return problems
+
+
+def run_validation(questions_dir: str, locales_dir: str, jobs: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Valida tutti i pacchetti e le traduzioni
+
+    Args:
+        questions_dir: Directory dei file delle domande
+        locales_dir: Directory delle traduzioni
+        jobs: Processi del pool (1 = nessun pool)
+
+    Returns:
+        Problemi trovati, ordinati per file e riga
+    """
+    paths = [os.path.join(questions_dir, filename)
+             for filename in sorted(os.listdir(questions_dir)) if filename.endswith('.json')]
+    languages = []
+    if os.path.isdir(locales_dir):
+        languages = sorted(name for name in os.listdir(locales_dir)
+                           if os.path.isdir(os.path.join(locales_dir, name)))
+
+    if jobs == 1:
+        files = [validate_question_file(path) for path in paths]
+        translations = [validate_language(locales_dir, language) for language in languages]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            file_futures = [executor.submit(validate_question_file, path) for path in paths]
+            language_futures = [executor.submit(validate_language, locales_dir, language)
+                                for language in languages]
+            files = [future.result() for future in file_futures]
+            translations = [future.result() for future in language_futures]
+
+    problems = []
+    for result in files + translations:
+        problems.extend(result['problems'])
+    problems.extend(cross_check(files, translations))
+    problems.sort(key=lambda problem: (problem['file'], problem['line']))
+    return problems
+
+
+def format_problem(problem: Dict[str, Any]) -> str:
+    """Problema nel formato file:riga: gravità: messaggio"""
+    location = problem['file'] if not problem['line'] else f"{problem['file']}:{problem['line']}"
+    return f"{location}: {problem['severity']}: {problem['message']}"
+
+
+def build_compiled_bank(questions_dir: str, output: str) -> bool:
+    """
+    Scrive la banca compilata nel formato della cache del caricatore
+
+    Args:
+        questions_dir: Directory delle domande
+        output: File da scrivere (QuestionsLoader.default_cache_path per la
+                cache letta all'avvio)
+
+    Returns:
+        True se il file è stato scritto
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader = QuestionsLoader(questions_dir, use_cache=False)
+    return loader.write_compiled_bank(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Valida i pacchetti di domande e scrive la banca compilata")
+    parser.add_argument('--questions-dir', default='questions', help="Directory delle domande")
+    parser.add_argument('--locales-dir', default='locales', help="Directory delle traduzioni")
+    parser.add_argument('--output', help="Banca compilata da scrivere (obbligatoria senza --check); "
+                                         "il quiz la usa solo se è la cache del caricatore "
+                                         "(.questions_cache.pickle accanto alla directory delle domande)")
+    parser.add_argument('--jobs', type=int, default=None, help="Processi di validazione (predefinito: CPU)")
+    parser.add_argument('--check', action='store_true', help="Solo validazione, senza banca compilata")
+    parser.add_argument('--strict', action='store_true', help="Anche gli avvisi bloccano la build")
+    parser.add_argument('--errors-only', action='store_true', help="Non stampa gli avvisi")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.questions_dir):
+        parser.error(f"Directory {args.questions_dir} non trovata")
+    if not args.check and not args.output:
+        parser.error("indicare --output (es. "
+                     f"{QuestionsLoader.default_cache_path(args.questions_dir)}) oppure --check")
+    problems = run_validation(args.questions_dir, args.locales_dir, args.jobs)
+    errors = sum(1 for problem in problems if problem['severity'] == SEVERITY_ERROR)
+    warnings = len(problems) - errors
+    for problem in problems:
+        if problem['severity'] == SEVERITY_ERROR or not args.errors_only:
+            print(format_problem(problem))
+    print(f"{errors} errori, {warnings} avvisi")
+
+    if errors or (args.strict and warnings):
+        print("Banca compilata non scritta")
+        sys.exit(1)
+    if args.check:
+        return
+    if not build_compiled_bank(args.questions_dir, args.output):
+        print("Impossibile scrivere la banca compilata")
+        sys.exit(1)
+    print(f"Banca compilata scritta in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+VIM QUIZ - Interfaccia da terminale
+Quiz in curses con comandi in stile vim, senza Qt: funziona via SSH e nei container
+
+Uso:
+    python3 vimquiz_tui.py [--lang it] [--limit 20] [--category NOME]
+                           [--difficulty LIVELLO] [--typed] [--profile-startup]
+"""
+
+import time
+
+# Istante di avvio del processo (per --profile-startup)
+_PROCESS_START = time.perf_counter()
+
+import curses
+import os
+import re
+import sys
+import textwrap
+
+# Solo moduli senza Qt: il caricatore e la sessione importano il minimo
+# indispensabile (lo storico SQLite non viene caricato)
+from i18n_manager import I18nManager
+from questions_loader import QuestionsLoader
+from quiz_engine import QuizSession
+from startup_profiler import StartupProfiler
+
+USAGE = ("Uso: vimquiz_tui.py [--lang CODICE] [--limit N] [--category NOME] "
+         "[--difficulty LIVELLO] [--typed] [--profile-startup]")
+
+DEFAULT_LIMIT = 20
+
+# Modalità di risposta: scelta tra le opzioni o comando scritto
+MODE_CHOICE = 'choice'
+MODE_TYPED = 'typed'
+
+KEY_ENTER = ('\n', '\r', curses.KEY_ENTER)
+KEY_BACKSPACE = ('\x7f', '\b', curses.KEY_BACKSPACE)
+KEY_ESCAPE = '\x1b'
+KEY_CLEAR_LINE = '\x15'  # Ctrl+U
+KEY_DELETE_WORD = '\x17'  # Ctrl+W
+
+# Coppie di colori
+COLOR_CORRECT = 1
+COLOR_WRONG = 2
+COLOR_TITLE = 3
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def parse_args(argv):
+    """
+    Legge le opzioni della riga di comando (senza argparse, per avviarsi prima)
+
+    Returns:
+        Dizionario delle opzioni
+    """
+    options = {'lang': None, 'limit': DEFAULT_LIMIT, 'category': None, 'difficulty': None,
+               'typed': False}
+    valued = {'--lang': 'lang', '--limit': 'limit', '--category': 'category',
+              '--difficulty': 'difficulty'}
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        name, _, value = arg.partition('=')
+        if name in valued:
+            if not value:
+                if not args:
+                    raise ValueError(f"{name} richiede un valore")
+                value = args.pop(0)
+            options[valued[name]] = value
+        elif arg == '--typed':
+            options['typed'] = True
+        else:
+            raise ValueError(f"Opzione sconosciuta: {arg}")
+    try:
+        options['limit'] = max(1, int(options['limit']))
+    except ValueError:
+        raise ValueError("--limit richiede un numero")
+    return options
+
+
+class QuizTUI:
+    """Schermate del quiz e gestione dei tasti"""
+
+    def __init__(self, session: QuizSession, i18n: I18nManager, limit: int,
+                 category=None, difficulty=None, typed: bool = False):
+        """
+        Args:
+            session: Sessione di quiz (domande già caricate)
+            i18n: Gestore delle traduzioni (lingua già impostata)
+            limit: Numero di domande per quiz
+            category: Categoria delle domande (opzionale)
+            difficulty: Difficoltà delle domande (opzionale)
+            typed: Si risponde scrivendo il comando invece di scegliere
+        """
+        self.session = session
+        self.i18n = i18n
+        self.limit = limit
+        self.category = category
+        self.difficulty = difficulty
+        self.mode = MODE_TYPED if typed else MODE_CHOICE
+        self.selected = 0
+        self.typed_text = ''
+        self.result = None
+        self.scroll = 0
+        self.first_frame_drawn = None
+        self.session.prepare_question()
+
+    def text(self, key: str, **kwargs) -> str:
+        """Testo tradotto senza i tag HTML dei messaggi della GUI"""
+        return _TAG_RE.sub('', self.i18n.get_text(key, **kwargs))
+
+    # --- Ciclo principale -------------------------------------------------
+
+    def run(self, stdscr):
+        """Ciclo dei tasti fino all'uscita (da chiamare tramite curses.wrapper)"""
+        self._init_colors()
+        while True:
+            self.draw(stdscr)
+            if self.first_frame_drawn is not None:
+                self.first_frame_drawn()
+                self.first_frame_drawn = None
+            try:
+                key = stdscr.get_wch()
+            except KeyboardInterrupt:
+                return
+            except curses.error:
+                continue
+            if key == curses.KEY_RESIZE:
+                continue
+            if not self.handle_key(key):
+                return
+
+    def _init_colors(self):
+        curses.curs_set(0)
+        if curses.has_colors():
+            curses.start_color()
+            try:
+                curses.use_default_colors()
+                background = -1
+            except curses.error:
+                background = curses.COLOR_BLACK
+            curses.init_pair(COLOR_CORRECT, curses.COLOR_GREEN, background)
+            curses.init_pair(COLOR_WRONG, curses.COLOR_RED, background)
+            curses.init_pair(COLOR_TITLE, curses.COLOR_CYAN, background)
+
+    def handle_key(self, key) -> bool:
+        """
+        Esegue l'azione di un tasto
+
+        Returns:
+            False per uscire
+        """
+        session = self.session
+        if session.is_finished():
+            return self._handle_results_key(key)
+        if session.answered:
+            if key in ('n', 'l', ' ') or key in KEY_ENTER:
+                self.next_question()
+            elif key == 'q':
+                return False
+            elif key == 'r':
+                self.restart()
+            return True
+        if self.mode == MODE_TYPED:
+            self._handle_typed_key(key)
+            return True
+
+        option_count = len(session.current_options)
+        if key in ('j', curses.KEY_DOWN):
+            self.selected = (self.selected + 1) % option_count
+        elif key in ('k', curses.KEY_UP):
+            self.selected = (self.selected - 1) % option_count
+        elif key == 'g':
+            self.selected = 0
+        elif key == 'G':
+            self.selected = option_count - 1
+        elif isinstance(key, str) and key.isdigit() and 1 <= int(key) <= option_count:
+            self.selected = int(key) - 1
+            self.result = session.answer_option(self.selected)
+        elif key in ('l', ' ') or key in KEY_ENTER:
+            self.result = session.answer_option(self.selected)
+        elif key in ('i', 'a'):
+            self.mode = MODE_TYPED
+        elif key == 'r':
+            self.restart()
+        elif key == 'q':
+            return False
+        return True
+
+    def _handle_typed_key(self, key):
+        """Tasti della modalità di scrittura del comando"""
+        if key in KEY_ENTER:
+            if self.typed_text.strip():
+                self.result = self.session.answer_typed(self.typed_text)
+        elif key == KEY_ESCAPE:
+            self.mode = MODE_CHOICE
+            self.typed_text = ''
+        elif key in KEY_BACKSPACE:
+            self.typed_text = self.typed_text[:-1]
+        elif key == KEY_CLEAR_LINE:
+            self.typed_text = ''
+        elif key == KEY_DELETE_WORD:
+            self.typed_text = self.typed_text.rstrip()
+            self.typed_text = self.typed_text[:len(self.typed_text) - len(self.typed_text.split(' ')[-1])]
+        elif isinstance(key, str) and key.isprintable():
+            self.typed_text += key
+
+    def _handle_results_key(self, key) -> bool:
+        if key == 'q' or key in KEY_ENTER:
+            return False
+        if key in ('j', curses.KEY_DOWN):
+            self.scroll += 1
+        elif key in ('k', curses.KEY_UP):
+            self.scroll = max(0, self.scroll - 1)
+        elif key == 'r':
+            self.restart()
+        return True
+
+    def next_question(self):
+        self.session.next_question()
+        self.session.prepare_question()
+        self.selected = 0
+        self.typed_text = ''
+        self.result = None
+
+    def restart(self):
+        """Nuovo quiz con nuove domande e gli stessi filtri"""
+        self.session.load_questions(self.limit, self.category, self.difficulty)
+        self.session.prepare_question()
+        self.selected = 0
+        self.typed_text = ''
+        self.result = None
+        self.scroll = 0
+
+    # --- Disegno ----------------------------------------------------------
+
+    def draw(self, stdscr):
+        stdscr.erase()
+        height, width = stdscr.getmaxyx()
+        if height < 8 or width < 30:
+            _put(stdscr, 0, 0, self.text("tui.too_small"), width)
+            stdscr.refresh()
+            return
+        if self.session.is_finished():
+            self._draw_results(stdscr, height, width)
+        else:
+            self._draw_question(stdscr, height, width)
+        stdscr.refresh()
+
+    def _draw_question(self, stdscr, height, width):
+        session = self.session
+        question = session.get_current_question()
+        header = "  ".join((self.text("app.title"),
+                            self.text("quiz.question_label", current=session.current_question + 1,
+                                      total=session.total_questions),
+                            self.text("quiz.score_label", score=session.score)))
+        _put(stdscr, 0, 0, header, width, _color(COLOR_TITLE) | curses.A_BOLD)
+        details = (f"{self.text('messages.category')} {question.get('source_category', '')}  "
+                   f"{self.text('messages.difficulty')} "
+                   f"{self.text('questions.difficulties.' + question.get('difficulty', 'beginner'))}")
+        _put(stdscr, 1, 0, details, width, curses.A_DIM)
+
+        row = 3
+        for line in textwrap.wrap(question.get('description', ''), max(10, width - 2)):
+            if row >= height - 4:
+                break
+            _put(stdscr, row, 1, line, width, curses.A_BOLD)
+            row += 1
+        row += 1
+
+        if self.mode == MODE_TYPED:
+            prompt = self.text("tui.type_prompt")
+            typed = self.result['selected'] if self.result else self.typed_text
+            attribute = curses.A_NORMAL
+            if self.result:
+                attribute = _color(COLOR_CORRECT if self.result['correct'] else COLOR_WRONG)
+            _put(stdscr, row, 1, prompt, width)
+            _put(stdscr, row, 1 + len(prompt), typed + ('' if self.result else '_'), width, attribute)
+            row += 2
+        else:
+            for index, option in enumerate(session.current_options):
+                if row >= height - 3:
+                    break
+                attribute = curses.A_NORMAL
+                if self.result is not None:
+                    if option == self.result['correct_answer']:
+                        attribute = _color(COLOR_CORRECT) | curses.A_BOLD
+                    elif option == self.result['selected']:
+                        attribute = _color(COLOR_WRONG) | curses.A_BOLD
+                elif index == self.selected:
+                    attribute = curses.A_REVERSE
+                marker = '>' if index == self.selected else ' '
+                _put(stdscr, row, 1, f"{marker} {index + 1}. {option}", width, attribute)
+                row += 1
+            row += 1
+
+        if self.result is not None:
+            key = "tui.correct" if self.result['correct'] else "tui.wrong"
+            feedback = self.text(key, command=self.result['correct_answer'],
+                                 description=self.result['description'])
+            color = _color(COLOR_CORRECT if self.result['correct'] else COLOR_WRONG)
+            for line in textwrap.wrap(feedback, max(10, width - 2)):
+                if row >= height - 2:
+                    break
+                _put(stdscr, row, 1, line, width, color)
+                row += 1
+            footer = self.text("tui.keys_next")
+        elif self.mode == MODE_TYPED:
+            footer = self.text("tui.keys_typed")
+        else:
+            footer = self.text("tui.keys_choice")
+        _put(stdscr, height - 1, 0, footer, width, curses.A_DIM)
+
+    def _draw_results(self, stdscr, height, width):
+        session = self.session
+        results = session.get_results()
+        percentage = results['percentage']
+        if percentage == 100:
+            message = self.text("messages.perfect_score")
+        elif percentage >= 80:
+            message = self.text("messages.excellent_work")
+        elif percentage >= 60:
+            message = self.text("messages.good_work")
+        else:
+            message = self.text("messages.review_commands")
+
+        lines = [
+            (self.text("messages.quiz_completed"), _color(COLOR_TITLE) | curses.A_BOLD),
+            (self.text("messages.final_score", score=results['score'], total=results['total']), curses.A_BOLD),
+            (self.text("messages.percentage", percentage=percentage), curses.A_NORMAL),
+            (message, curses.A_NORMAL),
+            ('', curses.A_NORMAL),
+        ]
+        if results['wrong_answers']:
+            lines.append((self.text("messages.wrong_answers"), curses.A_BOLD))
+            for wrong in results['wrong_answers']:
+                lines.append((f"{self.text('messages.question_number', number=wrong['question'])} "
+                              f"{wrong['description']}", curses.A_NORMAL))
+                lines.append((f"  {self.text('messages.correct')} {wrong['correct']}  "
+                              f"{self.text('messages.selected')} {wrong['selected']}", _color(COLOR_WRONG)))
+
+        visible = height - 2
+        self.scroll = max(0, min(self.scroll, len(lines) - visible))
+        for row, (line, attribute) in enumerate(lines[self.scroll:self.scroll + visible]):
+            _put(stdscr, row, 0, line, width, attribute)
+        _put(stdscr, height - 1, 0, self.text("tui.keys_results"), width, curses.A_DIM)
+
+
+def _color(pair: int) -> int:
+    return curses.color_pair(pair) if curses.has_colors() else curses.A_NORMAL
+
+
+def _put(stdscr, row: int, column: int, text: str, width: int, attribute: int = curses.A_NORMAL):
+    """Scrive una riga tagliata alla larghezza dello schermo (l'ultima cella non si scrive)"""
+    available = width - column - 1
+    if available <= 0:
+        return
+    try:
+        stdscr.addstr(row, column, text[:available], attribute)
+    except curses.error:
+        pass
+
+
+def main():
+    # --profile-startup stampa la durata di ogni fase di avvio su stderr
+    profiler, argv = StartupProfiler.from_argv(sys.argv, start=_PROCESS_START)
+    profiler.mark("imports")
+    if '-h' in argv or '--help' in argv:
+        print(USAGE)
+        return
+    try:
+        options = parse_args(argv[1:])
+    except ValueError as e:
+        print(f"{e}\n{USAGE}", file=sys.stderr)
+        sys.exit(2)
+
+    i18n = I18nManager()
+    if options['lang'] and not i18n.set_language(options['lang']):
+        print(f"Lingua non disponibile: {options['lang']}", file=sys.stderr)
+        sys.exit(2)
+    profiler.mark("i18n")
+    try:
+        loader = QuestionsLoader(i18n_manager=i18n)
+    except Exception as e:
+        print(i18n.get_text("errors.load_questions", error=str(e)), file=sys.stderr)
+        sys.exit(1)
+    profiler.mark("questions_loader")
+
+    session = QuizSession(loader)
+    session.load_questions(options['limit'], options['category'], options['difficulty'])
+    if session.total_questions == 0:
+        print(i18n.get_text("errors.load_questions", error="no questions match the filters"),
+              file=sys.stderr)
+        sys.exit(1)
+    profiler.mark("quiz_session")
+
+    tui = QuizTUI(session, i18n, options['limit'], options['category'], options['difficulty'],
+                  options['typed'])
+    tui.first_frame_drawn = lambda: profiler.mark("first_frame")
+    # Esc deve uscire subito dalla modalità di scrittura
+    os.environ.setdefault('ESCDELAY', '25')
+    try:
+        curses.wrapper(tui.run)
+    except curses.error as e:
+        print(f"Terminale non supportato: {e}", file=sys.stderr)
+        sys.exit(1)
+    # Il riepilogo si stampa dopo aver ripristinato il terminale
+    profiler.report()
+
+
+if __name__ == '__main__':
+    main()